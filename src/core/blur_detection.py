@@ -2,72 +2,189 @@
 import cv2
 import numpy as np
 import os
-from typing import Tuple, Optional, Any
+from typing import Tuple, Optional, Any, List
 
 # ★ 型エイリアス ★
 NumpyImageType = np.ndarray[Any, Any]
 ErrorMsgType = Optional[str]
 BlurResult = Tuple[Optional[float], ErrorMsgType]
+GatedBlurResult = Tuple[Optional[float], ErrorMsgType, Optional[float]] # (score, error_msg, シャープ判定値)
+
+# FFT 前の縮小 (任意、設定 blur_fft_downscale) で使う長辺の上限 (px)。FFT のコストを画像サイズによらずほぼ一定にする。
+# 縮小すると低周波半径の基準と捨てられる高周波成分が変わり、スコアの意味 (閾値) も変わるため、既定では縮小しない (max_dimension=0)。
+FFT_DOWNSCALE_DIMENSION: int = 512
+
+# FFT 前の簡易判定: 長辺 SHARP_GATE_SIZE に縮小した画像の Laplacian 分散がカット値を超える画像は明らかにシャープとみなし、FFT を省略する
+SHARP_GATE_SIZE: int = 256
+# カット値の下限。実際のカット値はスキャンごとに、一部の画像で FFT の判定と突き合わせて決める (calibrate_sharp_gate_cut)
+SHARP_GATE_LAPLACIAN_CUT: float = 1000.0
+SHARP_GATE_CALIBRATION_SAMPLES: int = 32 # カット値の較正に使う画像数 (FFT も必ず計算する)
+SHARP_GATE_CALIBRATION_MARGIN: float = 1.5 # FFT でブレと判定された画像の判定値の最大値に掛ける余裕
+
+# Numba (任意) をインポート: あればマスク集計をコンパイル済みループで行い、一時配列を作らない
+try:
+    from numba import njit
+    NUMBA_AVAILABLE: bool = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 実数画像のスペクトルは F(-u, -v) = conj(F(u, v)) で対称なため、集計は左半分 (列 0 .. w//2) だけで行う。
+# 列 j と列 w - j は同じ大きさ・同じ中心距離になるので、対になる列のない列 0 と (w が偶数なら) 列 w/2 以外は2倍して数える。
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _blur_score_core(magnitude: NumpyImageType, radius: int, full_width: int) -> Tuple[float, float]:
+        """非シフトのスペクトルの左半分から (全体の合計, 中心円内の低周波成分の合計) を求める"""
+        h, half_cols = magnitude.shape
+        half_h = h // 2; r2 = radius * radius
+        total = 0.0; low = 0.0
+        for i in range(h):
+            dy = (i + half_h) % h - half_h # fftshift 後の中心からの距離
+            for j in range(half_cols):
+                v = magnitude[i, j]
+                if j != 0 and 2 * j != full_width: v = 2.0 * v
+                total += v
+                if dy * dy + j * j <= r2: low += v
+        return total, low
+else:
+    def _blur_score_core(magnitude: NumpyImageType, radius: int, full_width: int) -> Tuple[float, float]:
+        """非シフトのスペクトルの左半分から (全体の合計, 中心円内の低周波成分の合計) を求める"""
+        h, half_cols = magnitude.shape
+        dy = (np.arange(h) + h // 2) % h - h // 2 # fftshift 後の中心からの距離
+        dx = np.arange(half_cols)
+        weights = np.full(half_cols, 2.0); weights[0] = 1.0
+        if full_width % 2 == 0: weights[-1] = 1.0
+        low_mask = (dy[:, None] ** 2 + dx[None, :] ** 2) <= radius * radius
+        return float(magnitude.sum(axis=0) @ weights), float((magnitude * low_mask).sum(axis=0) @ weights)
 
 # 画像ローダー関数をインポート
 try:
-    from ..utils.image_loader import load_image_as_numpy
+    from ..utils.image_loader import load_image_as_numpy, load_image_reduced, REDUCED_DECODE_EXTENSIONS
 except ImportError:
-    try: from utils.image_loader import load_image_as_numpy
+    try: from utils.image_loader import load_image_as_numpy, load_image_reduced, REDUCED_DECODE_EXTENSIONS
     except ImportError:
         print("エラー: utils.image_loader のインポートに失敗しました。")
         def load_image_as_numpy(path: str, mode: str = 'gray') -> Tuple[Optional[NumpyImageType], ErrorMsgType]:
             return None, "Image loader not available"
+        def load_image_reduced(path: str, target_size: int, mode: str = 'bgr') -> Tuple[Optional[NumpyImageType], ErrorMsgType]:
+            return None, "Image loader not available"
+        REDUCED_DECODE_EXTENSIONS = ()
 
-def calculate_fft_blur_score_v2(image_path: str, low_freq_radius_ratio: float = 0.05) -> BlurResult:
+def init_blur_worker_process() -> None:
+    """
+    ブレ検出用ワーカープロセスの初期化 (ProcessPoolExecutor の initializer)。
+    プロセス単位で並列化しているため、OpenCV 内部のスレッド並列は無効にしてコア数以上のスレッドが競合しないようにする。
+    """
+    cv2.setNumThreads(1)
+
+def _load_gray_for_fft(image_path: str, max_dimension: int) -> Tuple[Optional[NumpyImageType], ErrorMsgType]:
+    """
+    FFT 用のグレースケール画像を読み込みます。どうせ長辺 max_dimension に縮小するため、
+    JPEG は長辺が max_dimension を下回らない範囲で縮小デコードし、デコードと縮小のコストを減らします。
+    """
+    if max_dimension > 0 and image_path.lower().endswith(REDUCED_DECODE_EXTENSIONS):
+        return load_image_reduced(image_path, max_dimension, mode='gray')
+    return load_image_as_numpy(image_path, mode='gray')
+
+def calculate_fft_blur_score_v2(image_path: str, low_freq_radius_ratio: float = 0.05, max_dimension: int = 0) -> BlurResult:
     """
     FFTを使用して画像のブレ度合いを評価するスコア(v2)を計算します。
-    エラーハンドリングを詳細化。
+    エラーハンドリングを詳細化。max_dimension が 0 より大きい場合は縮小してから計算します (スコアは縮小なしと一致しません)。
     """
     filename = os.path.basename(image_path) # エラーメッセージ用
     img_gray: Optional[NumpyImageType]
     error_msg_load: ErrorMsgType
-    img_gray, error_msg_load = load_image_as_numpy(image_path, mode='gray')
+    img_gray, error_msg_load = _load_gray_for_fft(image_path, max_dimension)
 
     if error_msg_load:
         # ★ 読み込みエラーメッセージをそのまま返す ★
         return None, f"画像読込失敗({error_msg_load}): {filename}"
     if img_gray is None:
         return None, f"画像データ取得失敗(NumPy空): {filename}"
+    return calculate_fft_blur_score_v2_from_array(img_gray, low_freq_radius_ratio, filename, max_dimension)
+
+def compute_sharp_gate_metric(img_gray: NumpyImageType) -> float:
+    """長辺を SHARP_GATE_SIZE に縮小した (縦横比は維持) 画像の Laplacian 分散を返します。"""
+    h, w = img_gray.shape[:2]
+    small = img_gray
+    if max(h, w) > SHARP_GATE_SIZE:
+        scale = SHARP_GATE_SIZE / max(h, w)
+        small = cv2.resize(img_gray, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    # 整数 (CV_16S) で計算する (CV_8U では負のエッジ応答が 0 に丸められてしまう)
+    return float(cv2.Laplacian(small, cv2.CV_16S, ksize=3).var())
+
+def calibrate_sharp_gate_cut(samples: List[Tuple[float, float]], blur_threshold: float) -> float:
+    """
+    (FFT スコア, シャープ判定値) のサンプルから、FFT でブレと判定される画像を省略しないカット値を決めます。
+    ブレ画像の判定値の最大値に余裕を持たせ、SHARP_GATE_LAPLACIAN_CUT より小さくはしません。
+    サンプルにブレ画像が無い場合はサンプル全体の最大値を基準にし、サンプルが無い場合は省略しません (inf)。
+    """
+    if not samples:
+        return float('inf')
+    blurry_metrics: List[float] = [metric for score, metric in samples if score <= blur_threshold]
+    reference: float = max(blurry_metrics) if blurry_metrics else max(metric for _, metric in samples)
+    return max(SHARP_GATE_LAPLACIAN_CUT, reference * SHARP_GATE_CALIBRATION_MARGIN)
 
+def calculate_fft_blur_score_gated(image_path: str, low_freq_radius_ratio: float = 0.05,
+                                   sharp_laplacian_cut: float = SHARP_GATE_LAPLACIAN_CUT, max_dimension: int = 0) -> GatedBlurResult:
+    """
+    縮小画像の Laplacian 分散で明らかにシャープな画像を先に判定し、それ以外だけ FFT スコアを計算します。
+    戻り値は (スコア, エラー, シャープ判定値)。シャープと判定した画像はスコアを計算せず (None, None, 判定値) を返します。
+    sharp_laplacian_cut に inf を渡すと、判定値を求めたうえで必ず FFT を計算します (カット値の較正用)。
+    """
+    filename = os.path.basename(image_path) # エラーメッセージ用
+    img_gray, error_msg_load = _load_gray_for_fft(image_path, max_dimension)
+    if error_msg_load:
+        return None, f"画像読込失敗({error_msg_load}): {filename}", None
+    if img_gray is None:
+        return None, f"画像データ取得失敗(NumPy空): {filename}", None
+
+    gate_metric: Optional[float] = None
+    try:
+        gate_metric = compute_sharp_gate_metric(img_gray)
+        if gate_metric > sharp_laplacian_cut:
+            return None, None, gate_metric
+    except cv2.error as e:
+        print(f"警告: シャープ判定に失敗したため FFT で計算します ({filename}): {e.msg}")
+    score, error_msg = calculate_fft_blur_score_v2_from_array(img_gray, low_freq_radius_ratio, filename, max_dimension)
+    return score, error_msg, gate_metric
+
+def calculate_fft_blur_score_v2_from_array(img_gray: NumpyImageType, low_freq_radius_ratio: float = 0.05, filename: str = "",
+                                           max_dimension: int = 0) -> BlurResult:
+    """
+    読み込み済みのグレースケール画像から FFT ブレスコア(v2)を計算します。
+    他の処理と画像データを共有する場合に使用します。filename はエラーメッセージ用。
+    max_dimension が 0 より大きい場合、長辺がそれを超える画像は INTER_AREA で縮小してから計算します。
+    """
     try:
         h, w = img_gray.shape
         # ★ 画像サイズが小さすぎる場合のチェック (任意) ★
         if h < 4 or w < 4: # FFTにはある程度のサイズが必要
             return None, f"画像サイズが小さすぎます({w}x{h}): {filename}"
 
-        crow, ccol = h // 2, w // 2
+        # 大きな画像は縮小 (FFT のコストは O(WH log WH) のため、高解像度写真ほど効果が大きい)
+        if max_dimension > 0 and max(h, w) > max_dimension:
+            scale = max_dimension / max(h, w)
+            img_gray = cv2.resize(img_gray, (max(4, round(w * scale)), max(4, round(h * scale))), interpolation=cv2.INTER_AREA)
+            h, w = img_gray.shape
 
-        # float32に変換
-        img_float32 = np.float32(img_gray)
+        # float32に変換 (cv2.dft は float32 入力で SIMD 経路が最も速い)
+        img_float32 = img_gray if img_gray.dtype == np.float32 else img_gray.astype(np.float32)
         # DFT計算
         dft = cv2.dft(img_float32, flags=cv2.DFT_COMPLEX_OUTPUT)
         # エラーチェック (dftがNoneになることは通常ないが念のため)
         if dft is None:
             return None, f"FFT計算結果がNone: {filename}"
 
-        dft_shift = np.fft.fftshift(dft)
-        # エラーチェック (fftshiftがNoneになることは通常ない)
-        if dft_shift is None:
-             return None, f"FFTシフト結果がNone: {filename}"
+        # magnitude 計算 (スペクトルは fftshift せず、集計側でシフト後の座標に換算する)
+        # 対称性により右半分は左半分と同じ値になるため、左半分 (w//2 + 1 列) だけ計算する
+        dft_half = dft[:, :w // 2 + 1]
+        magnitude_spectrum = cv2.magnitude(np.ascontiguousarray(dft_half[:, :, 0]), np.ascontiguousarray(dft_half[:, :, 1]))
 
-        # magnitude 計算
-        magnitude_spectrum = cv2.magnitude(dft_shift[:, :, 0], dft_shift[:, :, 1])
-
-        # マスク作成
+        # 合計計算 (高周波成分 = 全体 - 中心円内の低周波成分)
         radius = int(low_freq_radius_ratio * min(h, w))
         radius = max(1, radius)
-        mask = np.zeros((h, w), np.uint8)
-        cv2.circle(mask, (ccol, crow), radius, 1, thickness=-1)
-
-        # 合計計算
-        total_magnitude_sum = np.sum(magnitude_spectrum)
-        high_freq_magnitude_sum = np.sum(magnitude_spectrum * (1 - mask))
+        total_magnitude_sum, low_freq_magnitude_sum = _blur_score_core(magnitude_spectrum, radius, w)
+        high_freq_magnitude_sum = total_magnitude_sum - low_freq_magnitude_sum
 
         if total_magnitude_sum <= 1e-6:
             print(f"情報: FFTマグニチュード合計ほぼゼロ: {filename}")
@@ -86,7 +203,7 @@ def calculate_fft_blur_score_v2(image_path: str, low_freq_radius_ratio: float =
         error_msg = f"メモリ不足エラー(FFT): {filename}"
         print(f"エラー: {error_msg}")
         return None, error_msg
-    except ValueError as e: # 例: np.fftshift などでのエラー
+    except ValueError as e: # 例: 配列形状の不整合などでのエラー
         error_msg = f"値エラー(FFT {e})"
         print(f"エラー: {error_msg} - {filename}")
         return None, error_msg
@@ -110,7 +227,13 @@ def calculate_laplacian_variance(image_path: str) -> BlurResult:
         return None, f"画像読込失敗({error_msg_load}): {filename}"
     if img_gray is None:
         return None, f"画像データ取得失敗(NumPy空): {filename}"
+    return calculate_laplacian_variance_from_array(img_gray, filename)
 
+def calculate_laplacian_variance_from_array(img_gray: NumpyImageType, filename: str = "") -> BlurResult:
+    """
+    読み込み済みのグレースケール画像から Laplacian variance を計算します。
+    filename はエラーメッセージ用。
+    """
     try:
         # ★ 画像サイズチェック (任意) ★
         h, w = img_gray.shape
@@ -122,7 +245,9 @@ def calculate_laplacian_variance(image_path: str) -> BlurResult:
         if laplacian is None:
             return None, f"Laplacian計算結果がNone: {filename}"
 
-        variance_of_laplacian = laplacian.var()
+        # NumPy の var() は平均との差の一時配列 (画像と同サイズの float64) を作るため、OpenCV で1パスで求める
+        _, stddev = cv2.meanStdDev(laplacian)
+        variance_of_laplacian = stddev[0, 0] ** 2
         return float(variance_of_laplacian), None # floatにキャスト
 
     except cv2.error as e:
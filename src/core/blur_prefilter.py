@@ -0,0 +1,23 @@
+# core/blur_prefilter.py
+from typing import Tuple, Dict, List
+
+# ★ 型エイリアス ★
+DuplicateDict = Dict[str, List[str]] # {MD5: [path1, path2, ...]} (find_duplicate_files の戻り値)
+
+def group_paths_by_duplicates(paths: List[str], duplicates: DuplicateDict) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    内容が完全に同一 (サイズと MD5 が一致) のファイルをまとめ、(代表画像のリスト, {代表画像: スコアを共有する他の画像}) を返します。
+    ブレスコアを共有してよいのはバイト単位で同一のファイルだけです (縮小画像のハッシュはブレの有無を区別できないため使わない)。
+    どのグループにも属さない画像は、それぞれ単独で代表画像として扱います (元の順序を維持)。
+    """
+    representative_of: Dict[str, str] = {}
+    for group in duplicates.values():
+        for member in group[1:]:
+            representative_of[member] = group[0]
+    representatives: List[str] = []
+    shared_members: Dict[str, List[str]] = {}
+    for path in paths:
+        representative: str = representative_of.get(path, path)
+        if representative == path: representatives.append(path)
+        else: shared_members.setdefault(representative, []).append(path)
+    return representatives, shared_members
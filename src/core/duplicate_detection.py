@@ -2,6 +2,7 @@
 import os
 import hashlib
 import time
+import concurrent.futures
 from typing import Tuple, Optional, List, Dict, Any, Set, Callable
 
 try:
@@ -15,15 +16,50 @@ ErrorDict = Dict[str, str]
 DuplicateDict = Dict[str, List[str]]
 FindDuplicateResult = Tuple[DuplicateDict, List[ErrorDict]]
 
+Md5Result = Tuple[Optional[str], Optional[ErrorDict]] # (ハッシュ値, エラー情報)
+
+PROGRESS_EMIT_INTERVAL: float = 0.1 # 進捗シグナルの最小送信間隔 (秒)
+
+def _calculate_md5(file_path: str, is_cancelled_func: Optional[Callable[[], bool]] = None) -> Md5Result:
+    """
+    ファイルの MD5 を計算します。中断要求があった場合は InterruptedError を送出します。
+    hashlib はデータ更新中に GIL を解放するため、複数スレッドから並列に呼び出せます。
+    """
+    filename = os.path.basename(file_path) # エラーメッセージ用
+    try:
+        hasher = hashlib.md5()
+        # ★ with open を使用 ★
+        with open(file_path, 'rb') as file:
+            while True:
+                if is_cancelled_func and is_cancelled_func(): raise InterruptedError("ハッシュ計算中に中断")
+                chunk: bytes = file.read(8192) # 8KBずつ読み込み
+                if not chunk: break
+                hasher.update(chunk)
+        return hasher.hexdigest(), None
+    except FileNotFoundError:
+        return None, {'type': 'ハッシュ計算', 'path': filename, 'error': 'ファイルが見つかりません'}
+    except PermissionError:
+        return None, {'type': 'ハッシュ計算', 'path': filename, 'error': 'アクセス権がありません'}
+    except OSError as e:
+        return None, {'type': 'ハッシュ計算', 'path': filename, 'error': f'ファイル読込OSエラー: {e.strerror} (errno {e.errno})'}
+    except MemoryError:
+        return None, {'type': 'ハッシュ計算', 'path': filename, 'error': 'メモリ不足'}
+    except InterruptedError:
+        raise
+    except Exception as e:
+        return None, {'type': 'ハッシュ計算(予期せぬ)', 'path': filename, 'error': f'{type(e).__name__}: {e}'}
+
 def find_duplicate_files(image_paths: List[str],
                           signals: Optional[Any] = None,
                           progress_offset: int = 0,
                           progress_range: int = 100,
                           is_cancelled_func: Optional[Callable[[], bool]] = None,
-                          cache_handler: Optional[CacheHandler] = None) -> FindDuplicateResult:
+                          cache_handler: Optional[CacheHandler] = None,
+                          max_workers: int = 1) -> FindDuplicateResult:
     """
     指定されたファイルパスリスト内で完全に同一内容のファイルを見つけます。
     エラーハンドリングを詳細化。
+    max_workers が 2 以上の場合、キャッシュに無いファイルの MD5 計算を複数スレッドに分けて行います。
     """
     errors: List[ErrorDict] = []
     duplicates: DuplicateDict = {}
@@ -31,13 +67,16 @@ def find_duplicate_files(image_paths: List[str],
 
     last_progress_emit_time: float = 0.0
     def emit_progress(current_value: int, total_value: int, stage_offset: int, stage_range: float, status_prefix: str) -> None:
-        nonlocal last_progress_emit_time; progress: int = stage_offset
+        nonlocal last_progress_emit_time
+        if not signals: return
+        # 送信間隔 (0.1秒) を満たすまでは進捗値や文字列を作らない (ループ内で毎回呼ばれるため)
+        current_time: float = time.monotonic()
+        if current_value != total_value and current_time - last_progress_emit_time <= PROGRESS_EMIT_INTERVAL: return
+        if not (hasattr(signals, 'progress_update') and hasattr(signals, 'status_update')): return
+        progress: int = stage_offset
         if total_value > 0: progress = stage_offset + int((current_value / total_value) * stage_range)
-        status: str = f"{status_prefix} ({current_value}/{total_value})"
-        current_time: float = time.time()
-        if signals and hasattr(signals, 'progress_update') and hasattr(signals, 'status_update') and \
-           (current_value == total_value or current_time - last_progress_emit_time > 0.1):
-             signals.progress_update.emit(progress); signals.status_update.emit(status); last_progress_emit_time = current_time
+        signals.progress_update.emit(progress); signals.status_update.emit(f"{status_prefix} ({current_value}/{total_value})")
+        last_progress_emit_time = current_time
 
     # --- 1. ファイルサイズでグループ化 ---
     num_files: int = len(image_paths)
@@ -78,67 +117,60 @@ def find_duplicate_files(image_paths: List[str],
     hash_range: float = progress_range * 0.8
     emit_progress(0, files_to_hash_count, hash_offset, hash_range, status_prefix_hash)
 
+    def add_hash(size: int, file_path: str, file_hash: str) -> None:
+        if size not in hashes_by_size: hashes_by_size[size] = {}
+        if file_hash not in hashes_by_size[size]: hashes_by_size[size][file_hash] = []
+        hashes_by_size[size][file_hash].append(file_path)
+
+    # キャッシュ済みのファイルは先に反映し、未計算のファイルだけを集める
+    files_to_calculate: List[Tuple[int, str]] = []
     size: int; paths: List[str]
     for size, paths in files_by_size.items():
         if len(paths) > 1:
-            if size not in hashes_by_size: hashes_by_size[size] = {}
             file_path: str
             for file_path in paths:
-                filename = os.path.basename(file_path) # エラーメッセージ用
                 if is_cancelled_func and is_cancelled_func():
                     if cache_handler: cache_handler.save_all()
                     return {}, errors
-
-                file_hash: Optional[str] = None
-                error_calculating = False
-
-                # キャッシュチェック
-                if cache_handler:
-                    cached_hash = cache_handler.get('md5', file_path)
-                    if cached_hash is not None:
-                        file_hash = str(cached_hash)
-
-                # キャッシュがない場合のみ計算
-                if file_hash is None:
-                    try:
-                        hasher = hashlib.md5()
-                        # ★ with open を使用 ★
-                        with open(file_path, 'rb') as file:
-                            while True:
-                                if is_cancelled_func and is_cancelled_func(): raise InterruptedError("ハッシュ計算中に中断")
-                                chunk: bytes = file.read(8192) # 8KBずつ読み込み
-                                if not chunk: break
-                                hasher.update(chunk)
-                        file_hash = hasher.hexdigest()
-                        if cache_handler:
-                            cache_handler.put('md5', file_path, file_hash)
-                    except InterruptedError:
-                         print(f"ハッシュ計算が中断されました: {filename}")
-                         if cache_handler: cache_handler.save_all()
-                         return {}, errors
-                    except FileNotFoundError:
-                         errors.append({'type': 'ハッシュ計算', 'path': filename, 'error': 'ファイルが見つかりません'})
-                         error_calculating = True
-                    except PermissionError:
-                         errors.append({'type': 'ハッシュ計算', 'path': filename, 'error': 'アクセス権がありません'})
-                         error_calculating = True
-                    except OSError as e:
-                         errors.append({'type': 'ハッシュ計算', 'path': filename, 'error': f'ファイル読込OSエラー: {e.strerror} (errno {e.errno})'})
-                         error_calculating = True
-                    except MemoryError:
-                         errors.append({'type': 'ハッシュ計算', 'path': filename, 'error': 'メモリ不足'})
-                         error_calculating = True
-                    except Exception as e:
-                         errors.append({'type': 'ハッシュ計算(予期せぬ)', 'path': filename, 'error': f'{type(e).__name__}: {e}'})
-                         error_calculating = True
-
-                # ハッシュ取得成功時のみ辞書に追加
-                if file_hash and not error_calculating:
-                    if file_hash not in hashes_by_size[size]: hashes_by_size[size][file_hash] = []
-                    hashes_by_size[size][file_hash].append(file_path)
-
-                hashed_files_count += 1
-                emit_progress(hashed_files_count, files_to_hash_count, hash_offset, hash_range, status_prefix_hash)
+                cached_hash = cache_handler.get('md5', file_path) if cache_handler else None
+                if cached_hash is not None:
+                    add_hash(size, file_path, str(cached_hash))
+                    hashed_files_count += 1
+                    emit_progress(hashed_files_count, files_to_hash_count, hash_offset, hash_range, status_prefix_hash)
+                else:
+                    files_to_calculate.append((size, file_path))
+
+    def handle_md5_result(size: int, file_path: str, result: Md5Result) -> None:
+        nonlocal hashed_files_count
+        file_hash, error = result
+        if error: errors.append(error)
+        # ハッシュ取得成功時のみ辞書に追加
+        elif file_hash:
+            if cache_handler: cache_handler.put('md5', file_path, file_hash)
+            add_hash(size, file_path, file_hash)
+        hashed_files_count += 1
+        emit_progress(hashed_files_count, files_to_hash_count, hash_offset, hash_range, status_prefix_hash)
+
+    try:
+        if max_workers > 1 and len(files_to_calculate) > 1:
+            # MD5 計算はファイル読込待ちが主なので、スレッドに分割して並列に実行する (結果の反映はこのスレッドで行う)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_file = {executor.submit(_calculate_md5, file_path, is_cancelled_func): (size, file_path)
+                                  for size, file_path in files_to_calculate}
+                for future in concurrent.futures.as_completed(future_to_file):
+                    if is_cancelled_func and is_cancelled_func():
+                        for f in future_to_file:
+                            if not f.done(): f.cancel()
+                        raise InterruptedError("ハッシュ計算中に中断")
+                    size, file_path = future_to_file[future]
+                    handle_md5_result(size, file_path, future.result())
+        else:
+            for size, file_path in files_to_calculate:
+                handle_md5_result(size, file_path, _calculate_md5(file_path, is_cancelled_func))
+    except InterruptedError:
+        print("ハッシュ計算が中断されました。")
+        if cache_handler: cache_handler.save_all()
+        return {}, errors
 
     # --- 3. 重複リスト作成 (変更なし) ---
     size: int; hashes: Dict[str, List[str]]
@@ -4,6 +4,9 @@ import numpy as np
 import os
 import itertools
 import time
+import functools
+import threading
+import concurrent.futures
 from PIL import Image, UnidentifiedImageError # ★ UnidentifiedImageError をインポート ★
 from typing import Tuple, Optional, List, Dict, Any, Union, Callable, Set
 
@@ -13,6 +16,11 @@ except ImportError:
     print("警告: utils.cache_handler のインポートに失敗しました。キャッシュ機能は無効になります。")
     CacheHandler = None
 
+try:
+    from utils.descriptor_cache import OrbDescriptorCache
+except ImportError:
+    OrbDescriptorCache = None
+
 # 型エイリアス (変更なし)
 ErrorMsgType = Optional[str]
 NumpyImageType = np.ndarray[Any, Any]
@@ -20,19 +28,22 @@ ImageType = Image.Image
 HashType = Optional[Any]
 PhashResult = Tuple[HashType, ErrorMsgType]
 OrbScoreResult = Tuple[Optional[int], ErrorMsgType]
+OrbDescriptorResult = Tuple[Optional[NumpyImageType], ErrorMsgType]
 ErrorDict = Dict[str, str]
 SimilarPair = Tuple[str, str, int]
 FindSimilarResult = Tuple[List[SimilarPair], List[ErrorDict], List[ErrorDict]]
 
 # 画像ローダー関数をインポート (変更なし)
 try:
-    from ..utils.image_loader import load_image_pil, load_image_as_numpy, HEIF_AVAILABLE
+    from ..utils.image_loader import load_image_pil, load_image_as_numpy, read_image_bytes, is_heif_path, HEIF_AVAILABLE
 except ImportError:
-    try: from utils.image_loader import load_image_pil, load_image_as_numpy, HEIF_AVAILABLE
+    try: from utils.image_loader import load_image_pil, load_image_as_numpy, read_image_bytes, is_heif_path, HEIF_AVAILABLE
     except ImportError:
         print("エラー: utils.image_loader のインポートに失敗しました。")
         def load_image_pil(path: str) -> Tuple[Optional[ImageType], ErrorMsgType]: return None, "Image loader not available"
-        def load_image_as_numpy(path: str, mode: str = 'gray') -> Tuple[Optional[NumpyImageType], ErrorMsgType]: return None, "Image loader not available"
+        def load_image_as_numpy(path: str, mode: str = 'gray', file_bytes: Optional[bytes] = None) -> Tuple[Optional[NumpyImageType], ErrorMsgType]: return None, "Image loader not available"
+        def read_image_bytes(path: str) -> Tuple[Optional[bytes], ErrorMsgType]: return None, "Image loader not available"
+        def is_heif_path(path: str) -> bool: return path.lower().endswith(('.heic', '.heif'))
         HEIF_AVAILABLE = False
 
 # ImageHash ライブラリをインポート (変更なし)
@@ -43,6 +54,66 @@ except ImportError:
     IMAGEHASH_AVAILABLE = False
     print("警告: ImageHash ライブラリが見つかりません。")
 
+# Faiss (任意) をインポート: あれば ORB ディスクリプタの Hamming 距離検索に SIMD 実装を使う
+try:
+    import faiss
+    FAISS_AVAILABLE: bool = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+# Numba (任意) をインポート: Faiss が無い場合に、64bit 単位の XOR + popcount で総当たりマッチングする
+try:
+    from numba import njit
+    NUMBA_AVAILABLE: bool = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+ORB_DESCRIPTOR_BITS: int = 256 # ORB ディスクリプタは 32 バイト (256 bit)
+PROGRESS_EMIT_INTERVAL: float = 0.1 # 進捗シグナルの最小送信間隔 (秒)
+# ORB 比較中に先読みしておく画像ファイル数 (ファイル読込と特徴量計算を重ねる)
+ORB_PREFETCH_COUNT: int = 8
+
+def _count_good_matches_faiss(des1: NumpyImageType, des2: NumpyImageType, ratio_threshold: float) -> int:
+    """Faiss の IndexBinaryFlat で des1 の各ディスクリプタの上位2近傍を求め、ratio test 通過数を返す"""
+    index = faiss.IndexBinaryFlat(ORB_DESCRIPTOR_BITS)
+    index.add(np.ascontiguousarray(des2, dtype=np.uint8))
+    distances, _ = index.search(np.ascontiguousarray(des1, dtype=np.uint8), 2)
+    valid = distances[:, 1] >= 0 # 近傍が2つ見つからなかった行 (-1) は除外
+    return int(np.count_nonzero(valid & (distances[:, 0] < ratio_threshold * distances[:, 1])))
+
+if NUMBA_AVAILABLE:
+    # uint64 と int の混在演算は float64 に昇格するため、定数も uint64 で持つ
+    _M1 = np.uint64(0x5555555555555555); _M2 = np.uint64(0x3333333333333333)
+    _M4 = np.uint64(0x0F0F0F0F0F0F0F0F); _H01 = np.uint64(0x0101010101010101)
+    _S1 = np.uint64(1); _S2 = np.uint64(2); _S4 = np.uint64(4); _S56 = np.uint64(56)
+
+    @njit(cache=True, nogil=True)
+    def _popcount64(x: Any) -> int:
+        """64bit 値の立っているビット数 (SWAR。多くの環境で LLVM が POPCNT 命令に最適化する)"""
+        x = x - ((x >> _S1) & _M1)
+        x = (x & _M2) + ((x >> _S2) & _M2)
+        x = (x + (x >> _S4)) & _M4
+        return int((x * _H01) >> _S56)
+
+    @njit(cache=True, nogil=True)
+    def _count_good_matches_packed(a: NumpyImageType, b: NumpyImageType, ratio_threshold: float) -> int:
+        """(N, 4) / (M, 4) の uint64 ディスクリプタで a の各行の上位2近傍を求め、ratio test 通過数を返す"""
+        good = 0
+        for i in range(a.shape[0]):
+            best = 1 << 30; second = 1 << 30
+            for j in range(b.shape[0]):
+                d = 0
+                for k in range(a.shape[1]):
+                    d += _popcount64(a[i, k] ^ b[j, k])
+                if d < best: second = best; best = d
+                elif d < second: second = d
+            if best < ratio_threshold * second: good += 1
+        return good
+
+def _pack_descriptors(descriptors: NumpyImageType) -> NumpyImageType:
+    """ORB ディスクリプタ (N, 32) uint8 を (N, 4) uint64 に詰め直す (コピーは連続でない場合のみ)"""
+    return np.ascontiguousarray(descriptors, dtype=np.uint8).view(np.uint64)
+
 def calculate_phash(image_path: str, cache_handler: Optional[CacheHandler] = None) -> PhashResult:
     """
     指定された画像の Perceptual Hash (pHash) を計算します。HEIC対応。
@@ -87,60 +158,127 @@ def calculate_phash(image_path: str, cache_handler: Optional[CacheHandler] = Non
         error_type = type(e).__name__
         return None, f"pHash計算エラー({error_type}: {e}): {filename}"
 
-def calculate_orb_similarity_score(image_path1: str, image_path2: str,
-                                   n_features: int = 1000, ratio_threshold: float = 0.75) -> OrbScoreResult:
-    """ORB特徴量を用いて類似度スコアを計算します。HEIC対応。エラーハンドリングを詳細化。"""
-    filename1 = os.path.basename(image_path1)
-    filename2 = os.path.basename(image_path2)
-    img1_gray: Optional[NumpyImageType]; img2_gray: Optional[NumpyImageType]
-    err1: ErrorMsgType; err2: ErrorMsgType
-
-    img1_gray, err1 = load_image_as_numpy(image_path1, mode='gray')
-    if err1: return None, f"画像1読込失敗({err1}): {filename1}"
-    img2_gray, err2 = load_image_as_numpy(image_path2, mode='gray')
-    if err2: return None, f"画像2読込失敗({err2}): {filename2}"
+@functools.lru_cache(maxsize=4)
+def _get_orb_detector(n_features: int) -> Any:
+    """特徴点数ごとに ORB 検出器を1つだけ作り、再スキャン時も同じオブジェクトを使い回す"""
+    return cv2.ORB_create(nfeatures=n_features, scaleFactor=1.2, nlevels=8, fastThreshold=20)
+
+_orb_thread_local = threading.local()
+
+def _get_thread_orb_detector(n_features: int) -> Any:
+    """スレッドごとに ORB 検出器を作って使い回す (1つの検出器を複数スレッドから同時に使わないため)"""
+    detectors: Optional[Dict[int, Any]] = getattr(_orb_thread_local, 'detectors', None)
+    if detectors is None: detectors = _orb_thread_local.detectors = {}
+    orb = detectors.get(n_features)
+    if orb is None:
+        orb = detectors[n_features] = cv2.ORB_create(nfeatures=n_features, scaleFactor=1.2, nlevels=8, fastThreshold=20)
+    return orb
+
+@functools.lru_cache(maxsize=1)
+def _get_bf_matcher() -> Any:
+    """Hamming 距離の BFMatcher (状態を持たないため使い回す)"""
+    return cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
+
+@functools.lru_cache(maxsize=1)
+def is_opencl_available() -> bool:
+    """OpenCV の OpenCL (T-API) が使える環境かどうか (判定は1回だけ行う)"""
+    try:
+        return bool(cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL())
+    except (cv2.error, AttributeError):
+        return False
 
-    # ★ None チェックをより明確に ★
-    if img1_gray is None: return None, f"画像1データ取得失敗(NumPy空): {filename1}"
-    if img2_gray is None: return None, f"画像2データ取得失敗(NumPy空): {filename2}"
+def create_orb_detector(n_features: int = 1000) -> Tuple[Optional[Any], ErrorMsgType]:
+    """
+    ORB 検出器を取得します。作成に失敗した場合は (None, エラーメッセージ) を返します。
+    検出器はキャッシュされるため、同じスレッド内で逐次的に使用してください。
+    """
+    try:
+        orb = _get_orb_detector(n_features)
+    except cv2.error as e:
+        return None, f"ORB作成失敗(OpenCV {e.funcName}: {e.msg})"
+    if orb is None: return None, "ORBオブジェクト作成失敗"
+    return orb, None
 
+def compute_orb_descriptors(img_gray: NumpyImageType, orb: Any, use_opencl: bool = False) -> OrbDescriptorResult:
+    """
+    読み込み済みのグレースケール画像から ORB ディスクリプタを計算します (特徴点が無い場合は None)。
+    use_opencl が True の場合は UMat を渡して OpenCL で計算し、失敗した場合は CPU で計算し直します。
+    """
     try:
-        # ★ ORB オブジェクト作成失敗も考慮 ★
-        orb: Optional[cv2.ORB] = None
-        try:
-             orb = cv2.ORB_create(nfeatures=n_features)
-        except cv2.error as e:
-             return None, f"ORB作成失敗(OpenCV {e.funcName}: {e.msg})"
-        if orb is None: return None, "ORBオブジェクト作成失敗"
-
-        # 特徴点と डिस्क्रिप्टर の計算
-        kp1: Tuple[cv2.KeyPoint, ...]; des1: Optional[NumpyImageType]
-        kp2: Tuple[cv2.KeyPoint, ...]; des2: Optional[NumpyImageType]
-        kp1, des1 = orb.detectAndCompute(img1_gray, None)
-        kp2, des2 = orb.detectAndCompute(img2_gray, None)
-
-        # डिस्क्रिप्टर が空かチェック
-        if des1 is None or des2 is None or len(des1) < 2 or len(des2) < 2:
-            # print(f"デバッグ: ORB डिस्क्रिप्टर不足: {filename1}({len(des1) if des1 is not None else 'None'}) vs {filename2}({len(des2) if des2 is not None else 'None'})")
-            return 0, None # マッチ数0 (エラーではない)
-
-        # マッチング実行
-        bf: cv2.BFMatcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=False)
+        if use_opencl:
+            try:
+                _, descriptors_umat = orb.detectAndCompute(cv2.UMat(img_gray), None)
+                if descriptors_umat is None: return None, None
+                return (descriptors_umat.get() if isinstance(descriptors_umat, cv2.UMat) else descriptors_umat), None
+            except cv2.error as e:
+                print(f"警告: OpenCL での ORB 計算に失敗したため CPU で計算します: {e.msg}")
+        _, descriptors = orb.detectAndCompute(img_gray, None)
+        return descriptors, None
+    except cv2.error as e:
+        return None, f"OpenCVエラー(ORB {e.funcName}: {e.msg})"
+    except MemoryError:
+        return None, "メモリ不足エラー(ORB)"
+
+def load_orb_descriptors(image_path: str, orb: Any, file_bytes: Optional[bytes] = None, use_opencl: bool = False) -> OrbDescriptorResult:
+    """画像を1回だけ読み込み (file_bytes があればそれをデコードし)、ORB ディスクリプタを計算します。"""
+    filename = os.path.basename(image_path)
+    img_gray, err = load_image_as_numpy(image_path, mode='gray', file_bytes=file_bytes)
+    if err: return None, f"画像読込失敗({err}): {filename}"
+    if img_gray is None: return None, f"画像データ取得失敗(NumPy空): {filename}"
+    descriptors, err = compute_orb_descriptors(img_gray, orb, use_opencl)
+    if err: return None, f"{err}: {filename}"
+    return descriptors, None
+
+def _load_orb_descriptors_threaded(image_path: str, n_features: int, use_opencl: bool = False) -> OrbDescriptorResult:
+    """ワーカースレッド用: スレッド専用の ORB 検出器で画像のディスクリプタを計算します。"""
+    try:
+        orb = _get_thread_orb_detector(n_features)
+    except cv2.error as e:
+        return None, f"ORB作成失敗(OpenCV {e.funcName}: {e.msg})"
+    return load_orb_descriptors(image_path, orb, use_opencl=use_opencl)
+
+def calculate_orb_similarity_from_descriptors(des1: Optional[NumpyImageType], des2: Optional[NumpyImageType],
+                                              ratio_threshold: float = 0.75) -> OrbScoreResult:
+    """計算済みの ORB ディスクリプタ同士をマッチングし、Lowe's ratio test を通過したマッチ数を返します。"""
+    # डिस्क्रिप्टर が空かチェック
+    if des1 is None or des2 is None or len(des1) < 2 or len(des2) < 2:
+        return 0, None # マッチ数0 (エラーではない)
+    try:
+        if FAISS_AVAILABLE:
+            return _count_good_matches_faiss(des1, des2, ratio_threshold), None
+        if NUMBA_AVAILABLE and des1.shape[1] * 8 == ORB_DESCRIPTOR_BITS:
+            return _count_good_matches_packed(_pack_descriptors(des1), _pack_descriptors(des2), ratio_threshold), None
+        # Faiss・Numba・BFMatcher はいずれも厳密な近傍探索のため、どの経路でもマッチ数は同じになる
+        bf: cv2.BFMatcher = _get_bf_matcher()
         raw_matches: Optional[List[List[cv2.DMatch]]] = bf.knnMatch(des1, des2, k=2)
-
-        good_matches: List[cv2.DMatch] = []
+        good_count: int = 0
         if raw_matches:
             for match_pair in raw_matches:
-                if len(match_pair) == 2:
-                    m, n = match_pair
-                    if m.distance < ratio_threshold * n.distance:
-                        good_matches.append(m)
-        return len(good_matches), None
-
+                if len(match_pair) == 2 and match_pair[0].distance < ratio_threshold * match_pair[1].distance:
+                    good_count += 1
+        return good_count, None
     except cv2.error as e:
         return None, f"OpenCVエラー(ORB {e.funcName}: {e.msg})"
     except MemoryError:
-        return None, f"メモリ不足エラー(ORB): {filename1} vs {filename2}"
+        return None, "メモリ不足エラー(ORB)"
+    except RuntimeError as e: # Faiss 内部エラー
+        return None, f"Faissエラー(ORB {e})"
+
+def calculate_orb_similarity_score(image_path1: str, image_path2: str,
+                                   n_features: int = 1000, ratio_threshold: float = 0.75) -> OrbScoreResult:
+    """ORB特徴量を用いて類似度スコアを計算します。HEIC対応。エラーハンドリングを詳細化。"""
+    filename1 = os.path.basename(image_path1)
+    filename2 = os.path.basename(image_path2)
+    orb, orb_error = create_orb_detector(n_features)
+    if orb is None: return None, orb_error
+
+    des1, err1 = load_orb_descriptors(image_path1, orb)
+    if err1: return None, f"画像1: {err1}"
+    des2, err2 = load_orb_descriptors(image_path2, orb)
+    if err2: return None, f"画像2: {err2}"
+
+    try:
+        return calculate_orb_similarity_from_descriptors(des1, des2, ratio_threshold)
     except Exception as e:
         error_type = type(e).__name__
         return None, f"予期せぬエラー(ORB {error_type}: {e}): {filename1} vs {filename2}"
@@ -158,23 +296,34 @@ def find_similar_pairs(image_paths: List[str],
                        progress_range: int = 100,
                        is_cancelled_func: Optional[Callable[[], bool]] = None,
                        cache_handler: Optional[CacheHandler] = None,
-                       normalize_scores: bool = True) -> FindSimilarResult:
+                       normalize_scores: bool = True,
+                       max_workers: int = 1,
+                       use_opencl: bool = False,
+                       descriptor_cache: Optional[OrbDescriptorCache] = None,
+                       known_stats: Optional[Dict[str, os.stat_result]] = None) -> FindSimilarResult:
     """
     指定された画像パスリスト内の画像を比較し、類似しているペアを見つけます。
     エラーハンドリングを詳細化。
+    max_workers が 2 以上の場合、ORB ディスクリプタの計算 (画像の読込・デコードを含む) を複数スレッドで行います。
+    use_opencl が True で OpenCL が使える環境では、ORB の計算に OpenCL (UMat) を使います。
+    descriptor_cache を渡すと、前回から変更の無い画像は保存済みのディスクリプタを使います (呼び出し元のスレッドで作成したもの)。
+    known_stats にフォルダ走査時の stat 結果を渡すと、キャッシュ照合でのファイルごとの os.stat を省略します。
     """
     processing_errors: List[ErrorDict] = []
     file_list_errors: List[ErrorDict] = [] # 現状未使用
 
     last_progress_emit_time: float = 0.0
     def emit_progress(current_value: int, total_value: int, stage_offset: int, stage_range: float, status_prefix: str) -> None:
-        nonlocal last_progress_emit_time; progress: int = stage_offset
+        nonlocal last_progress_emit_time
+        if not signals: return
+        # 送信間隔 (0.1秒) を満たすまでは進捗値や文字列を作らない (ループ内で毎回呼ばれるため)
+        current_time: float = time.monotonic()
+        if current_value != total_value and current_time - last_progress_emit_time <= PROGRESS_EMIT_INTERVAL: return
+        if not (hasattr(signals, 'progress_update') and hasattr(signals, 'status_update')): return
+        progress: int = stage_offset
         if total_value > 0: progress = stage_offset + int((current_value / total_value) * stage_range)
-        status: str = f"{status_prefix} ({current_value}/{total_value})"
-        current_time: float = time.time()
-        if signals and hasattr(signals, 'progress_update') and hasattr(signals, 'status_update') and \
-           (current_value == total_value or current_time - last_progress_emit_time > 0.1):
-             signals.progress_update.emit(progress); signals.status_update.emit(status); last_progress_emit_time = current_time
+        signals.progress_update.emit(progress); signals.status_update.emit(f"{status_prefix} ({current_value}/{total_value})")
+        last_progress_emit_time = current_time
 
     non_duplicate_paths: List[str] = [p for p in image_paths if p not in duplicate_paths_set]
     num_images_to_compare: int = len(non_duplicate_paths)
@@ -274,31 +423,100 @@ def find_similar_pairs(image_paths: List[str],
         if not use_phash_step: orb_comp_offset = float(progress_offset); orb_comp_range = float(progress_range)
         else: orb_comp_offset = progress_offset + (progress_range * 0.10) + (progress_range * 0.10); orb_comp_range = progress_range * 0.80
         emit_progress(0, total_orb_comparisons, int(orb_comp_offset), int(orb_comp_range), status_prefix_orb_comp)
+        if use_opencl and not is_opencl_available():
+            print("警告: OpenCL が使用できないため、ORB は CPU で計算します。"); use_opencl = False
+        orb, orb_error = create_orb_detector(orb_nfeatures)
+        if orb is None:
+            processing_errors.append({'type': 'ORB比較', 'path': 'N/A', 'error': orb_error or "ORBオブジェクト作成失敗"})
+            total_orb_comparisons = 0
+        # 各画像は1回だけ読み込んでディスクリプタを計算し、以降のペア比較で使い回す
+        descriptor_memo: Dict[str, OrbDescriptorResult] = {}
+        # 比較で使う順に画像を並べておく
+        first_use_order: List[str] = list(dict.fromkeys(p for pair in candidate_pairs for p in pair))
+        # 永続キャッシュ: パス・更新日時・サイズが前回と同じ画像は特徴量を計算しない (計算条件ごとに別扱い)
+        descriptor_cache_algo: str = f"orb:{orb_nfeatures}" + (":opencl" if use_opencl else "")
+        file_stats: Dict[str, Tuple[float, int]] = {}
+        if descriptor_cache is not None and total_orb_comparisons > 0:
+            for path in first_use_order:
+                st: Optional[os.stat_result] = known_stats.get(path) if known_stats else None
+                if st is None:
+                    try: st = os.stat(path)
+                    except OSError: continue
+                file_stats[path] = (st.st_mtime, st.st_size)
+                cached_descriptors: Optional[NumpyImageType] = descriptor_cache.get(path, st.st_mtime, st.st_size, descriptor_cache_algo)
+                if cached_descriptors is not None: descriptor_memo[path] = (cached_descriptors, None)
+            print(f"ORB特徴量キャッシュ: {len(descriptor_memo)}/{len(first_use_order)} 件ヒット")
+            first_use_order = [p for p in first_use_order if p not in descriptor_memo]
+        parallel_descriptors: bool = max_workers > 1 and len(first_use_order) > 1
+        # 並列時: 全画像の特徴量計算をスレッドプールに投入し (OpenCV は計算中 GIL を解放する)、比較は完了したものから進める
+        # 逐次時: 先の画像のファイル読込だけを別スレッドで行っておく (HEIF は Pillow で直接読むため対象外)
+        prefetch_order: List[str] = [] if parallel_descriptors else [p for p in first_use_order if not is_heif_path(p)]
+        prefetch_pos: int = 0
+        prefetched: Dict[str, concurrent.futures.Future] = {}
+        descriptor_futures: Dict[str, concurrent.futures.Future] = {}
+        prefetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers if parallel_descriptors else 2)
+        def schedule_prefetch() -> None:
+            nonlocal prefetch_pos
+            while prefetch_pos < len(prefetch_order) and len(prefetched) < ORB_PREFETCH_COUNT:
+                next_path = prefetch_order[prefetch_pos]; prefetch_pos += 1
+                if next_path not in descriptor_memo:
+                    prefetched[next_path] = prefetch_executor.submit(read_image_bytes, next_path)
+        def remember_descriptors(path: str, result: OrbDescriptorResult) -> None:
+            descriptor_memo[path] = result
+            if descriptor_cache is not None and result[1] is None and path in file_stats:
+                descriptor_cache.put(path, *file_stats[path], descriptor_cache_algo, result[0])
+        def get_descriptors(path: str) -> OrbDescriptorResult:
+            result = descriptor_memo.get(path)
+            if result is None:
+                descriptor_future = descriptor_futures.pop(path, None)
+                if descriptor_future is not None:
+                    result = descriptor_future.result(); remember_descriptors(path, result)
+                    return result
+                future = prefetched.pop(path, None)
+                file_bytes: Optional[bytes] = future.result()[0] if future is not None else None
+                # 先読みに失敗した場合はパスから読み直し、通常のエラーメッセージを得る
+                result = load_orb_descriptors(path, orb, file_bytes, use_opencl); remember_descriptors(path, result)
+                schedule_prefetch()
+            return result
         if total_orb_comparisons > 0:
-            path1: str; path2: str
-            for path1, path2 in candidate_pairs:
-                filename1 = os.path.basename(path1); filename2 = os.path.basename(path2)
-                if is_cancelled_func and is_cancelled_func():
-                    if cache_handler: cache_handler.save_all()
-                    return similar_pairs, processing_errors, []
-                orb_comparisons += 1
-                score: Optional[int]; error_msg: ErrorMsgType
-                score, error_msg = calculate_orb_similarity_score(path1, path2, n_features=orb_nfeatures, ratio_threshold=orb_ratio_threshold)
-                if error_msg:
-                    # ★ エラーメッセージにファイル名を含める ★
-                    processing_errors.append({'type': 'ORB比較', 'path': f"{filename1} vs {filename2}", 'path1': path1, 'path2': path2, 'error': error_msg})
-                elif score is not None and score >= min_good_matches_threshold:
-                    if normalize_scores:
-                        # ORBスコアを正規化: 閾値以上のスコアを1-99の範囲にマッピング
-                        # 最小スコア = min_good_matches_threshold, 最大スコア = orb_nfeatures
-                        # 高いスコアほど類似度が高い (99が最も似ている、1が最も異なる)
-                        max_score = orb_nfeatures
-                        normalized_score = max(1, min(99, 1 + int((score - min_good_matches_threshold) / 
-                                            (max_score - min_good_matches_threshold) * 98)))
-                        similar_pairs.append((path1, path2, normalized_score))
-                    else:
-                        similar_pairs.append((path1, path2, score))
-                emit_progress(orb_comparisons, total_orb_comparisons, int(orb_comp_offset), int(orb_comp_range), status_prefix_orb_comp)
+            if parallel_descriptors:
+                descriptor_futures = {p: prefetch_executor.submit(_load_orb_descriptors_threaded, p, orb_nfeatures, use_opencl) for p in first_use_order}
+            else: schedule_prefetch()
+        try:
+            if total_orb_comparisons > 0:
+                path1: str; path2: str
+                for path1, path2 in candidate_pairs:
+                    filename1 = os.path.basename(path1); filename2 = os.path.basename(path2)
+                    if is_cancelled_func and is_cancelled_func():
+                        if cache_handler: cache_handler.save_all()
+                        return similar_pairs, processing_errors, []
+                    orb_comparisons += 1
+                    score: Optional[int]; error_msg: ErrorMsgType
+                    des1, err1 = get_descriptors(path1)
+                    des2, err2 = get_descriptors(path2)
+                    if err1: score, error_msg = None, f"画像1: {err1}"
+                    elif err2: score, error_msg = None, f"画像2: {err2}"
+                    else: score, error_msg = calculate_orb_similarity_from_descriptors(des1, des2, ratio_threshold=orb_ratio_threshold)
+                    if error_msg:
+                        # ★ エラーメッセージにファイル名を含める ★
+                        processing_errors.append({'type': 'ORB比較', 'path': f"{filename1} vs {filename2}", 'path1': path1, 'path2': path2, 'error': error_msg})
+                    elif score is not None and score >= min_good_matches_threshold:
+                        if normalize_scores:
+                            # ORBスコアを正規化: 閾値以上のスコアを1-99の範囲にマッピング
+                            # 最小スコア = min_good_matches_threshold, 最大スコア = orb_nfeatures
+                            # 高いスコアほど類似度が高い (99が最も似ている、1が最も異なる)
+                            max_score = orb_nfeatures
+                            normalized_score = max(1, min(99, 1 + int((score - min_good_matches_threshold) / 
+                                                (max_score - min_good_matches_threshold) * 98)))
+                            similar_pairs.append((path1, path2, normalized_score))
+                        else:
+                            similar_pairs.append((path1, path2, score))
+                    emit_progress(orb_comparisons, total_orb_comparisons, int(orb_comp_offset), int(orb_comp_range), status_prefix_orb_comp)
+        finally:
+            # 中断時も含め、未使用の先読みは破棄する
+            for future in prefetched.values(): future.cancel()
+            for future in descriptor_futures.values(): future.cancel()
+            prefetch_executor.shutdown(wait=False)
         emit_progress(total_orb_comparisons, total_orb_comparisons, int(orb_comp_offset), int(orb_comp_range), status_prefix_orb_comp)
         print(f"ORB比較完了。")
 
@@ -1,4 +1,5 @@
 # gui/dialogs/settings_dialog.py
+import os
 import math
 import copy
 import functools # ★ functools をインポート ★
@@ -32,6 +33,12 @@ SIMILARITY_MODES: Dict[str, str] = {
 HELP_TEXTS = {
     "scan_subdirectories": "オンにすると、選択したフォルダ内のサブフォルダも再帰的にスキャン対象とします。",
     "use_cache": "オンにすると、スキャン結果（MD5、pHash値など）をキャッシュとして対象フォルダ内に保存します。\n\nキャッシュを使用すると、再スキャン時の処理が高速化されます。\nキャッシュは対象フォルダ内の非表示フォルダに保存されます。",
+    "fast_folder_picker": "オンにすると、OS標準ではなくQt組み込みのフォルダ/ファイル選択ダイアログを使用します。\n\n"
+                          "ネットワークドライブ(NAS)やリムーバブルドライブ上のフォルダを開く際、\n"
+                          "標準ダイアログのアイコン取得による待ち時間を避けられます。",
+    "show_thumbnails": "オンにすると、結果一覧のファイル名の横にサムネイル画像を表示します。\n\n"
+                       "サムネイルは表示された行の分だけバックグラウンドで作成され、\n"
+                       "ホームフォルダ内の非表示フォルダにキャッシュされます。",
     "auto_save_state": "オンにすると、スキャン処理中に一定間隔で進行状況を自動保存します。\n\nアプリケーションが予期せず終了した場合でも、次回起動時に中断した地点から再開できます。\n状態ファイルはスキャン対象フォルダ内に保存されます。",
     "auto_restore_on_start": "オンにすると、アプリケーション起動時に自動的に中断データを確認し、\n復元オプションを表示します。",
     "auto_save_interval": "スキャン中に何ファイル処理するごとに状態を自動保存するかを指定します。\n\n値を小さくすると、より頻繁に保存されますが、パフォーマンスが低下する可能性があります。\n値を大きくすると、保存頻度は下がりますが、クラッシュ時に失われる作業量が増えます。",
@@ -42,6 +49,29 @@ HELP_TEXTS = {
                           "値が低いほど「ブレている」と判定されやすくなります。\n"
                           "画像内の高周波成分の割合に基づいて計算され、値が低いほど高周波成分が少ない（=ブレている可能性が高い）ことを示します。\n"
                           "デフォルトは80です。",
+    "blur_sharp_gate": "オンにすると、FFTの前に縮小画像 (長辺256px) のLaplacian分散を計算し、\n"
+                       "明らかにシャープな画像はFFTを省略してブレていないと判定します。\n\n"
+                       "省略する基準はスキャンごとに一部の画像でFFTの判定と突き合わせて決めるため、\n"
+                       "FFTでブレと判定される画像は省略されにくくなっています。判定値はキャッシュされます。\n"
+                       "シャープな写真が大半のフォルダではブレ検出が速くなります。\n"
+                       "FFTアルゴリズム使用時のみ有効です。",
+    "blur_fft_downscale": "オンにすると、FFTの前に画像を長辺512pxへ縮小して計算します。\n"
+                          "高解像度の写真ほどブレ検出が速くなります。\n\n"
+                          "ただし縮小すると細かい高周波成分が失われるため、スコアの基準が変わります。\n"
+                          "軽いブレの画像がシャープと判定されやすくなるので、オンにした場合は閾値を調整し直してください。\n"
+                          "FFTアルゴリズム使用時のみ有効です。",
+    "blur_hash_prefilter": "オンにすると、ブレ検出の前にファイルサイズとMD5ハッシュを比較し、\n"
+                           "内容がバイト単位で完全に同一のファイル (コピー) は代表1枚だけブレスコアを計算して結果を共有します。\n\n"
+                           "見た目が似ているだけの画像 (連写や、ブレた複製など) はそれぞれ計算します。\n"
+                           "同じファイルのコピーが多いフォルダでは、ブレ検出が速くなります。\n"
+                           "サイズが同じファイルが多いフォルダでは、MD5の計算分だけ遅くなることがあります。",
+    "blur_parallel_workers": "ブレ検出を同時に実行するプロセス数の上限です。\n\n"
+                             "0 の場合はCPUコア数の半分を使います。\n"
+                             "スキャン中に他の作業を行う場合は、小さな値に制限するとPCの動作が軽くなります。",
+    "io_parallel_threads": "重複検出 (MD5ハッシュ) と類似検出 (ORB特徴量) の計算に使うスレッド数の上限です。\n\n"
+                           "0 の場合はCPUコア数の半分を使います。\n"
+                           "ブレ検出の並列プロセス数とは別に設定できます。HDD やネットワークドライブでは、\n"
+                           "小さな値にすると読み込みの競合が減り速くなることがあります。",
     "blur_threshold_laplacian": "Laplacianアルゴリズム使用時の閾値です。\n"
                                 "値が低いほど「ブレている」と判定されやすくなります。\n"
                                 "画像のエッジの分散（ばらつき）を表し、値が低いほどエッジが不明瞭（=ブレている可能性が高い）ことを示します。\n"
@@ -63,7 +93,10 @@ HELP_TEXTS = {
                  "デフォルトは70です。",
     "orb_min_matches": "ORBモード（pHash+ORB または ORBのみ）で「類似している」と判定するために必要な、最低限のマッチした特徴点の数です。\n"
                        "値が大きいほど、より多くの特徴点が一致した場合のみ類似と判定します。\n"
-                       "デフォルトは40です。"
+                       "デフォルトは40です。",
+    "orb_use_opencl": "オンにすると、ORB特徴量の計算 (画像ピラミッドの作成やガウシアンぼかし) を\n"
+                      "OpenCL 経由でGPUなどに任せます。対応するドライバーが無い環境ではCPUで計算します。\n\n"
+                      "環境によっては検出される特徴点がわずかに変わり、類似判定の結果が変わることがあります。"
 }
 # ★★★★★★★★★★★★★★★★★★★
 
@@ -86,11 +119,17 @@ class SettingsDialog(QDialog):
         self.blur_algorithm_label: QLabel; self.blur_algorithm_combobox: QComboBox
         self.blur_threshold_label: QLabel; self.blur_threshold_spinbox: QSpinBox
         self.blur_laplacian_threshold_label: QLabel; self.blur_laplacian_threshold_spinbox: QSpinBox
+        self.blur_fft_downscale_checkbox: QCheckBox
+        self.blur_sharp_gate_checkbox: QCheckBox
+        self.blur_hash_prefilter_checkbox: QCheckBox
+        self.blur_parallel_workers_label: QLabel; self.blur_parallel_workers_spinbox: QSpinBox
+        self.io_parallel_threads_label: QLabel; self.io_parallel_threads_spinbox: QSpinBox
         self.similarity_mode_label: QLabel; self.similarity_mode_combobox: QComboBox
         self.hash_threshold_label: QLabel; self.hash_threshold_spinbox: QSpinBox
         self.orb_features_label: QLabel; self.orb_features_spinbox: QSpinBox
         self.orb_ratio_label: QLabel; self.orb_ratio_spinbox: QSpinBox
         self.orb_min_matches_label: QLabel; self.orb_min_matches_spinbox: QSpinBox
+        self.orb_use_opencl_checkbox: QCheckBox
         self.preset_label: QLabel
         self.preset_combobox: QComboBox
         self.save_preset_button: QPushButton
@@ -177,6 +216,22 @@ class SettingsDialog(QDialog):
         self.use_cache_checkbox = QCheckBox("キャッシュを使用する")
         self.use_cache_checkbox.setChecked(bool(self.current_settings.get('use_cache', True)))  # デフォルトは有効
         general_layout.addRow(self._create_widget_with_help(self.use_cache_checkbox, HELP_TEXTS["use_cache"]))
+
+        self.fast_folder_picker_checkbox = QCheckBox("軽量なフォルダ選択ダイアログを使用する")
+        self.fast_folder_picker_checkbox.setChecked(bool(self.current_settings.get('fast_folder_picker', False)))
+        general_layout.addRow(self._create_widget_with_help(self.fast_folder_picker_checkbox, HELP_TEXTS["fast_folder_picker"]))
+
+        self.show_thumbnails_checkbox = QCheckBox("結果一覧にサムネイルを表示する")
+        self.show_thumbnails_checkbox.setChecked(bool(self.current_settings.get('show_thumbnails', False)))
+        general_layout.addRow(self._create_widget_with_help(self.show_thumbnails_checkbox, HELP_TEXTS["show_thumbnails"]))
+
+        self.io_parallel_threads_label = QLabel("MD5/ORB スレッド数 (0で自動):")
+        self.io_parallel_threads_spinbox = QSpinBox()
+        self.io_parallel_threads_spinbox.setRange(0, max(1, os.cpu_count() or 1))
+        self.io_parallel_threads_spinbox.setValue(int(self.current_settings.get('io_parallel_threads', 0)))
+        self.io_parallel_threads_spinbox.setMinimumWidth(120)
+        self.io_parallel_threads_spinbox.setMinimumHeight(25)
+        general_layout.addRow(self.io_parallel_threads_label, self._create_widget_with_help(self.io_parallel_threads_spinbox, HELP_TEXTS["io_parallel_threads"]))
         
         main_layout.addWidget(general_group)
         
@@ -253,6 +308,26 @@ class SettingsDialog(QDialog):
         self.blur_laplacian_threshold_spinbox.setMinimumHeight(25)
         # ★ ヘルプボタン付きで追加 ★
         blur_layout.addRow(self.blur_laplacian_threshold_label, self._create_widget_with_help(self.blur_laplacian_threshold_spinbox, HELP_TEXTS["blur_threshold_laplacian"]))
+
+        self.blur_fft_downscale_checkbox = QCheckBox("FFTの前に画像を縮小して高速化する (スコアの基準が変わります)")
+        self.blur_fft_downscale_checkbox.setChecked(bool(self.current_settings.get('blur_fft_downscale', False)))
+        blur_layout.addRow(self._create_widget_with_help(self.blur_fft_downscale_checkbox, HELP_TEXTS["blur_fft_downscale"]))
+
+        self.blur_sharp_gate_checkbox = QCheckBox("明らかにシャープな画像はFFTを省略する")
+        self.blur_sharp_gate_checkbox.setChecked(bool(self.current_settings.get('blur_sharp_gate', False)))
+        blur_layout.addRow(self._create_widget_with_help(self.blur_sharp_gate_checkbox, HELP_TEXTS["blur_sharp_gate"]))
+
+        self.blur_hash_prefilter_checkbox = QCheckBox("完全に同一のファイル (コピー) はブレスコアを共有する (MD5)")
+        self.blur_hash_prefilter_checkbox.setChecked(bool(self.current_settings.get('blur_hash_prefilter', False)))
+        blur_layout.addRow(self._create_widget_with_help(self.blur_hash_prefilter_checkbox, HELP_TEXTS["blur_hash_prefilter"]))
+
+        self.blur_parallel_workers_label = QLabel("並列プロセス数 (0で自動):")
+        self.blur_parallel_workers_spinbox = QSpinBox()
+        self.blur_parallel_workers_spinbox.setRange(0, max(1, os.cpu_count() or 1))
+        self.blur_parallel_workers_spinbox.setValue(int(self.current_settings.get('blur_parallel_workers', 0)))
+        self.blur_parallel_workers_spinbox.setMinimumWidth(120)
+        self.blur_parallel_workers_spinbox.setMinimumHeight(25)
+        blur_layout.addRow(self.blur_parallel_workers_label, self._create_widget_with_help(self.blur_parallel_workers_spinbox, HELP_TEXTS["blur_parallel_workers"]))
         main_layout.addWidget(blur_group)
 
         # --- 類似ペア検出設定 ---
@@ -299,6 +374,10 @@ class SettingsDialog(QDialog):
         self.orb_min_matches_spinbox.setMinimumHeight(25)
         # ★ ヘルプボタン付きで追加 ★
         similar_layout.addRow(self.orb_min_matches_label, self._create_widget_with_help(self.orb_min_matches_spinbox, HELP_TEXTS["orb_min_matches"]))
+
+        self.orb_use_opencl_checkbox = QCheckBox("ORB の計算に OpenCL を使う")
+        self.orb_use_opencl_checkbox.setChecked(bool(self.current_settings.get('orb_use_opencl', False)))
+        similar_layout.addRow(self._create_widget_with_help(self.orb_use_opencl_checkbox, HELP_TEXTS["orb_use_opencl"]))
         main_layout.addWidget(similar_group)
 
         # --- OK / Cancel ボタン ---
@@ -390,6 +469,8 @@ class SettingsDialog(QDialog):
         """設定辞書をUIに反映する"""
         self.scan_subdirectories_checkbox.setChecked(bool(settings_data.get('scan_subdirectories', False)))
         self.use_cache_checkbox.setChecked(bool(settings_data.get('use_cache', True)))
+        self.fast_folder_picker_checkbox.setChecked(bool(settings_data.get('fast_folder_picker', False)))
+        self.show_thumbnails_checkbox.setChecked(bool(settings_data.get('show_thumbnails', False)))
         self.auto_save_state_checkbox.setChecked(bool(settings_data.get('auto_save_state', True)))
         self.auto_restore_on_start_checkbox.setChecked(bool(settings_data.get('auto_restore_on_start', True)))
         self.auto_save_interval_spinbox.setValue(int(settings_data.get('auto_save_interval', 100)))
@@ -403,6 +484,11 @@ class SettingsDialog(QDialog):
         self.blur_threshold_spinbox.setValue(math.floor(fft_float * 100))
 
         self.blur_laplacian_threshold_spinbox.setValue(int(settings_data.get('blur_laplacian_threshold', 100)))
+        self.blur_fft_downscale_checkbox.setChecked(bool(settings_data.get('blur_fft_downscale', False)))
+        self.blur_sharp_gate_checkbox.setChecked(bool(settings_data.get('blur_sharp_gate', False)))
+        self.blur_hash_prefilter_checkbox.setChecked(bool(settings_data.get('blur_hash_prefilter', False)))
+        self.blur_parallel_workers_spinbox.setValue(int(settings_data.get('blur_parallel_workers', 0)))
+        self.io_parallel_threads_spinbox.setValue(int(settings_data.get('io_parallel_threads', 0)))
 
         sim_mode = str(settings_data.get('similarity_mode', 'phash_orb'))
         sim_idx = self.similarity_mode_combobox.findData(sim_mode)
@@ -417,6 +503,7 @@ class SettingsDialog(QDialog):
         self.orb_ratio_spinbox.setValue(math.floor(orb_ratio_float * 100))
 
         self.orb_min_matches_spinbox.setValue(int(settings_data.get('min_good_matches', 40)))
+        self.orb_use_opencl_checkbox.setChecked(bool(settings_data.get('orb_use_opencl', False)))
 
         self._update_blur_threshold_visibility()
         self._update_similarity_options_visibility()
@@ -426,6 +513,8 @@ class SettingsDialog(QDialog):
         settings = {}
         settings['scan_subdirectories'] = self.scan_subdirectories_checkbox.isChecked()
         settings['use_cache'] = self.use_cache_checkbox.isChecked()
+        settings['fast_folder_picker'] = self.fast_folder_picker_checkbox.isChecked()
+        settings['show_thumbnails'] = self.show_thumbnails_checkbox.isChecked()
         settings['auto_save_state'] = self.auto_save_state_checkbox.isChecked()
         settings['auto_restore_on_start'] = self.auto_restore_on_start_checkbox.isChecked()
         settings['auto_save_interval'] = self.auto_save_interval_spinbox.value()
@@ -435,6 +524,11 @@ class SettingsDialog(QDialog):
         settings['blur_threshold'] = float(fft_int / 100.0)
 
         settings['blur_laplacian_threshold'] = self.blur_laplacian_threshold_spinbox.value()
+        settings['blur_fft_downscale'] = self.blur_fft_downscale_checkbox.isChecked()
+        settings['blur_sharp_gate'] = self.blur_sharp_gate_checkbox.isChecked()
+        settings['blur_hash_prefilter'] = self.blur_hash_prefilter_checkbox.isChecked()
+        settings['blur_parallel_workers'] = self.blur_parallel_workers_spinbox.value()
+        settings['io_parallel_threads'] = self.io_parallel_threads_spinbox.value()
         settings['similarity_mode'] = self.similarity_mode_combobox.currentData()
 
         settings['hash_threshold'] = self.hash_threshold_spinbox.value()
@@ -443,6 +537,7 @@ class SettingsDialog(QDialog):
         settings['orb_ratio_threshold'] = float(orb_ratio_int / 100.0)
 
         settings['min_good_matches'] = self.orb_min_matches_spinbox.value()
+        settings['orb_use_opencl'] = self.orb_use_opencl_checkbox.isChecked()
         return settings
 
     # --- 既存のスロット (変更なし) ---
@@ -461,6 +556,7 @@ class SettingsDialog(QDialog):
         self.orb_features_label.setVisible(use_orb); self.orb_features_spinbox.setVisible(use_orb)
         self.orb_ratio_label.setVisible(use_orb); self.orb_ratio_spinbox.setVisible(use_orb)
         self.orb_min_matches_label.setVisible(use_orb); self.orb_min_matches_spinbox.setVisible(use_orb)
+        self.orb_use_opencl_checkbox.setVisible(use_orb)
 
     def accept(self) -> None:
         """OKボタンが押されたときの処理"""
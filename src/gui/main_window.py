@@ -6,12 +6,12 @@ import traceback # エラー時のトレースバック表示用
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QFrame, QFileDialog, QProgressBar,
-    QMessageBox, QMenuBar, QTableWidget, QAbstractItemView
+    QMessageBox, QMenuBar
 )
-from PySide6.QtCore import Qt, QThreadPool, Slot, QDir, QMimeData, QUrl
+from PySide6.QtCore import Qt, QThreadPool, Slot, QDir, QMimeData, QUrl, QSignalBlocker, QTimer
 from PySide6.QtGui import QCloseEvent, QKeyEvent, QAction, QActionGroup, QDragEnterEvent, QDragMoveEvent, QDropEvent
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional, Any, Union, Set
+from typing import List, Dict, Tuple, Optional, Any, Union, Set, Callable
 
 # --- 型エイリアス ---
 SettingsDict = Dict[str, Any]
@@ -25,22 +25,45 @@ DeleteResult = Tuple[int, List[ErrorDict], Set[str]]
 ScanStateData = Dict[str, Any]
 LoadStateResult = Tuple[Optional[ScanStateData], Optional[str]]
 
+PREVIEW_UPDATE_DELAY_MS: int = 50 # 選択変更からプレビュー更新までの待ち時間
+
 # --- ウィジェット、ワーカー、ダイアログをインポート ---
 try:
     from .widgets.preview_widget import PreviewWidget
     from .widgets.results_tabs_widget import ResultsTabsWidget
-    from .workers import ScanWorker, WorkerSignals
-    from .dialogs.settings_dialog import SettingsDialog
+    from .workers import ScanWorker, WorkerSignals, SaveResultsWorker, shutdown_blur_process_pool
 except ImportError as e:
     print(f"エラー: GUIコンポーネントのインポートに失敗 ({e})")
     traceback.print_exc()
     sys.exit(1)
 
+# --- 起動時に不要なモジュールは初回使用時に読み込む ---
+_lazy_imports: Dict[str, Any] = {}
+
+def _get_settings_dialog_class() -> Optional[type]:
+    """SettingsDialog クラスを初回呼び出し時にインポートして返す (失敗時は None)"""
+    if 'SettingsDialog' not in _lazy_imports:
+        try:
+            from .dialogs.settings_dialog import SettingsDialog
+            _lazy_imports['SettingsDialog'] = SettingsDialog
+        except ImportError as e:
+            print(f"エラー: 設定ダイアログのインポートに失敗 ({e})")
+            _lazy_imports['SettingsDialog'] = None
+    return _lazy_imports['SettingsDialog']
+
+# --- 設定値クラスはフォールバックを持たない (config_handler の定義のみを使う) ---
+try:
+    from utils.config_handler import AppSettings
+except ImportError as e:
+    print(f"エラー: 設定モジュールのインポートに失敗 ({e})")
+    traceback.print_exc()
+    sys.exit(1)
+
 # --- ユーティリティ関数をインポート ---
 try:
     from utils.config_handler import load_settings, save_settings
     from utils.file_operations import delete_files_to_trash, open_file_external, rename_images_to_sequence
-    from utils.results_handler import save_results_to_file, load_results_from_file, load_scan_state, delete_scan_state, get_state_filepath
+    from utils.results_handler import load_results_from_file, load_scan_state, delete_scan_state, get_state_filepath
 except ImportError as e:
     print(f"エラー: ユーティリティモジュールのインポートに失敗 ({e})")
     # フォールバック関数
@@ -48,7 +71,6 @@ except ImportError as e:
     def save_settings(s: SettingsDict) -> bool: print("警告: 設定保存機能が無効"); return False
     def delete_files_to_trash(fps: List[str], p: Optional[QWidget] = None) -> DeleteResult: print("警告: 削除機能が無効"); return 0, [{'path': 'N/A', 'error': '削除機能が無効'}], set()
     def open_file_external(fp: str, p: Optional[QWidget] = None) -> None: print("警告: ファイルを開く機能が無効")
-    def save_results_to_file(fp: str, res: ResultsData, sdir: str, sets: Optional[SettingsDict] = None) -> bool: print("警告: 結果保存機能が無効"); return False
     def load_results_from_file(fp: str) -> LoadResult: print("警告: 結果読込機能が無効"); return None, None, None, "結果読込機能が無効です"
     def load_scan_state(dir_path: str) -> LoadStateResult: print("警告: 状態読み込み機能が無効"); return None, "状態読み込み機能が無効です"
     def delete_scan_state(dir_path: str) -> bool: print("警告: 状態削除機能が無効"); return False
@@ -63,6 +85,8 @@ class ImageCleanerWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.threadpool: QThreadPool = QThreadPool()
         self.current_settings: SettingsDict = load_settings()
+        # 操作のたびに参照する値は属性として保持し、保存時に current_settings へ書き戻す
+        self.settings: AppSettings = AppSettings.from_dict(self.current_settings)
         self.setAcceptDrops(True)  # ドラッグアンドドロップを有効化
         self.filter_settings = self.current_settings.get('filters', {})
         # UI要素の型ヒント
@@ -86,21 +110,41 @@ class ImageCleanerWindow(QMainWindow):
         self.progress_count_label: QLabel  # 処理ファイル数表示用のラベル
         # --- その他のインスタンス変数 ---
         self.current_worker: Optional[ScanWorker] = None
+        self.save_worker: Optional[SaveResultsWorker] = None
         self.results_saved: bool = True
         self.light_theme_action: Optional[QAction] = None
         self.dark_theme_action: Optional[QAction] = None
         self._cancellation_requested: bool = False # 中止要求フラグを追加
+        self._close_after_scan_stops: bool = False # 終了確認でスキャンを中止した場合、停止後にウィンドウを閉じる
+        self._close_after_save: bool = False # 保存中に終了要求があった場合、保存完了後にウィンドウを閉じる
+        self._enabled_before_save: List[Tuple[Any, bool]] = [] # 保存中に無効化したコントロールと元の有効状態
+        self._active_theme: Optional[str] = None # 現在適用中のテーマ名
+        self._stylesheet_cache: Dict[str, str] = {} # テーマ名 -> QSS文字列
+        # 矢印キーの押しっぱなしなどで選択が連続して変わったときは、最後の選択だけプレビューする
+        self._preview_update_timer: QTimer = QTimer(self)
+        self._preview_update_timer.setSingleShot(True)
+        self._preview_update_timer.setInterval(PREVIEW_UPDATE_DELAY_MS)
+        self._preview_update_timer.timeout.connect(self.update_preview_display)
+        # キーボードショートカット (キー -> 処理)。処理を行わなかった場合は False を返す
+        self._key_dispatch: Dict[int, Callable[[], bool]] = {
+            int(Qt.Key.Key_Q): self._on_key_delete_left,
+            int(Qt.Key.Key_W): self._on_key_delete_right,
+            int(Qt.Key.Key_A): self._on_key_open_left,
+            int(Qt.Key.Key_S): self._on_key_open_right,
+            int(Qt.Key.Key_Escape): self._on_key_cancel_scan,
+        }
 
         self._setup_ui()
         self._setup_menu()
         self._connect_signals()
-        initial_theme = self.current_settings.get('theme', 'light')
+        self.results_tabs_widget.set_thumbnails_enabled(bool(self.current_settings.get('show_thumbnails', False)))
+        initial_theme = self.settings.theme
         self._apply_theme(initial_theme)
         if initial_theme == 'dark' and self.dark_theme_action:
             self.dark_theme_action.setChecked(True)
         elif self.light_theme_action:
             self.light_theme_action.setChecked(True)
-        initial_dir = self.current_settings.get('last_directory', '')
+        initial_dir = self.settings.last_directory
         if initial_dir and os.path.isdir(initial_dir):
             self.dir_path_edit.setText(initial_dir)
             self._set_scan_controls_enabled(True)
@@ -367,10 +411,19 @@ class ImageCleanerWindow(QMainWindow):
 
     def _apply_theme(self, theme_name: str):
         """指定されたテーマ名のスタイルシートを適用する"""
-        qss_filename = f"{theme_name}.qss"
-        stylesheet = self._load_stylesheet(qss_filename)
+        if theme_name == self._active_theme:
+            return
+        stylesheet = self._stylesheet_cache.get(theme_name)
+        if stylesheet is None:
+            stylesheet = self._load_stylesheet(f"{theme_name}.qss")
+            self._stylesheet_cache[theme_name] = stylesheet
         app_instance = QApplication.instance()
         if app_instance:
+            self._active_theme = theme_name
+            # setStyleSheet はウィジェットツリー全体を再ポリッシュするため、
+            # 起動時に main.py で適用済みの場合など、内容が同じなら呼ばない
+            if app_instance.styleSheet() == stylesheet:
+                return
             if stylesheet:
                 app_instance.setStyleSheet(stylesheet)
                 print(f"テーマ '{theme_name}' を適用しました。")
@@ -381,9 +434,9 @@ class ImageCleanerWindow(QMainWindow):
     @Slot(str)
     def _switch_theme(self, theme_name: str):
         """テーマ切り替えメニューから呼び出されるスロット"""
-        if theme_name != self.current_settings.get('theme'):
+        if theme_name != self.settings.theme:
             self._apply_theme(theme_name)
-            self.current_settings['theme'] = theme_name
+            self.settings.theme = theme_name
             print(f"設定を '{theme_name}' テーマに更新しました。")
 
     def _connect_signals(self) -> None:
@@ -399,7 +452,7 @@ class ImageCleanerWindow(QMainWindow):
         self.deselect_all_button.clicked.connect(self.results_tabs_widget.deselect_all)
 
         # 結果タブとプレビューの連携
-        self.results_tabs_widget.selection_changed.connect(self.update_preview_display)
+        self.results_tabs_widget.selection_changed.connect(self._schedule_preview_update)
         self.preview_widget.left_preview_clicked.connect(self._delete_single_file_from_preview)
         self.preview_widget.right_preview_clicked.connect(self._delete_single_file_from_preview)
 
@@ -458,8 +511,10 @@ class ImageCleanerWindow(QMainWindow):
     
     def select_directory(self) -> None:
         """「フォルダを選択...」ボタンがクリックされたときの処理"""
-        last_dir: str = str(self.current_settings.get('last_directory', os.path.expanduser("~")))
-        dir_path: str = QFileDialog.getExistingDirectory(self, "フォルダを選択", last_dir)
+        if self._reject_while_saving("フォルダを変更"):
+            return
+        options = QFileDialog.Option.ShowDirsOnly | QFileDialog.Option.DontResolveSymlinks | self._fast_dialog_options()
+        dir_path: str = QFileDialog.getExistingDirectory(self, "フォルダを選択", self.settings.last_directory, options)
 
         if dir_path:
             state_filepath = get_state_filepath(dir_path)
@@ -488,7 +543,7 @@ class ImageCleanerWindow(QMainWindow):
                     return
 
             self.dir_path_edit.setText(dir_path)
-            self.current_settings['last_directory'] = dir_path
+            self.settings.last_directory = dir_path
             self._clear_all_results()
             self._update_ui_state(scan_enabled=True, actions_enabled=False, cancel_enabled=False)
 
@@ -501,13 +556,16 @@ class ImageCleanerWindow(QMainWindow):
     @Slot()
     def open_settings(self) -> None:
         """「設定...」ボタンがクリックされたときの処理"""
+        SettingsDialog = _get_settings_dialog_class()
         if SettingsDialog is None:
             QMessageBox.warning(self, "エラー", "設定ダイアログを開けませんでした。")
             return
 
-        dialog = SettingsDialog(self.current_settings, self)
+        dialog = SettingsDialog(self.settings.apply_to(self.current_settings), self)
         if dialog.exec():
             self.current_settings = dialog.get_settings()
+            self.settings = AppSettings.from_dict(self.current_settings)
+            self.results_tabs_widget.set_thumbnails_enabled(bool(self.current_settings.get('show_thumbnails', False)))
             print("設定が更新されました:", self.current_settings)
         else:
             print("設定はキャンセルされました。")
@@ -515,6 +573,8 @@ class ImageCleanerWindow(QMainWindow):
     @Slot()
     def start_scan(self, initial_state: Optional[ScanStateData] = None) -> None:
         """「スキャン開始」ボタンがクリックされたときの処理、または再開処理"""
+        if self._reject_while_saving("スキャンを開始"):
+            return
         selected_dir: str = self.dir_path_edit.text()
         if not self._validate_directory(selected_dir):
             return
@@ -540,6 +600,8 @@ class ImageCleanerWindow(QMainWindow):
         self.current_worker.signals.progress_update.connect(self.update_progress_bar)
         if hasattr(self.current_worker.signals, 'processing_file'):
             self.current_worker.signals.processing_file.connect(self.update_current_file)
+        self.current_worker.signals.file_info_ready.connect(self.results_tabs_widget.set_file_infos)
+        self.current_worker.signals.blur_results_ready.connect(self.show_blurry_results_during_scan)
         self.current_worker.signals.results_ready.connect(self.populate_results_and_update_state)
         self.current_worker.signals.error.connect(self.handle_scan_error)
         self.current_worker.signals.finished.connect(self.handle_scan_finished)
@@ -598,15 +660,32 @@ class ImageCleanerWindow(QMainWindow):
         else:
             self.current_file_label.setText(" ")
 
+    @Slot(list)
+    def show_blurry_results_during_scan(self, blurry: List[BlurResultItem]) -> None:
+        """ブレ検出が終わった時点でブレ画像タブだけ先に表示する (類似ペア検出は続行中)"""
+        print(f"ブレ検出結果を先行表示: Blurry={len(blurry)}")
+        blocker = QSignalBlocker(self.results_tabs_widget)
+        try:
+            self.results_tabs_widget.populate_blurry_results(blurry)
+        finally:
+            blocker.unblock()
+        self.update_preview_display()
+
     @Slot(list, list, dict, list)
     def populate_results_and_update_state(self, blurry: List[BlurResultItem], similar: List[SimilarPair], duplicates: DuplicateDict, errors: List[ErrorDict]) -> None:
         """ScanWorkerからの結果準備完了シグナルを受け取るスロット"""
         print("結果受信: Blurry={}, Similar={}, Duplicates={}, Errors={}".format(len(blurry), len(similar), len(duplicates), len(errors)))
-        self.results_tabs_widget.populate_results(blurry, similar, duplicates, errors)
-        
-        # 保存されていたフィルター設定を適用
-        if hasattr(self.results_tabs_widget, 'set_filter_settings') and self.filter_settings:
-            self.results_tabs_widget.set_filter_settings(self.filter_settings)
+        # 一括投入中の行選択変化ごとにプレビューが更新されないよう、シグナルを止めて最後に一度だけ更新する
+        blocker = QSignalBlocker(self.results_tabs_widget)
+        try:
+            self.results_tabs_widget.populate_results(blurry, similar, duplicates, errors)
+
+            # 保存されていたフィルター設定を適用
+            if hasattr(self.results_tabs_widget, 'set_filter_settings') and self.filter_settings:
+                self.results_tabs_widget.set_filter_settings(self.filter_settings)
+        finally:
+            blocker.unblock()
+        self.update_preview_display()
         
         has_results: bool = (self.results_tabs_widget.blurry_table.rowCount() > 0 or
                              self.results_tabs_widget.similar_table.rowCount() > 0 or
@@ -627,6 +706,7 @@ class ImageCleanerWindow(QMainWindow):
         self.current_file_label.setText(" ")
         self.current_worker = None
         self._cancellation_requested = False # エラー時はフラグをリセット
+        self._close_if_requested()
 
     @Slot()
     def handle_scan_finished(self) -> None:
@@ -647,6 +727,7 @@ class ImageCleanerWindow(QMainWindow):
             delete_scan_state(self.dir_path_edit.text())
         self.current_worker = None
         self._cancellation_requested = False # 完了時はフラグをリセット
+        self._close_if_requested()
 
     @Slot()
     def handle_scan_cancelled(self) -> None:
@@ -658,11 +739,24 @@ class ImageCleanerWindow(QMainWindow):
         self.current_file_label.setText(" ")
         self.current_worker = None
         self._cancellation_requested = False # 中止時はフラグをリセット
+        self._close_if_requested()
+
+    def _close_if_requested(self) -> None:
+        """終了確認でスキャンを中止していた場合、ワーカー停止後にウィンドウを閉じる"""
+        if self._close_after_scan_stops:
+            self._close_after_scan_stops = False
+            self.close()
+
+    @Slot()
+    def _schedule_preview_update(self) -> None:
+        """選択変更時のプレビュー更新を少し遅らせ、連続した変更を1回にまとめる (タイマー作動中なら延長される)"""
+        self._preview_update_timer.start()
 
     # ★★★ プレビュー表示更新ロジックを修正 ★★★
     @Slot()
     def update_preview_display(self) -> None:
         """結果タブの選択が変更されたときにプレビューを更新するスロット"""
+        self._preview_update_timer.stop() # 直接呼ばれた場合は、予約済みの更新は不要
         primary_path, secondary_path = self.results_tabs_widget.get_current_selection_paths()
         current_tab_index = self.results_tabs_widget.currentIndex()
 
@@ -683,6 +777,8 @@ class ImageCleanerWindow(QMainWindow):
     @Slot()
     def delete_selected_items(self) -> None:
         """「選択した項目をゴミ箱へ移動」ボタンがクリックされたときの処理"""
+        if self._reject_while_saving("ファイルを削除"):
+            return
         files_to_delete: List[str] = self._get_files_to_delete_from_current_tab()
         if not files_to_delete:
             return
@@ -717,17 +813,15 @@ class ImageCleanerWindow(QMainWindow):
     def _delete_single_file_from_preview(self, file_path: str) -> None:
         """プレビュー画像がクリックされたときに呼び出されるスロット (削除と再選択処理)"""
         print(f"プレビュークリック削除要求受信: {file_path}")
-        if not file_path:
+        if not file_path or self._reject_while_saving("ファイルを削除"):
             return
 
         # 削除前に現在のテーブルと行インデックスを取得
-        current_tab_index = self.results_tabs_widget.currentIndex()
-        current_table: Optional[QTableWidget] = self.results_tabs_widget.widget(current_tab_index)
-        if not isinstance(current_table, QTableWidget):
+        if self.results_tabs_widget.current_table() is None:
             print("警告: アクティブなテーブルが見つかりません。")
             return
 
-        original_row_index = self._find_row_index_by_path(current_table, file_path)
+        original_row_index = self.results_tabs_widget.find_row_by_path(file_path)
         # if original_row_index == -1:
         #     print(f"警告: 削除対象のファイルパス {file_path} が現在のテーブルに見つかりません。")
             # 見つからなくても削除確認は行う
@@ -748,8 +842,8 @@ class ImageCleanerWindow(QMainWindow):
 
             if deletion_successful:
                 # 再度アクティブなテーブルを取得
-                current_table_after_delete: Optional[QTableWidget] = self.results_tabs_widget.widget(self.results_tabs_widget.currentIndex())
-                if isinstance(current_table_after_delete, QTableWidget):
+                current_table_after_delete = self.results_tabs_widget.current_table()
+                if current_table_after_delete is not None:
                     new_row_count = current_table_after_delete.rowCount()
                     if new_row_count > 0:
                         # 削除された行のインデックス、または最後の行を選択
@@ -757,17 +851,8 @@ class ImageCleanerWindow(QMainWindow):
                         next_row_index = max(0, next_row_index)
 
                         print(f"削除後、行 {next_row_index} を選択します。")
-                        current_table_after_delete.clearSelection()
-                        # ブレ画像タブの場合はチェックボックスを操作できないので selectRow
-                        if current_tab_index == 0:
-                             current_table_after_delete.selectRow(next_row_index)
-                        else: # 類似・重複ペアタブは行選択
-                             current_table_after_delete.selectRow(next_row_index)
-
-                        # 選択した行が表示されるようにスクロール
-                        item_to_scroll = current_table_after_delete.item(next_row_index, 0)
-                        if item_to_scroll:
-                            current_table_after_delete.scrollToItem(item_to_scroll, QAbstractItemView.ScrollHint.EnsureVisible)
+                        # 行を選択し、表示されるようにスクロール
+                        current_table_after_delete.select_row_and_scroll(next_row_index)
                         # プレビューを更新 (選択状態が変わったシグナルが飛ぶはずだが念のため)
                         self.update_preview_display()
                     else:
@@ -792,15 +877,13 @@ class ImageCleanerWindow(QMainWindow):
     @Slot(str)
     def _handle_delete_request(self, file_path: str) -> None:
         """結果タブのコンテキストメニューからの削除要求を処理するスロット"""
-        if not file_path:
+        if not file_path or self._reject_while_saving("ファイルを削除"):
             return
 
         # 削除前に現在のテーブルと行インデックスを取得
-        current_tab_index = self.results_tabs_widget.currentIndex()
-        current_table: Optional[QTableWidget] = self.results_tabs_widget.widget(current_tab_index)
-        if not isinstance(current_table, QTableWidget): return
+        if self.results_tabs_widget.current_table() is None: return
 
-        original_row_index = self._find_row_index_by_path(current_table, file_path)
+        original_row_index = self.results_tabs_widget.find_row_by_path(file_path)
 
         # 削除処理（確認はdelete_files_to_trash内）
         errors_occurred = self._delete_files_and_update_ui([file_path])
@@ -808,18 +891,14 @@ class ImageCleanerWindow(QMainWindow):
         # 削除成功後に再選択処理
         deletion_successful = not errors_occurred and not self.results_saved
         if deletion_successful:
-             current_table_after_delete: Optional[QTableWidget] = self.results_tabs_widget.widget(self.results_tabs_widget.currentIndex())
-             if isinstance(current_table_after_delete, QTableWidget):
+             current_table_after_delete = self.results_tabs_widget.current_table()
+             if current_table_after_delete is not None:
                  new_row_count = current_table_after_delete.rowCount()
                  if new_row_count > 0:
                      next_row_index = min(original_row_index if original_row_index != -1 else new_row_count -1, new_row_count - 1)
                      next_row_index = max(0, next_row_index)
                      print(f"コンテキストメニュー削除後、行 {next_row_index} を選択します。")
-                     current_table_after_delete.clearSelection()
-                     current_table_after_delete.selectRow(next_row_index)
-                     item_to_scroll = current_table_after_delete.item(next_row_index, 0)
-                     if item_to_scroll:
-                         current_table_after_delete.scrollToItem(item_to_scroll, QAbstractItemView.ScrollHint.EnsureVisible)
+                     current_table_after_delete.select_row_and_scroll(next_row_index)
                      self.update_preview_display()
                  else:
                      self.preview_widget.clear_previews()
@@ -848,6 +927,8 @@ class ImageCleanerWindow(QMainWindow):
     @Slot()
     def rename_images_to_sequential(self) -> None:
         """画像ファイルを連番にリネームする機能"""
+        if self._reject_while_saving("リネーム"):
+            return
         current_dir: str = self.dir_path_edit.text()
         if not self._validate_directory(current_dir, "画像リネーム"):
             return
@@ -884,6 +965,8 @@ class ImageCleanerWindow(QMainWindow):
     @Slot()
     def save_results(self) -> None:
         """「結果を保存...」ボタンがクリックされたときの処理"""
+        if self._reject_while_saving("新しい保存を開始"):
+            return
         current_dir: str = self.dir_path_edit.text()
         if not self._validate_directory(current_dir, "結果の保存"):
             return
@@ -895,50 +978,64 @@ class ImageCleanerWindow(QMainWindow):
         # 保存開始時にUI状態を更新
         self.status_label.setText(f"ステータス: 結果を '{os.path.basename(filepath)}' に保存準備中...")
         self._set_progress_bar_visible(True)
-        self.progress_bar.setValue(10)  # 初期進捗表示
-        QApplication.processEvents()  # UIを更新
+        self.progress_bar.setValue(0)
 
-        self.current_settings['last_save_load_dir'] = os.path.dirname(filepath)
+        self.settings.last_save_load_dir = os.path.dirname(filepath)
 
-        # 進捗表示を更新
-        self.status_label.setText(f"ステータス: 結果データを収集中...")
-        self.progress_bar.setValue(30)
-        QApplication.processEvents()
-
-        results_data: ResultsData = self.results_tabs_widget.get_results_data()
-        
         # フィルター設定も保存
         if hasattr(self.results_tabs_widget, 'get_filter_settings'):
             current_filters = self.results_tabs_widget.get_filter_settings()
             if current_filters:
                 self.current_settings['filters'] = current_filters
 
-        # 進捗表示を更新
+        # 結果は一つの辞書にまとめず、ワーカースレッドで逐次ファイルへ書き出す
+        total, results_iter = self.results_tabs_widget.get_results_iter()
         self.status_label.setText(f"ステータス: 結果をファイルに書き込み中...")
-        self.progress_bar.setValue(70)
-        QApplication.processEvents()
-
-        success: bool = save_results_to_file(filepath, results_data, current_dir, self.current_settings)
-
-        # 進捗表示を完了に設定
+        self.save_worker = SaveResultsWorker(filepath, results_iter, total, current_dir, self.settings.apply_to(self.current_settings))
+        self.save_worker.signals.progress.connect(self._update_save_progress)
+        self.save_worker.signals.finished.connect(self._handle_save_finished)
+        # 書き込み中に結果が変わらないよう、結果を変更する操作を保存完了まで無効にする
+        self._set_save_in_progress(True)
+        self.threadpool.start(self.save_worker)
+
+    @Slot(int, int)
+    def _update_save_progress(self, written: int, total: int) -> None:
+        """結果保存の進捗をプログレスバーに反映する"""
+        if total > 0:
+            self.progress_bar.setValue(min(100, int(written / total * 100)))
+
+    @Slot(bool, str)
+    def _handle_save_finished(self, success: bool, filepath: str) -> None:
+        """結果保存ワーカー完了時の処理"""
+        self.save_worker = None
         self.progress_bar.setValue(100)
-        QApplication.processEvents()
+        self._set_save_in_progress(False)
+        close_requested: bool = self._close_after_save
+        self._close_after_save = False
 
         # 結果に応じたメッセージを表示
         if success:
+            # 保存中は結果を変更する操作を受け付けないため、保存した内容は現在の結果と一致する
+            self.results_saved = True
             self.status_label.setText(f"ステータス: 結果をファイルに保存しました: {os.path.basename(filepath)}")
+            if close_requested:
+                # 保存完了を待っていた終了要求を再開する
+                self._set_progress_bar_visible(False)
+                self.close()
+                return
             QMessageBox.information(self, "保存完了", f"結果をファイルに保存しました:\n{filepath}")
-            self.results_saved = True
         else:
             self.status_label.setText(f"ステータス: 保存中にエラーが発生しました")
             QMessageBox.critical(self, "保存エラー", "結果のファイルへの保存中にエラーが発生しました。")
-        
+
         # 処理完了後、プログレスバーを非表示に
         self._set_progress_bar_visible(False)
 
     @Slot()
     def load_results(self) -> None:
         """「結果を読み込み...」ボタンがクリックされたときの処理"""
+        if self._reject_while_saving("結果を読み込み"):
+            return
         if not self.results_saved:
              if not self._confirm_unsaved_results("結果を読み込み"):
                  return
@@ -953,7 +1050,7 @@ class ImageCleanerWindow(QMainWindow):
         self.progress_bar.setValue(10)  # 初期進捗表示
         QApplication.processEvents()  # UIを更新
 
-        self.current_settings['last_save_load_dir'] = os.path.dirname(filepath)
+        self.settings.last_save_load_dir = os.path.dirname(filepath)
 
         # 進捗表示を更新
         self.status_label.setText(f"ステータス: ファイルからデータを読み込み中...")
@@ -986,7 +1083,7 @@ class ImageCleanerWindow(QMainWindow):
 
         if scanned_directory and scanned_directory != current_target_dir:
             self.dir_path_edit.setText(scanned_directory)
-            self.current_settings['last_directory'] = scanned_directory
+            self.settings.last_directory = scanned_directory
 
         # 進捗表示を更新
         self.status_label.setText(f"ステータス: 結果をクリアして新しいデータを準備中...")
@@ -1000,24 +1097,29 @@ class ImageCleanerWindow(QMainWindow):
         self.progress_bar.setValue(80)
         QApplication.processEvents()
         
-        if results_data:
-            # populate_results 内で存在しないファイルはフィルタリングされる
-            self.results_tabs_widget.populate_results(
-                results_data.get('blurry', []),
-                results_data.get('similar', []),
-                results_data.get('duplicates', {}),
-                results_data.get('errors', [])
-            )
+        blocker = QSignalBlocker(self.results_tabs_widget)
+        try:
+            if results_data:
+                # populate_results 内で存在しないファイルはフィルタリングされる
+                self.results_tabs_widget.populate_results(
+                    results_data.get('blurry', []),
+                    results_data.get('similar', []),
+                    results_data.get('duplicates', {}),
+                    results_data.get('errors', [])
+                )
 
-        if settings_used:
-            print("読み込んだ結果のスキャン時設定:", settings_used)
-            
-            # 保存されていたフィルター設定を適用
-            loaded_filters = settings_used.get('filters', {})
-            if loaded_filters and hasattr(self.results_tabs_widget, 'set_filter_settings'):
-                self.results_tabs_widget.set_filter_settings(loaded_filters)
-                # 設定を更新
-                self.filter_settings = loaded_filters
+            if settings_used:
+                print("読み込んだ結果のスキャン時設定:", settings_used)
+
+                # 保存されていたフィルター設定を適用
+                loaded_filters = settings_used.get('filters', {})
+                if loaded_filters and hasattr(self.results_tabs_widget, 'set_filter_settings'):
+                    self.results_tabs_widget.set_filter_settings(loaded_filters)
+                    # 設定を更新
+                    self.filter_settings = loaded_filters
+        finally:
+            blocker.unblock()
+        self.update_preview_display()
 
         # 進捗表示を完了に設定
         self.progress_bar.setValue(100)
@@ -1036,41 +1138,6 @@ class ImageCleanerWindow(QMainWindow):
         self.results_saved = True
 
     # --- ヘルパーメソッド ---
-    def _find_row_index_by_path(self, table: QTableWidget, file_path: str) -> int:
-        """指定されたテーブル内で、特定のファイルパスを持つ行のインデックスを返す"""
-        normalized_path_to_find = os.path.normpath(file_path)
-        current_tab_index = self.results_tabs_widget.indexOf(table)
-
-        for row in range(table.rowCount()):
-            item_data: Any = None
-            if current_tab_index == 0: # ブレ画像タブ
-                item = table.item(row, 0)
-                item_data = item.data(Qt.ItemDataRole.UserRole) if item else None
-                if isinstance(item_data, str) and os.path.normpath(item_data) == normalized_path_to_find:
-                    return row
-            elif current_tab_index == 1: # 類似ペアタブ
-                # 類似ペアタブでは、ファイル1のパスは4列目、ファイル2のパスは9列目
-                item1_path_item = table.item(row, 4)
-                item2_path_item = table.item(row, 9)
-                path1: Optional[str] = item1_path_item.text() if item1_path_item else None
-                path2: Optional[str] = item2_path_item.text() if item2_path_item else None
-
-                if (path1 and os.path.normpath(path1) == normalized_path_to_find) or \
-                   (path2 and os.path.normpath(path2) == normalized_path_to_find):
-                    return row
-            elif current_tab_index == 2: # 重複ペアタブ
-                 # 重複ペアタブでは、ファイル1のパスは4列目、ファイル2のパスは9列目
-                item1_path_item = table.item(row, 4)
-                item2_path_item = table.item(row, 9)
-                path1: Optional[str] = item1_path_item.text() if item1_path_item else None
-                path2: Optional[str] = item2_path_item.text() if item2_path_item else None
-
-                if (path1 and os.path.normpath(path1) == normalized_path_to_find) or \
-                   (path2 and os.path.normpath(path2) == normalized_path_to_find):
-                    return row
-        return -1
-
-
     def _clear_all_results(self) -> None:
         """結果表示エリアとプレビューをクリアする"""
         self.results_tabs_widget.clear_results()
@@ -1097,21 +1164,30 @@ class ImageCleanerWindow(QMainWindow):
             return reply == QMessageBox.StandardButton.Yes
         return True
 
+    def _fast_dialog_options(self) -> QFileDialog.Option:
+        """
+        設定で軽量ダイアログが選ばれている場合のファイルダイアログオプションを返す。
+        ネイティブダイアログはネットワークドライブ等でアイコン解決に時間がかかることがある。
+        """
+        if self.settings.fast_folder_picker:
+            return QFileDialog.Option.DontUseNativeDialog | QFileDialog.Option.DontUseCustomDirectoryIcons
+        return QFileDialog.Option(0)
+
     def _get_save_filepath(self, current_dir: str) -> Optional[str]:
         """結果保存用のファイルパスをユーザーに選択させる"""
         timestamp: str = datetime.now().strftime('%Y%m%d_%H%M%S')
         default_filename: str = f"image_cleaner_results_{timestamp}.json"
-        save_dir: str = str(self.current_settings.get('last_save_load_dir', current_dir))
         filepath, _ = QFileDialog.getSaveFileName(
-            self, "結果を保存", os.path.join(save_dir, default_filename), "JSON Files (*.json)"
+            self, "結果を保存", os.path.join(self.settings.last_save_load_dir, default_filename), "JSON Files (*.json)",
+            options=self._fast_dialog_options()
         )
         return filepath if filepath else None
 
     def _get_load_filepath(self) -> Optional[str]:
         """結果読み込み用のファイルパスをユーザーに選択させる"""
-        load_dir: str = str(self.current_settings.get('last_save_load_dir', os.path.expanduser("~")))
         filepath, _ = QFileDialog.getOpenFileName(
-            self, "結果を読み込み", load_dir, "JSON Files (*.json)"
+            self, "結果を読み込み", self.settings.last_save_load_dir, "JSON Files (*.json)",
+            options=self._fast_dialog_options()
         )
         return filepath if filepath else None
 
@@ -1136,66 +1212,16 @@ class ImageCleanerWindow(QMainWindow):
         if current_tab_index == 0: # ブレ画像タブ
             files_to_delete = self.results_tabs_widget.get_selected_blurry_paths()
             msg = "削除対象のブレ画像がチェックされていません。"
-        elif current_tab_index == 1: # 類似ペアタブ
+        elif current_tab_index == 1: # 類似/重複ペアタブ
             # チェックボックスで選択されたファイルを取得
-            for row in range(self.results_tabs_widget.similar_table.rowCount()):
-                # チェックボックス1（ファイル1）のチェック状態を確認 - インデックス0
-                chk1_item = self.results_tabs_widget.similar_table.item(row, 0)
-                if chk1_item and chk1_item.checkState() == Qt.CheckState.Checked:
-                    path1: Optional[str] = chk1_item.data(Qt.ItemDataRole.UserRole)
-                    if path1:
-                        files_to_delete.append(path1)
-
-                # チェックボックス2（ファイル2）のチェック状態を確認 - インデックス5
-                chk2_item = self.results_tabs_widget.similar_table.item(row, 5)
-                if chk2_item and chk2_item.checkState() == Qt.CheckState.Checked:
-                    path2: Optional[str] = chk2_item.data(Qt.ItemDataRole.UserRole)
-                    if path2:
-                        files_to_delete.append(path2)
+            files_to_delete = self.results_tabs_widget.get_checked_similar_paths()
 
             # 行選択されている場合はファイル2を追加（後方互換性のため）
-            # この部分はチェックボックス選択が主になったため、必要に応じて調整または削除
             if not files_to_delete: # チェックボックスで何も選択されていない場合のみ
-                 selected_rows: Set[int] = set(item.row() for item in self.results_tabs_widget.similar_table.selectedItems())
-                 for row in selected_rows:
-                     # ファイル2のパスは9列目
-                     path2_item = self.results_tabs_widget.similar_table.item(row, 9)
-                     path2: Optional[str] = path2_item.text() if path2_item else None
-                     if path2:
-                         files_to_delete.append(path2)
-
+                files_to_delete = self.results_tabs_widget.get_selected_similar_secondary_paths()
 
             msg = "削除対象の類似ペアが選択されていません。"
-        elif current_tab_index == 2: # 重複ペアタブ
-             # チェックボックスで選択されたファイルを取得
-            for row in range(self.results_tabs_widget.duplicate_table.rowCount()):
-                # チェックボックス1（ファイル1）のチェック状態を確認 - インデックス0
-                chk1_item = self.results_tabs_widget.duplicate_table.item(row, 0)
-                if chk1_item and chk1_item.checkState() == Qt.CheckState.Checked:
-                    path1: Optional[str] = chk1_item.data(Qt.ItemDataRole.UserRole)
-                    if path1:
-                        files_to_delete.append(path1)
-
-                # チェックボックス2（ファイル2）のチェック状態を確認 - インデックス5
-                chk2_item = self.results_tabs_widget.duplicate_table.item(row, 5)
-                if chk2_item and chk2_item.checkState() == Qt.CheckState.Checked:
-                    path2: Optional[str] = chk2_item.data(Qt.ItemDataRole.UserRole)
-                    if path2:
-                        files_to_delete.append(path2)
-
-            # 行選択されている場合はファイル2を追加（後方互換性のため）
-            # この部分はチェックボックス選択が主になったため、必要に応じて調整または削除
-            if not files_to_delete: # チェックボックスで何も選択されていない場合のみ
-                selected_rows: Set[int] = set(item.row() for item in self.results_tabs_widget.duplicate_table.selectedItems())
-                for row in selected_rows:
-                     # ファイル2のパスは9列目
-                    path2_item = self.results_tabs_widget.duplicate_table.item(row, 9)
-                    path2: Optional[str] = path2_item.text() if path2_item else None
-                    if path2:
-                        files_to_delete.append(path2)
-
-            msg = "削除対象の重複ペアが選択されていません。"
-        elif current_tab_index == 3: # エラータブ
+        elif self.results_tabs_widget.widget(current_tab_index) is self.results_tabs_widget.error_table: # エラータブ
             QMessageBox.information(self, "情報", "エラータブからは直接削除できません。")
             return []
         else:
@@ -1217,7 +1243,12 @@ class ImageCleanerWindow(QMainWindow):
         deleted_count, errors, files_actually_deleted = delete_files_to_trash(files_to_delete, self)
         if files_actually_deleted:
             print(f"UI Update: Removing {len(files_actually_deleted)} items from tables.")
-            self.results_tabs_widget.remove_items_by_paths(files_actually_deleted)
+            blocker = QSignalBlocker(self.results_tabs_widget)
+            try:
+                self.results_tabs_widget.remove_items_by_paths(files_actually_deleted)
+            finally:
+                blocker.unblock()
+            self.update_preview_display()
             self.results_saved = False
             
             # 削除されたファイルに関連するキャッシュデータを更新
@@ -1282,6 +1313,28 @@ class ImageCleanerWindow(QMainWindow):
             # 結果読込は常に有効
             self.load_results_action.setEnabled(True)
 
+    def _reject_while_saving(self, action_name: str) -> bool:
+        """結果の保存中であれば操作を拒否してステータスに表示する。拒否した場合は True を返す"""
+        if self.save_worker is None:
+            return False
+        self.status_label.setText(f"ステータス: 結果の保存中は{action_name}できません。")
+        return True
+
+    def _set_save_in_progress(self, saving: bool) -> None:
+        """結果保存中は結果を変更する操作を無効にし、保存完了後に元の有効状態へ戻す"""
+        if saving:
+            controls: List[Any] = [self.select_dir_button, self.scan_button, self.delete_button]
+            for name in ('save_results_action', 'load_results_action', 'rename_images_action'):
+                if hasattr(self, name):
+                    controls.append(getattr(self, name))
+            self._enabled_before_save = [(control, control.isEnabled()) for control in controls]
+            for control, _ in self._enabled_before_save:
+                control.setEnabled(False)
+        else:
+            for control, was_enabled in self._enabled_before_save:
+                control.setEnabled(was_enabled)
+            self._enabled_before_save = []
+
     def _set_progress_bar_visible(self, visible: bool) -> None:
         """プログレスバーとカウント表示の表示/非表示を設定"""
         self.progress_bar.setVisible(visible)
@@ -1333,6 +1386,9 @@ class ImageCleanerWindow(QMainWindow):
     
     def dropEvent(self, event: QDropEvent) -> None:
         """アイテムがドロップされた時のイベント"""
+        if self._reject_while_saving("フォルダを変更"):
+            event.ignore()
+            return
         mime_data: QMimeData = event.mimeData()
         
         if mime_data.hasUrls():
@@ -1367,7 +1423,7 @@ class ImageCleanerWindow(QMainWindow):
                             return
 
                     self.dir_path_edit.setText(dir_path)
-                    self.current_settings['last_directory'] = dir_path
+                    self.settings.last_directory = dir_path
                     self._clear_all_results()
                     self._update_ui_state(scan_enabled=True, actions_enabled=False, cancel_enabled=False)
 
@@ -1385,15 +1441,27 @@ class ImageCleanerWindow(QMainWindow):
     
     def closeEvent(self, event: QCloseEvent) -> None:
         """ウィンドウが閉じられるときのイベント"""
-        if self.current_worker and not self._cancellation_requested: # 中止要求フラグも確認
+        if self.save_worker is not None:
+            # 書き込み途中で終了しないよう、保存の完了を待ってから閉じる
+            self._close_after_save = True
+            self.status_label.setText("ステータス: 結果の保存中です。保存完了後に終了します...")
+            event.ignore()
+            return
+        if self.current_worker and self._cancellation_requested:
+            # 中止処理中は、ワーカーの停止を待ってから閉じる
+            self._close_after_scan_stops = True
+            event.ignore()
+            return
+        if self.current_worker: # 中止要求はまだ出ていない
              reply = QMessageBox.question(
                  self, "確認", "スキャン処理が実行中です。\nアプリケーションを終了すると、現在のスキャンは中断されます。\n\n終了しますか？",
                  QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No
              )
              if reply == QMessageBox.StandardButton.Yes:
                  print("終了前にスキャンを中止します...")
+                 self._close_after_scan_stops = True
                  self.request_scan_cancellation()
-                 # 中止完了を待つためにイベント処理を保留
+                 # 中止完了を待つためにイベント処理を保留 (停止後に自動で閉じる)
                  event.ignore()
                  return
              else:
@@ -1410,48 +1478,59 @@ class ImageCleanerWindow(QMainWindow):
             if current_filters:
                 self.current_settings['filters'] = current_filters
 
-        if not save_settings(self.current_settings):
+        if not save_settings(self.settings.apply_to(self.current_settings)):
             print("警告: 設定ファイルの保存に失敗しました。")
         else:
             print("アプリケーション終了時に設定を保存しました。")
 
+        # 再利用のため起動したままのブレ検出用プロセスを終了する
+        shutdown_blur_process_pool()
         event.accept()
 
     def keyPressEvent(self, event: QKeyEvent) -> None:
         """キーボードショートカットの処理"""
-        key: int = event.key()
+        handler: Optional[Callable[[], bool]] = self._key_dispatch.get(event.key())
+        if handler is None or not handler():
+            super().keyPressEvent(event)
+
+    def _can_delete_right_preview(self) -> bool:
+        """右プレビューの削除が許可されるタブ (類似・重複ペア) を表示中か"""
+        return self.results_tabs_widget.currentIndex() in (1, 2)
+
+    def _on_key_delete_left(self) -> bool:
         left_path: Optional[str] = self.preview_widget.get_left_image_path()
+        if not left_path: return False
+        print("Qキー: 左プレビュー削除要求")
+        self._delete_single_file_from_preview(left_path)
+        return True
+
+    def _on_key_delete_right(self) -> bool:
+        if not self._can_delete_right_preview(): return False
         right_path: Optional[str] = self.preview_widget.get_right_image_path()
+        if not right_path: return False
+        print("Wキー: 右プレビュー削除要求")
+        self._delete_single_file_from_preview(right_path)
+        return True
 
-        # 現在表示中のタブに応じて削除対象を決定
-        current_tab_index = self.results_tabs_widget.currentIndex()
-        can_delete_left = False
-        can_delete_right = False
-
-        if current_tab_index == 0 and left_path: # ブレ画像タブ
-            can_delete_left = True
-        elif current_tab_index in [1, 2]: # 類似・重複ペアタブ
-            if left_path: can_delete_left = True
-            if right_path: can_delete_right = True
-
-
-        if key == Qt.Key.Key_Q and can_delete_left:
-            print("Qキー: 左プレビュー削除要求")
-            self._delete_single_file_from_preview(left_path)
-        elif key == Qt.Key.Key_W and can_delete_right:
-            print("Wキー: 右プレビュー削除要求")
-            self._delete_single_file_from_preview(right_path)
-        elif key == Qt.Key.Key_A and left_path:
-            print("Aキー: 左プレビューを開く要求")
-            self._handle_open_request(left_path)
-        elif key == Qt.Key.Key_S and right_path:
-            print("Sキー: 右プレビューを開く要求")
-            self._handle_open_request(right_path)
-        elif key == Qt.Key.Key_Escape and self.cancel_button.isVisible() and self.cancel_button.isEnabled():
-            print("Escキー: スキャン中止要求")
-            self.request_scan_cancellation()
-        else:
-            super().keyPressEvent(event)
+    def _on_key_open_left(self) -> bool:
+        left_path: Optional[str] = self.preview_widget.get_left_image_path()
+        if not left_path: return False
+        print("Aキー: 左プレビューを開く要求")
+        self._handle_open_request(left_path)
+        return True
+
+    def _on_key_open_right(self) -> bool:
+        right_path: Optional[str] = self.preview_widget.get_right_image_path()
+        if not right_path: return False
+        print("Sキー: 右プレビューを開く要求")
+        self._handle_open_request(right_path)
+        return True
+
+    def _on_key_cancel_scan(self) -> bool:
+        if not (self.cancel_button.isVisible() and self.cancel_button.isEnabled()): return False
+        print("Escキー: スキャン中止要求")
+        self.request_scan_cancellation()
+        return True
 
 # アプリケーション実行部分
 if __name__ == '__main__':
@@ -0,0 +1,77 @@
+# gui/widgets/file_info_provider.py
+from PySide6.QtCore import QObject, QThreadPool, QTimer, Signal, Slot
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+# ファイル情報取得ワーカーをインポート
+try:
+    from ..workers import FileInfoWorker
+except ImportError:
+    try: from gui.workers import FileInfoWorker
+    except ImportError:
+        print("警告: FileInfoWorker のインポートに失敗しました。ファイル情報は表示時に取得されます。")
+        FileInfoWorker = None
+
+FileInfoResult = Tuple[str, str, str, str] # (size, mod_time, dimensions, exif_date)
+FileInfoFunc = Callable[[str], FileInfoResult]
+
+FILE_INFO_PLACEHOLDER: FileInfoResult = ("…", "…", "…", "…") # 取得中に表示する文字列
+FILE_INFO_BATCH_SIZE: int = 50 # 1つのワーカーでまとめて取得するファイル数
+FILE_INFO_MAX_THREADS: int = 2 # ネットワークドライブなどで I/O が詰まらないよう少なめにする
+
+class FileInfoProvider(QObject):
+    """
+    結果一覧に表示するファイル情報を提供するクラス。
+    スキャンワーカーから受け取った情報はそのまま返し、無いパス (結果ファイルの読込時など) は
+    info_for() で仮の文字列を返しつつ専用のスレッドプールで取得して file_infos_ready シグナルを送る。
+    表示された行の分だけ、GUI スレッドでファイルを開かずに取得される。
+    """
+    file_infos_ready = Signal(list) # 取得が完了した画像パス
+
+    def __init__(self, fallback_func: FileInfoFunc, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._fallback_func: FileInfoFunc = fallback_func # ワーカーが使えない場合に GUI スレッドで使う取得関数
+        self._infos: Dict[str, FileInfoResult] = {}
+        self._pending: Set[str] = set() # 取得待ち・取得中のパス
+        self._queue: List[str] = [] # まだワーカーに渡していないパス
+        self._generation: int = 0 # clear() 以前に依頼した結果を捨てるための世代番号
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(FILE_INFO_MAX_THREADS)
+
+    def set_infos(self, file_infos: Dict[str, FileInfoResult]) -> None:
+        """取得済みのファイル情報をまとめて登録する (スキャンワーカーからの受け取り時)"""
+        self._infos.update(file_infos)
+
+    def info_for(self, path: str) -> FileInfoResult:
+        """取得済みのファイル情報を返す。未取得なら取得を依頼して仮の文字列を返す"""
+        info: Optional[FileInfoResult] = self._infos.get(path)
+        if info is not None: return info
+        if FileInfoWorker is None:
+            info = self._fallback_func(path); self._infos[path] = info
+            return info
+        if path not in self._pending:
+            self._pending.add(path); self._queue.append(path)
+            # 同じイベント処理中に表示された行の依頼をまとめてからワーカーに渡す
+            if len(self._queue) == 1: QTimer.singleShot(0, self._start_workers)
+        return FILE_INFO_PLACEHOLDER
+
+    def clear(self) -> None:
+        """未開始の取得を取り消し、ファイル情報を破棄する (結果の入れ替え時など)"""
+        self._generation += 1
+        self._thread_pool.clear()
+        self._pending.clear(); self._queue.clear()
+        self._infos = {}
+
+    @Slot()
+    def _start_workers(self) -> None:
+        queue: List[str] = self._queue; self._queue = []
+        for start in range(0, len(queue), FILE_INFO_BATCH_SIZE):
+            worker = FileInfoWorker(self._generation, queue[start:start + FILE_INFO_BATCH_SIZE])
+            worker.signals.finished.connect(self._on_file_infos_loaded)
+            self._thread_pool.start(worker)
+
+    @Slot(int, dict)
+    def _on_file_infos_loaded(self, generation: int, file_infos: Dict[str, FileInfoResult]) -> None:
+        if generation != self._generation: return # clear() 前の依頼の結果
+        self._infos.update(file_infos)
+        self._pending.difference_update(file_infos)
+        self.file_infos_ready.emit(list(file_infos))
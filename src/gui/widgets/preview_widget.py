@@ -1,17 +1,39 @@
 # gui/widgets/preview_widget.py
 import os
 import cv2
+from collections import OrderedDict
 import numpy as np
 from PySide6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QLabel, QFrame, QGraphicsView,
                                QGraphicsScene, QGraphicsPixmapItem, QSizePolicy,
                                QGraphicsSceneMouseEvent, QRubberBand, QCheckBox)
-from PySide6.QtCore import Qt, Signal, Slot, QRectF, QPointF, QPoint
+from PySide6.QtCore import Qt, Signal, Slot, QPointF, QPoint, QTimer, QThreadPool
 from PySide6.QtGui import QImage, QPixmap, QMouseEvent, QWheelEvent, QPainter, QTransform
-from typing import Optional, Tuple, Any
+from typing import Optional, Tuple, Any, Dict
 
 NumpyImageType = np.ndarray[Any, Any]
 ErrorMsgType = Optional[str]
 LoadResult = Tuple[Optional[NumpyImageType], ErrorMsgType, Optional[Tuple[int, int]]]
+PixmapCacheKey = Tuple[str, float, int] # (path, mtime, size)
+PixmapCacheEntry = Tuple[QPixmap, Tuple[int, int]] # (pixmap, (width, height))
+PreviewRequest = Tuple["ZoomPanGraphicsView", str, bool] # (表示先, 画像パス, フル解像度か)
+
+# 表示済みプレビューのキャッシュ上限 (件数と、ピクセルデータの概算合計バイト数)
+PREVIEW_CACHE_MAX_ENTRIES: int = 16
+PREVIEW_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+# JPEG は表示サイズに合わせて縮小デコードする (拡大表示したときにフル解像度で読み直す)
+PREVIEW_MIN_DECODE_SIZE: int = 1024 # 縮小デコード時の長辺の下限 (ビューが小さい場合でも粗くなりすぎないように)
+# 画像の切り替え・ズーム・パン中は補間なしで描画し、操作が止まってこの時間が経ってから滑らかに描き直す
+SMOOTH_RENDER_DELAY_MS: int = 100
+PREVIEW_MAX_THREADS: int = 2
+
+# プレビュー読み込みワーカーをインポート
+try:
+    from ..workers import PreviewWorker
+except ImportError:
+    try: from gui.workers import PreviewWorker
+    except ImportError:
+        print("警告: PreviewWorker のインポートに失敗しました。プレビューは表示されません。")
+        PreviewWorker = None
 
 try:
     from ..utils.image_loader import load_image_as_numpy, get_image_dimensions
@@ -24,16 +46,23 @@ except ImportError:
 
 class ZoomPanGraphicsView(QGraphicsView):
     clicked = Signal() # 左クリック時に発行されるシグナル
+    full_resolution_requested = Signal() # 縮小デコードした画像を等倍以上に拡大したときに発行されるシグナル
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self._scene = QGraphicsScene(self)
         self.setScene(self._scene)
         self.pixmap_item: Optional[QGraphicsPixmapItem] = None
+        self._is_reduced: bool = False # 表示中の画像が縮小デコードされたものか
+        self.pending_request_id: int = -1 # 読み込み待ちのプレビュー依頼 (PreviewWidget が管理)
         self._is_panning: bool = False
         self._last_pan_point: QPoint = QPoint()
         self.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+        self._smooth_render_timer = QTimer(self)
+        self._smooth_render_timer.setSingleShot(True)
+        self._smooth_render_timer.setInterval(SMOOTH_RENDER_DELAY_MS)
+        self._smooth_render_timer.timeout.connect(self._enable_smooth_rendering)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorViewCenter)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -46,24 +75,57 @@ class ZoomPanGraphicsView(QGraphicsView):
         self.initial_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.initial_label.lower()
 
-    def set_image(self, pixmap: Optional[QPixmap]) -> None:
-        self._scene.clear(); self.pixmap_item = None
+    def set_image(self, pixmap: Optional[QPixmap], source_size: Optional[Tuple[int, int]] = None) -> None:
+        """画像を表示する。source_size に元画像のサイズを渡すと、縮小された pixmap を元のサイズに引き伸ばして配置する"""
+        self._scene.clear(); self.pixmap_item = None; self._is_reduced = False
         if pixmap and not pixmap.isNull():
+            self._render_fast_until_idle()
             self.pixmap_item = self._scene.addPixmap(pixmap)
-            self.setSceneRect(QRectF(pixmap.rect()))
+            if source_size and source_size[0] > pixmap.width():
+                # シーン座標を元画像のピクセルに揃えておき、フル解像度への差し替え時に表示位置がずれないようにする
+                self.pixmap_item.setScale(source_size[0] / pixmap.width())
+                self._is_reduced = True
+            self.setSceneRect(self.pixmap_item.sceneBoundingRect())
             self.fitInView(self.sceneRect(), Qt.AspectRatioMode.KeepAspectRatio)
             self.initial_label.setVisible(False)
         else:
+            self._enable_smooth_rendering()
             self.resetTransform(); self.setSceneRect(self.rect().adjusted(0,0,-2,-2))
             self.initial_label.setVisible(True); self.initial_label.setGeometry(self.rect().adjusted(2,2,-2,-2))
 
+    def replace_pixmap(self, pixmap: QPixmap) -> None:
+        """表示倍率と位置を保ったまま、表示中の画像をフル解像度の pixmap に差し替える"""
+        if self.pixmap_item is None or pixmap.isNull(): return
+        self._render_fast_until_idle()
+        self.pixmap_item.setPixmap(pixmap)
+        self.pixmap_item.setScale(self.sceneRect().width() / pixmap.width())
+        self._is_reduced = False
+
+    def _render_fast_until_idle(self) -> None:
+        """しばらく補間なし (FastTransformation 相当) で描画し、操作が止まったら滑らかな描画に戻す"""
+        if self.renderHints() & QPainter.RenderHint.SmoothPixmapTransform:
+            self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+        self._smooth_render_timer.start() # 操作が続く間は再スタートして先送りする
+
+    @Slot()
+    def _enable_smooth_rendering(self) -> None:
+        self._smooth_render_timer.stop()
+        if not (self.renderHints() & QPainter.RenderHint.SmoothPixmapTransform):
+            self.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, True)
+            self.viewport().update()
+
     def clear_image(self) -> None: self.set_image(None)
     def wheelEvent(self, event: QWheelEvent) -> None:
         if self.pixmap_item is None: super().wheelEvent(event); return
         zoom_in_factor = 1.15; zoom_out_factor = 1 / zoom_in_factor
+        self._render_fast_until_idle()
         if event.angleDelta().y() > 0: self.scale(zoom_in_factor, zoom_in_factor)
         else: self.scale(zoom_out_factor, zoom_out_factor)
         event.accept()
+        # 縮小画像の1ピクセルが画面の1ピクセルより大きく表示されたら、フル解像度の画像を要求する
+        if self._is_reduced and self.transform().m11() * self.pixmap_item.scale() > 1.0:
+            self._is_reduced = False
+            self.full_resolution_requested.emit()
 
     def mousePressEvent(self, event: QMouseEvent) -> None:
         if self.pixmap_item is None: super().mousePressEvent(event); return
@@ -85,6 +147,7 @@ class ZoomPanGraphicsView(QGraphicsView):
         # パン中の移動処理 (変更なし、_is_panning フラグで制御)
         if self._is_panning:
             delta: QPoint = event.pos() - self._last_pan_point
+            self._render_fast_until_idle()
             hs = self.horizontalScrollBar(); vs = self.verticalScrollBar()
             hs.setValue(hs.value() - delta.x()); vs.setValue(vs.value() - delta.y())
             self._last_pan_point = event.pos(); event.accept()
@@ -117,6 +180,14 @@ class PreviewWidget(QWidget):
         self.left_preview_view: ZoomPanGraphicsView
         self.right_preview_view: ZoomPanGraphicsView
         self.diff_checkbox: QCheckBox
+        # 同じ画像を再選択したときにデコードし直さないよう、変換済みの QPixmap を保持する (LRU)
+        self._pixmap_cache: "OrderedDict[PixmapCacheKey, PixmapCacheEntry]" = OrderedDict()
+        self._pixmap_cache_bytes: int = 0
+        # プレビュー画像のデコードは専用のスレッドプールで行う (スキャン用のプールとは分ける)
+        self._preview_thread_pool = QThreadPool(self)
+        self._preview_thread_pool.setMaxThreadCount(PREVIEW_MAX_THREADS)
+        self._next_preview_request_id: int = 0
+        self._preview_requests: Dict[int, PreviewRequest] = {}
         # self.right_title_label: QLabel # 右側のタイトルラベルを削除
         self._setup_ui()
 
@@ -147,12 +218,14 @@ class PreviewWidget(QWidget):
         self.left_preview_view.initial_label.setText("画像を選択すると\nここに表示されます")
         self.left_preview_view.setToolTip("左クリック → 削除\nAキー → 開く\nホイール → ズーム\n右ドラッグ → 移動")
         self.left_preview_view.clicked.connect(self._on_left_preview_clicked)
+        self.left_preview_view.full_resolution_requested.connect(self._on_left_full_resolution_requested)
 
         # 右プレビュー
         self.right_preview_view = ZoomPanGraphicsView(self)
         self.right_preview_view.initial_label.setText("類似/重複ペア選択で\nここに表示されます")
         self.right_preview_view.setToolTip("左クリック → 削除\nSキー → 開く\nホイール → ズーム\n右ドラッグ → 移動")
         self.right_preview_view.clicked.connect(self._on_right_preview_clicked)
+        self.right_preview_view.full_resolution_requested.connect(self._on_right_full_resolution_requested)
 
         # ボーダーと背景色を追加
         for view in [self.left_preview_view, self.right_preview_view]:
@@ -189,6 +262,47 @@ class PreviewWidget(QWidget):
             except Exception as e: return None, f"サイズ取得エラー: {e}", None
         return img_np, error_msg, None
 
+    def _preview_decode_size(self, target_view: ZoomPanGraphicsView) -> int:
+        """縮小デコード時の長辺の目安 (ビューの大きさ、ただし PREVIEW_MIN_DECODE_SIZE 以上)"""
+        viewport = target_view.viewport()
+        return max(PREVIEW_MIN_DECODE_SIZE, round(max(viewport.width(), viewport.height()) * target_view.devicePixelRatioF()))
+
+    def _request_preview(self, target_view: ZoomPanGraphicsView, image_path: str, full_resolution: bool) -> None:
+        """プレビュー画像の読み込みをワーカースレッドに依頼する (完了時に _on_preview_loaded が呼ばれる)"""
+        if PreviewWorker is None: return
+        self._next_preview_request_id += 1
+        request_id: int = self._next_preview_request_id
+        target_view.pending_request_id = request_id # 古い依頼の結果は無視される
+        self._preview_requests[request_id] = (target_view, image_path, full_resolution)
+        worker = PreviewWorker(request_id, image_path, 0 if full_resolution else self._preview_decode_size(target_view))
+        worker.signals.finished.connect(self._on_preview_loaded)
+        self._preview_thread_pool.start(worker)
+
+    @Slot(int, QImage, int, int, str)
+    def _on_preview_loaded(self, request_id: int, image: QImage, width: int, height: int, error_msg: str) -> None:
+        request: Optional[PreviewRequest] = self._preview_requests.pop(request_id, None)
+        if request is None: return
+        target_view, image_path, full_resolution = request
+        if target_view.pending_request_id != request_id: return # 読み込み中に別の画像が選択された
+        target_view.pending_request_id = -1
+        if image.isNull():
+            print(f"プレビュー画像読込エラー: {error_msg}")
+            if not full_resolution:
+                target_view.initial_label.setText(f"プレビュー\n(読込エラー)")
+                target_view.initial_label.setVisible(True)
+            return
+        pixmap: QPixmap = QPixmap.fromImage(image)
+        image_size: Tuple[int, int] = (width, height)
+        if full_resolution:
+            target_view.replace_pixmap(pixmap)
+        else:
+            target_view.set_image(pixmap, image_size)
+            if target_view == self.left_preview_view: self.left_image_size = image_size
+            elif target_view == self.right_preview_view: self.right_image_size = image_size
+            self._update_diff_checkbox_state()
+        cache_key: Optional[PixmapCacheKey] = self._pixmap_cache_key(image_path)
+        if cache_key: self._store_cached_pixmap(cache_key, pixmap, image_size)
+
     def _calculate_difference(self, img1_bgr: NumpyImageType, img2_bgr: NumpyImageType) -> Optional[NumpyImageType]:
         if img1_bgr.shape != img2_bgr.shape: print("差分計算スキップ..."); return None
         try: diff = cv2.absdiff(img1_bgr, img2_bgr); return diff
@@ -198,36 +312,58 @@ class PreviewWidget(QWidget):
     def _numpy_to_pixmap(self, img_np: NumpyImageType) -> Optional[QPixmap]:
         if img_np is None: return None
         try:
+            # QImage は img_np のバッファを参照するだけなので、QPixmap へ変換し終えるまで img_np を保持しておく
+            # (BGR888 を使うことで RGB への並べ替えと、QImage.copy() による複製を省く)
+            if not img_np.flags['C_CONTIGUOUS']: img_np = np.ascontiguousarray(img_np)
             qt_image: QImage
-            if len(img_np.shape) == 3: h, w, ch = img_np.shape; bytes_per_line = ch * w; qt_image = QImage(cv2.cvtColor(img_np, cv2.COLOR_BGR2RGB).data, w, h, bytes_per_line, QImage.Format.Format_RGB888).copy()
-            elif len(img_np.shape) == 2: h, w = img_np.shape; bytes_per_line = w; qt_image = QImage(img_np.data, w, h, bytes_per_line, QImage.Format.Format_Grayscale8).copy()
+            if len(img_np.shape) == 3 and img_np.shape[2] == 3: h, w = img_np.shape[:2]; qt_image = QImage(img_np.data, w, h, img_np.strides[0], QImage.Format.Format_BGR888)
+            elif len(img_np.shape) == 2: h, w = img_np.shape; qt_image = QImage(img_np.data, w, h, img_np.strides[0], QImage.Format.Format_Grayscale8)
             else: print("未対応のNumpy配列形式です。"); return None
             return QPixmap.fromImage(qt_image)
         except Exception as e: print(f"NumPyからPixmapへの変換エラー: {e}"); return None
 
+    def _pixmap_cache_key(self, image_path: str) -> Optional[PixmapCacheKey]:
+        """更新日時とサイズを含めたキャッシュキー (ファイルが変更されたら別のキーになる)"""
+        try: stat_info = os.stat(image_path)
+        except OSError: return None
+        return (image_path, stat_info.st_mtime, stat_info.st_size)
+
+    def _get_cached_pixmap(self, key: PixmapCacheKey) -> Optional[PixmapCacheEntry]:
+        entry: Optional[PixmapCacheEntry] = self._pixmap_cache.get(key)
+        if entry is not None: self._pixmap_cache.move_to_end(key)
+        return entry
+
+    def _store_cached_pixmap(self, key: PixmapCacheKey, pixmap: QPixmap, image_size: Tuple[int, int]) -> None:
+        """QPixmap をキャッシュに追加し、上限を超えた分を古いものから破棄する"""
+        pixmap_bytes: int = pixmap.width() * pixmap.height() * 4
+        if pixmap_bytes > PREVIEW_CACHE_MAX_BYTES: return
+        old_entry: Optional[PixmapCacheEntry] = self._pixmap_cache.pop(key, None)
+        if old_entry is not None: self._pixmap_cache_bytes -= old_entry[0].width() * old_entry[0].height() * 4
+        self._pixmap_cache[key] = (pixmap, image_size)
+        self._pixmap_cache_bytes += pixmap_bytes
+        while (len(self._pixmap_cache) > PREVIEW_CACHE_MAX_ENTRIES or
+               self._pixmap_cache_bytes > PREVIEW_CACHE_MAX_BYTES):
+            _, (evicted, _) = self._pixmap_cache.popitem(last=False)
+            self._pixmap_cache_bytes -= evicted.width() * evicted.height() * 4
+
     def _display_image(self, target_view: ZoomPanGraphicsView, image_path: Optional[str], label_name: str) -> None: # label_name is kept for initial_label logic if needed
         target_view.clear_image(); current_size: Optional[Tuple[int, int]] = None
+        target_view.pending_request_id = -1 # 読み込み中の画像があれば、その結果は使わない
         display_label_name = "" # Default to empty for the main title area (which is now gone)
                                 # We'll use this for the initial_label text if an error occurs.
 
-        if image_path and os.path.exists(image_path):
-            img_bgr, error_msg, img_size = self._load_image_and_get_size(image_path, mode='bgr')
-            if error_msg:
-                print(f"プレビュー画像読込エラー: {error_msg}")
-                # Use a generic message or the original initial_label text
-                target_view.initial_label.setText(f"プレビュー\n(読込エラー)")
-                target_view.initial_label.setVisible(True)
-            elif img_bgr is not None:
-                pixmap = self._numpy_to_pixmap(img_bgr)
-                if pixmap:
-                    target_view.set_image(pixmap)
-                    current_size = img_size
-                else:
-                    target_view.initial_label.setText(f"プレビュー\n(表示エラー)")
-                    target_view.initial_label.setVisible(True)
-            else:
-                target_view.initial_label.setText(f"プレビュー\n(データなし)")
-                target_view.initial_label.setVisible(True)
+        # キャッシュキーの取得時に os.stat するので、ファイルの存在確認はそれで兼ねる (None なら存在しない)
+        cache_key: Optional[PixmapCacheKey] = self._pixmap_cache_key(image_path) if image_path else None
+        cached_entry: Optional[PixmapCacheEntry] = self._get_cached_pixmap(cache_key) if cache_key else None
+
+        if cached_entry is not None:
+            target_view.set_image(cached_entry[0], cached_entry[1])
+            current_size = cached_entry[1]
+        elif image_path and cache_key is not None:
+            # デコードはワーカースレッドで行い、完了後に表示する
+            target_view.initial_label.setText(f"プレビュー\n(読込中...)")
+            target_view.initial_label.setVisible(True)
+            self._request_preview(target_view, image_path, full_resolution=False)
         elif image_path:
             target_view.initial_label.setText(f"プレビュー\n(ファイルなし)")
             target_view.initial_label.setVisible(True)
@@ -243,7 +379,18 @@ class PreviewWidget(QWidget):
         if target_view == self.left_preview_view: self.left_image_size = current_size
         elif target_view == self.right_preview_view: self.right_image_size = current_size
 
+    @Slot()
+    def _on_left_full_resolution_requested(self) -> None:
+        if self.left_image_path: self._request_preview(self.left_preview_view, self.left_image_path, full_resolution=True)
+
+    @Slot()
+    def _on_right_full_resolution_requested(self) -> None:
+        # 差分表示中は差分画像 (フル解像度) を表示しているので対象外
+        if not self.diff_checkbox.isChecked() and self.right_image_path:
+            self._request_preview(self.right_preview_view, self.right_image_path, full_resolution=True)
+
     def _display_difference(self) -> None:
+        self.right_preview_view.pending_request_id = -1 # 読み込み中の右プレビューで差分表示を上書きしない
         if not self.left_image_path or not self.right_image_path:
             print("差分表示エラー: パスがありません")
             self.right_preview_view.initial_label.setText("プレビュー\n(差分計算不可)")
@@ -282,8 +429,8 @@ class PreviewWidget(QWidget):
     def _update_diff_checkbox_state(self) -> None:
         """差分表示チェックボックスの有効/無効を更新"""
         right_preview_visible = self.right_preview_view.isVisible()
-        both_images_loaded = bool(self.left_image_path and os.path.exists(str(self.left_image_path)) and
-                                  self.right_image_path and os.path.exists(str(self.right_image_path)))
+        # サイズは画像を表示できたときだけ設定されるので、ファイルの存在確認は不要
+        both_images_loaded = bool(self.left_image_path and self.right_image_path)
         sizes_match = (self.left_image_size is not None and self.right_image_size is not None and
                        self.left_image_size == self.right_image_size)
 
@@ -330,6 +477,8 @@ class PreviewWidget(QWidget):
     def clear_previews(self) -> None:
         self.left_preview_view.clear_image()
         self.right_preview_view.clear_image()
+        self.left_preview_view.pending_request_id = -1
+        self.right_preview_view.pending_request_id = -1
         self.left_image_path = None
         self.right_image_path = None
         self.left_image_size = None
@@ -0,0 +1,353 @@
+# gui/widgets/result_models.py
+import os
+from PySide6.QtWidgets import QTableView, QAbstractItemView, QWidget
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Slot
+from PySide6.QtGui import QColor
+from typing import List, Dict, Tuple, Optional, Any, Union, Set, Callable, Iterable
+
+from .table_items import parse_file_size, parse_datetime, parse_exif_datetime, parse_resolution
+from .thumbnail_provider import ThumbnailProvider
+
+# 型エイリアス
+BlurResultItem = Dict[str, Union[str, float]]
+SimilarPair = List[Union[str, int]]
+FileInfoResult = Tuple[str, str, str, str] # (size, mod_time, dimensions, exif_date)
+FileInfoFunc = Callable[[str], FileInfoResult]
+SortKey = Union[float, str]
+
+# ソート用の値を返すロール (表示文字列ではなく数値で比較する)
+SORT_ROLE: int = Qt.ItemDataRole.UserRole + 1
+DUPLICATE_SCORE: int = 100 # 類似度100は重複ファイル
+DUPLICATE_HIGHLIGHT_COLOR = QColor(255, 240, 240) # 重複ペアの背景色 (薄い赤色)
+
+class CheckableResultsModel(QAbstractTableModel):
+    """
+    結果の一覧を保持するテーブルモデルの基底クラス。
+    行ごとに QTableWidgetItem を作らず、表示文字列・チェック状態を Python のリストで持つ。
+    表示文字列は行が最初に表示されたときに作る (数十万行でも結果の設定は一瞬で終わる)。
+    ソート用の値は列ごとに、最初にソートされたときに計算する。
+    ソートはモデル自身が行う (プロキシ経由だと比較のたびに data() が Python 側で呼ばれるため)。
+    """
+    HEADERS: List[str] = []
+    CHECK_COLUMNS: Tuple[int, ...] = () # チェックボックス列 (行内の各ファイルに1つずつ)
+    RIGHT_ALIGNED_COLUMNS: Tuple[int, ...] = ()
+    NAME_COLUMNS: Tuple[int, ...] = () # サムネイルを表示するファイル名列 (CHECK_COLUMNS の順)
+
+    def __init__(self, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self._items: List[Any] = [] # 元の結果データ (保存・フィルター用)
+        self._display: List[Optional[List[str]]] = [] # 行ごとの表示文字列 (列順)。未作成の行は None
+        self._file_info_func: Optional[FileInfoFunc] = None
+        self._paths: List[Tuple[str, ...]] = [] # 行ごとのファイルパス (CHECK_COLUMNS の順)
+        self._checked: List[List[bool]] = [] # 行ごとのチェック状態 (CHECK_COLUMNS の順)
+        self._sort_columns: Dict[int, List[SortKey]] = {}
+        self._row_index: Optional[Dict[str, List[int]]] = None # 正規化パス -> 行番号 (行が変わったら作り直す)
+        self._thumbnail_provider: Optional[ThumbnailProvider] = None
+
+    # --- サブクラスで実装する ---
+    def _item_paths(self, item: Any) -> Tuple[str, ...]:
+        """結果データ1件に含まれるファイルパス (CHECK_COLUMNS の順)"""
+        raise NotImplementedError
+
+    def _build_display(self, item: Any, file_info_func: FileInfoFunc) -> List[str]:
+        """結果データ1件から表示文字列のリスト (列順) を作る"""
+        raise NotImplementedError
+
+    def _column_sort_key(self, row: int, column: int) -> SortKey:
+        """ソート用の値 (既定は表示文字列)"""
+        return self._row_display(row)[column]
+
+    def _row_background(self, row: int) -> Optional[QColor]:
+        return None
+
+    # --- データの設定・取得 ---
+    def set_items(self, items: List[Any], file_info_func: FileInfoFunc) -> None:
+        """表示する結果データを置き換える (チェック状態はすべて解除される)"""
+        self.beginResetModel()
+        self._items = list(items)
+        self._file_info_func = file_info_func
+        self._paths = [self._item_paths(item) for item in self._items]
+        self._display = [None] * len(self._items)
+        self._checked = [[False] * len(self.CHECK_COLUMNS) for _ in self._items]
+        self._sort_columns = {}
+        self._row_index = None
+        self.endResetModel()
+
+    def set_thumbnail_provider(self, provider: Optional[ThumbnailProvider]) -> None:
+        """ファイル名列にサムネイルを表示するプロバイダを設定する (None で非表示)"""
+        if self._thumbnail_provider is provider: return
+        if self._thumbnail_provider is not None:
+            self._thumbnail_provider.thumbnail_ready.disconnect(self._on_thumbnail_ready)
+        self._thumbnail_provider = provider
+        if provider is not None:
+            provider.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._emit_thumbnails_changed()
+
+    def items(self) -> List[Any]:
+        return list(self._items)
+
+    def _row_display(self, row: int) -> List[str]:
+        display: Optional[List[str]] = self._display[row]
+        if display is None:
+            display = self._build_display(self._items[row], self._file_info_func)
+            self._display[row] = display
+        return display
+
+    def row_paths(self, row: int) -> Tuple[str, ...]:
+        return self._paths[row]
+
+    def checked_paths(self) -> List[str]:
+        """チェックされているファイルパスを行順に返す"""
+        return [paths[i] for paths, checked in zip(self._paths, self._checked)
+                for i in range(len(checked)) if checked[i]]
+
+    def set_column_checked(self, check_index: int, checked: bool) -> None:
+        """CHECK_COLUMNS[check_index] の列のチェック状態をまとめて変更する"""
+        if not self._items: return
+        for row_checked in self._checked: row_checked[check_index] = checked
+        column: int = self.CHECK_COLUMNS[check_index]
+        self.dataChanged.emit(self.index(0, column), self.index(len(self._items) - 1, column), [Qt.ItemDataRole.CheckStateRole])
+
+    def _path_rows(self) -> Dict[str, List[int]]:
+        """正規化パスから、そのファイルを含む行 (昇順) への索引を返す (必要になったときに作成する)"""
+        if self._row_index is None:
+            self._row_index = {}
+            for row, paths in enumerate(self._paths):
+                for path in paths:
+                    rows: List[int] = self._row_index.setdefault(os.path.normpath(path), [])
+                    if not rows or rows[-1] != row: rows.append(row)
+        return self._row_index
+
+    def find_row(self, file_path: str) -> int:
+        """指定されたファイルを含む行を返す (見つからなければ -1)"""
+        rows: Optional[List[int]] = self._path_rows().get(os.path.normpath(file_path))
+        return rows[0] if rows else -1
+
+    def refresh_paths(self, paths: Iterable[str]) -> None:
+        """指定したファイルを含む行の表示文字列を作り直す (ファイル情報の取得完了時など)"""
+        path_rows: Dict[str, List[int]] = self._path_rows()
+        rows: List[int] = sorted({row for path in paths for row in path_rows.get(os.path.normpath(path), ())})
+        if not rows: return
+        for row in rows: self._display[row] = None
+        self._sort_columns = {} # 仮の文字列から作ったソート用の値を破棄する
+        self.dataChanged.emit(self.index(rows[0], 0), self.index(rows[-1], len(self.HEADERS) - 1), [Qt.ItemDataRole.DisplayRole])
+
+    def remove_paths(self, deleted_paths: Set[str]) -> None:
+        """正規化済みパスの集合 deleted_paths のいずれかを含む行を削除する"""
+        path_rows: Dict[str, List[int]] = self._path_rows()
+        rows_to_remove: List[int] = sorted({row for path in deleted_paths for row in path_rows.get(path, ())})
+        if not rows_to_remove: return
+        # 後ろの行から、連続する範囲ごとにまとめて削除する
+        while rows_to_remove:
+            last: int = rows_to_remove.pop(); first: int = last
+            while rows_to_remove and rows_to_remove[-1] == first - 1: first = rows_to_remove.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for rows in (self._items, self._display, self._paths, self._checked): del rows[first:last + 1]
+            self.endRemoveRows()
+        self._sort_columns = {}
+        self._row_index = None
+
+    # --- QAbstractTableModel の実装 ---
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid(): return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() in self.CHECK_COLUMNS: flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid(): return None
+        row: int = index.row(); column: int = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return None if column in self.CHECK_COLUMNS else self._row_display(row)[column]
+        if role == SORT_ROLE:
+            return self._sort_key(row, column)
+        if column in self.CHECK_COLUMNS:
+            check_index: int = self.CHECK_COLUMNS.index(column)
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self._checked[row][check_index] else Qt.CheckState.Unchecked
+            if role == Qt.ItemDataRole.UserRole:
+                return self._paths[row][check_index]
+        if role == Qt.ItemDataRole.DecorationRole and column in self.NAME_COLUMNS and self._thumbnail_provider is not None:
+            # 表示される行だけ問い合わせられるので、ここで読み込みを依頼する
+            return self._thumbnail_provider.icon_for(self._paths[row][self.NAME_COLUMNS.index(column)])
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in self.RIGHT_ALIGNED_COLUMNS:
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return self._row_background(row)
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole or index.column() not in self.CHECK_COLUMNS:
+            return False
+        self._checked[index.row()][self.CHECK_COLUMNS.index(index.column())] = (Qt.CheckState(value) == Qt.CheckState.Checked)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    @Slot(str)
+    def _on_thumbnail_ready(self, path: str) -> None:
+        self._emit_thumbnails_changed()
+
+    def _emit_thumbnails_changed(self) -> None:
+        # 該当行を探すより、ファイル名列をまとめて通知する方が安い (再描画されるのは表示中の行のみ)
+        if not self._items: return
+        for column in self.NAME_COLUMNS:
+            self.dataChanged.emit(self.index(0, column), self.index(len(self._items) - 1, column), [Qt.ItemDataRole.DecorationRole])
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        """行を並べ替える。ソート用の値を列ごとにまとめて取得し、比較は Python の sort (C実装) に任せる"""
+        if not self._items or not 0 <= column < len(self.HEADERS): return
+        keys: List[SortKey] = self._sort_key_column(column)
+        new_order: List[int] = sorted(range(len(self._items)), key=keys.__getitem__,
+                                      reverse=(order == Qt.SortOrder.DescendingOrder))
+        self.layoutAboutToBeChanged.emit()
+        new_rows: List[int] = [0] * len(new_order) # 元の行番号 -> 並べ替え後の行番号
+        for new_row, old_row in enumerate(new_order): new_rows[old_row] = new_row
+        self._items = [self._items[i] for i in new_order]
+        self._display = [self._display[i] for i in new_order]
+        self._paths = [self._paths[i] for i in new_order]
+        self._checked = [self._checked[i] for i in new_order]
+        self._sort_columns = {col: [col_keys[i] for i in new_order] for col, col_keys in self._sort_columns.items()}
+        self._row_index = None
+        # 選択状態などの永続インデックスを並べ替え後の行に付け替える
+        old_indexes: List[QModelIndex] = self.persistentIndexList()
+        self.changePersistentIndexList(old_indexes, [self.index(new_rows[index.row()], index.column()) for index in old_indexes])
+        self.layoutChanged.emit()
+
+    def _sort_key_column(self, column: int) -> List[SortKey]:
+        if column in self.CHECK_COLUMNS: # チェック状態は変わるのでキャッシュしない
+            check_index: int = self.CHECK_COLUMNS.index(column)
+            return [1.0 if checked[check_index] else 0.0 for checked in self._checked]
+        keys: Optional[List[SortKey]] = self._sort_columns.get(column)
+        if keys is None:
+            keys = [self._column_sort_key(r, column) for r in range(len(self._items))]
+            self._sort_columns[column] = keys
+        return keys
+
+    def _sort_key(self, row: int, column: int) -> SortKey:
+        if column in self.CHECK_COLUMNS:
+            return 1.0 if self._checked[row][self.CHECK_COLUMNS.index(column)] else 0.0
+        return self._sort_key_column(column)[row]
+
+class BlurryResultsModel(CheckableResultsModel):
+    """ブレ画像の結果 ({'path', 'score'} の辞書リスト) を表示するモデル"""
+    HEADERS = ["", "ファイル名", "サイズ", "更新日時", "撮影日時", "解像度", "ブレ度スコア", "パス"]
+    CHECK_COLUMNS = (0,)
+    RIGHT_ALIGNED_COLUMNS = (6,)
+    NAME_COLUMNS = (1,)
+    COLUMN_SCORE: int = 6
+
+    def _item_paths(self, item: BlurResultItem) -> Tuple[str, ...]:
+        return (str(item['path']),)
+
+    def _build_display(self, item: BlurResultItem, file_info_func: FileInfoFunc) -> List[str]:
+        path: str = str(item['path'])
+        score: float = float(item.get('score', -1.0))
+        file_size, mod_time, dimensions, exif_date = file_info_func(path)
+        score_text: str = f"{score:.4f}" if score >= 0 else "N/A"
+        return ["", os.path.basename(path), file_size, mod_time, exif_date, dimensions, score_text, path]
+
+    def _column_sort_key(self, row: int, column: int) -> SortKey:
+        text: str = self._row_display(row)[column]
+        if column == 2: return float(parse_file_size(text))
+        if column == 3: return parse_datetime(text)
+        if column == 4: return parse_exif_datetime(text)
+        if column == 5: return float(parse_resolution(text))
+        if column == self.COLUMN_SCORE:
+            score: float = float(self._items[row].get('score', -1.0))
+            return score if score >= 0 else -float('inf')
+        return text
+
+class SimilarResultsModel(CheckableResultsModel):
+    """類似/重複ペアの結果 ([path1, path2, score] のリスト) を表示するモデル"""
+    HEADERS = [
+        "", "ファイル名", "解像度", "作成日時", "パス",
+        "", "ファイル名", "解像度", "作成日時", "パス",
+        "類似度"
+    ]
+    CHECK_COLUMNS = (0, 5)
+    RIGHT_ALIGNED_COLUMNS = (10,)
+    NAME_COLUMNS = (1, 6)
+    COLUMN_SCORE: int = 10
+
+    def _item_paths(self, item: SimilarPair) -> Tuple[str, ...]:
+        return (str(item[0]), str(item[1]))
+
+    def _build_display(self, item: SimilarPair, file_info_func: FileInfoFunc) -> List[str]:
+        score: int = int(item[2])
+        display: List[str] = []
+        for path in (str(item[0]), str(item[1])):
+            _, mod_time, dimensions, exif_date = file_info_func(path)
+            # 撮影日時優先、なければ更新日時
+            display.extend(["", os.path.basename(path), dimensions, exif_date if exif_date != "N/A" else mod_time, path])
+        # スコアが100の場合は特別な表示に（重複ファイル）
+        display.append("完全一致（重複)" if score == DUPLICATE_SCORE else str(score))
+        return display
+
+    def _column_sort_key(self, row: int, column: int) -> SortKey:
+        text: str = self._row_display(row)[column]
+        if column in (2, 7): return float(parse_resolution(text))
+        if column in (3, 8):
+            timestamp: float = parse_exif_datetime(text)
+            return timestamp if timestamp != -float('inf') else parse_datetime(text)
+        if column == self.COLUMN_SCORE:
+            score: int = int(self._items[row][2])
+            return float('inf') if score == DUPLICATE_SCORE else float(score)
+        return text
+
+    def pair_score(self, row: int) -> int:
+        return int(self._items[row][2])
+
+    def _row_background(self, row: int) -> Optional[QColor]:
+        # 重複ファイルの場合は背景色を変更して目立たせる
+        return DUPLICATE_HIGHLIGHT_COLOR if self.pair_score(row) == DUPLICATE_SCORE else None
+
+class ResultsTableView(QTableView):
+    """
+    結果モデルを表示するビュー。ヘッダーのクリックでモデル自身がソートするため、表示上の行とモデルの行は一致する。
+    """
+    def __init__(self, model: CheckableResultsModel, parent: Optional[QWidget] = None):
+        super().__init__(parent)
+        self.results_model: CheckableResultsModel = model
+        self.setModel(model)
+        self.verticalHeader().setVisible(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSortingEnabled(True)
+        # 結果を入れ替えたときも、現在のソート列・順序で並べ直す
+        model.modelReset.connect(self._reapply_sort)
+
+    @Slot()
+    def _reapply_sort(self) -> None:
+        header = self.horizontalHeader()
+        if self.isSortingEnabled() and header.sortIndicatorSection() >= 0:
+            self.results_model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+
+    def rowCount(self) -> int:
+        """表示中の行数 (QTableWidget.rowCount と同じ使い方ができるようにする)"""
+        return self.results_model.rowCount()
+
+    def selected_rows(self) -> List[int]:
+        """選択されている行 (モデルの行番号) を返す"""
+        return [index.row() for index in self.selectionModel().selectedRows()]
+
+    def first_selected_row(self) -> int:
+        """最初に選択された範囲の先頭行を返す (選択がなければ -1)。全行を列挙しないので、大量選択中でも軽い"""
+        selection = self.selectionModel().selection()
+        return selection[0].top() if not selection.isEmpty() else -1
+
+    def select_row_and_scroll(self, row: int) -> None:
+        """行を選択し、見える位置までスクロールする"""
+        self.clearSelection()
+        self.selectRow(row)
+        self.scrollTo(self.results_model.index(row, 0), QAbstractItemView.ScrollHint.EnsureVisible)
@@ -3,11 +3,10 @@ import os
 import re
 from PySide6.QtWidgets import (QWidget, QTabWidget, QTableWidget, QHeaderView,
                                QAbstractItemView, QTableWidgetItem, QMenu,
-                               QStyledItemDelegate, QStyleOptionViewItem, QCheckBox,
-                               QVBoxLayout, QHBoxLayout, QPushButton, QSplitter) # 追加のウィジェット
+                               QVBoxLayout, QSplitter)
 from PySide6.QtCore import Qt, Signal, Slot, QPoint, QModelIndex, QSize
-from PySide6.QtGui import QAction, QColor
-from typing import List, Dict, Tuple, Optional, Any, Union, Set, Callable
+from PySide6.QtGui import QAction
+from typing import List, Dict, Tuple, Optional, Any, Union, Set, FrozenSet, Callable, Iterator
 import datetime # get_file_info のフォールバック用
 
 # フィルターウィジェットをインポート
@@ -25,17 +24,14 @@ ErrorDict = Dict[str, str]
 ResultsData = Dict[str, Union[List[BlurResultItem], List[SimilarPair], DuplicateDict, List[ErrorDict]]]
 SelectionPaths = Tuple[Optional[str], Optional[str]]
 FileInfoResult = Tuple[str, str, str, str] # (size, mod_time, dimensions, exif_date)
+ResultsIterItem = Tuple[str, Any] # (セクション名, 項目) - 結果のストリーム保存用
 
-# カスタムテーブルアイテムをインポート
-try:
-    from .table_items import (NumericTableWidgetItem, FileSizeTableWidgetItem,
-                             DateTimeTableWidgetItem, ResolutionTableWidgetItem,
-                             ExifDateTimeTableWidgetItem)
-except ImportError:
-    print("エラー: table_items モジュールのインポートに失敗しました。")
-    NumericTableWidgetItem = QTableWidgetItem; FileSizeTableWidgetItem = QTableWidgetItem
-    DateTimeTableWidgetItem = QTableWidgetItem; ResolutionTableWidgetItem = QTableWidgetItem
-    ExifDateTimeTableWidgetItem = QTableWidgetItem # フォールバック
+# 結果モデルと、モデルを表示するテーブルビューをインポート
+from .result_models import BlurryResultsModel, SimilarResultsModel, ResultsTableView
+from .thumbnail_provider import ThumbnailProvider
+from .file_info_provider import FileInfoProvider
+
+THUMBNAIL_ICON_SIZE: int = 48 # 結果一覧に表示するサムネイルの大きさ (px)
 
 # ファイル情報取得関数をインポート
 try:
@@ -61,9 +57,11 @@ class ResultsTabsWidget(QTabWidget):
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self.blurry_table: QTableWidget
-        self.similar_table: QTableWidget
-        self.duplicate_table: QTableWidget
+        self.blurry_model: BlurryResultsModel
+        self.similar_model: SimilarResultsModel
+        self.blurry_table: ResultsTableView
+        self.similar_table: ResultsTableView
+        self.duplicate_table: ResultsTableView
         self.error_table: QTableWidget
         self.blurry_filter: Optional[BlurryFilterWidget] = None
         self.similarity_filter: Optional[SimilarityFilterWidget] = None
@@ -72,8 +70,16 @@ class ResultsTabsWidget(QTabWidget):
         self._full_blurry_data: List[BlurResultItem] = []
         self._full_similar_data: List[SimilarPair] = []
         self._full_duplicate_pairs: List[DuplicatePair] = []
+        # スキャンワーカーが取得済みのファイル情報 (無いパスは表示時にバックグラウンドで取得して追加する)
+        self._file_info_provider = FileInfoProvider(get_file_info, self)
+        # 削除の反映で使う正規化パス (削除のたびに同じパスを正規化し直さない)
+        self._normpaths: Dict[str, str] = {}
+        # サムネイル表示 (設定で有効な場合のみ作成する)
+        self._thumbnail_provider: Optional[ThumbnailProvider] = None
+        self._default_row_height: Optional[int] = None
         
         self._setup_tabs()
+        self._file_info_provider.file_infos_ready.connect(self._on_file_infos_ready)
 
     def _setup_tabs(self) -> None:
         """タブとテーブルを作成し、シグナルを接続する"""
@@ -137,8 +143,8 @@ class ResultsTabsWidget(QTabWidget):
         self.addTab(self.error_table, "エラー (0)")
 
         # シグナル接続
-        self.blurry_table.itemSelectionChanged.connect(self.selection_changed.emit)
-        self.similar_table.itemSelectionChanged.connect(self.selection_changed.emit)
+        self.blurry_table.selectionModel().selectionChanged.connect(lambda *_: self.selection_changed.emit())
+        self.similar_table.selectionModel().selectionChanged.connect(lambda *_: self.selection_changed.emit())
         self.error_table.itemSelectionChanged.connect(self.selection_changed.emit)
         self.currentChanged.connect(lambda index: self.selection_changed.emit())
 
@@ -146,10 +152,14 @@ class ResultsTabsWidget(QTabWidget):
         table = QTableWidget(); table.setColumnCount(column_count); table.setHorizontalHeaderLabels(headers); table.verticalHeader().setVisible(False); table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows); table.setSelectionMode(selection_mode); table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers); table.setSortingEnabled(sorting_enabled)
         return table
 
-    def _create_blurry_table(self) -> QTableWidget:
-        # (変更なし)
-        headers = ["", "ファイル名", "サイズ", "更新日時", "撮影日時", "解像度", "ブレ度スコア", "パス"]
-        table = self._create_table_widget(len(headers), headers, QAbstractItemView.SelectionMode.ExtendedSelection)
+    def _create_results_view(self, model: Any, selection_mode: QAbstractItemView.SelectionMode) -> ResultsTableView:
+        view = ResultsTableView(model); view.setSelectionMode(selection_mode)
+        return view
+
+    def _create_blurry_table(self) -> ResultsTableView:
+        """ブレ画像表示用のテーブルを作成 (行データは BlurryResultsModel が保持する)"""
+        self.blurry_model = BlurryResultsModel(self)
+        table = self._create_results_view(self.blurry_model, QAbstractItemView.SelectionMode.ExtendedSelection)
         table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
@@ -160,18 +170,10 @@ class ResultsTabsWidget(QTabWidget):
         table.horizontalHeader().setSectionResizeMode(7, QHeaderView.ResizeMode.Stretch)
         return table
 
-    # ★★★ 類似ペアテーブルのヘッダーとカラム数を変更 ★★★
-    def _create_similar_table(self) -> QTableWidget:
-        """類似ペア表示用のテーブルを作成"""
-        headers = [
-            "", "ファイル名", "解像度",
-            "作成日時", "パス",
-            "", "ファイル名", "解像度",
-            "作成日時", "パス",
-            "類似度"
-        ]
-        table = self._create_table_widget(len(headers), headers, QAbstractItemView.SelectionMode.ExtendedSelection)
-        # リサイズモード設定 (新しいカラム数に合わせて調整)
+    def _create_similar_table(self) -> ResultsTableView:
+        """類似/重複ペア表示用のテーブルを作成 (行データは SimilarResultsModel が保持する)"""
+        self.similar_model = SimilarResultsModel(self)
+        table = self._create_results_view(self.similar_model, QAbstractItemView.SelectionMode.ExtendedSelection)
         table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents) # File1 Checkbox
         table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)          # File1 Filename
         table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents) # File1 Resolution
@@ -185,28 +187,6 @@ class ResultsTabsWidget(QTabWidget):
         table.horizontalHeader().setSectionResizeMode(10, QHeaderView.ResizeMode.ResizeToContents) # Similarity
         return table
 
-    # ★★★ 重複ペアテーブルのヘッダーとカラム数を変更 ★★★
-    def _create_duplicate_table(self) -> QTableWidget:
-        """重複ペア表示用のテーブルを作成"""
-        headers = [
-            "", "ファイル名", "解像度",
-            "作成日時", "パス",
-            "チェック", "ファイル名", "解像度",
-            "作成日時", "パス"
-        ]
-        table = self._create_table_widget(len(headers), headers, QAbstractItemView.SelectionMode.ExtendedSelection)
-        # リサイズモード設定 (新しいカラム数に合わせて調整)
-        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents) # File1 Checkbox
-        table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)          # File1 Filename
-        table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents) # File1 Resolution
-        table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents) # File1 Creation Date
-        table.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.Stretch)          # File1 Path
-        table.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents) # File2 Checkbox
-        table.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)          # File2 Filename
-        table.horizontalHeader().setSectionResizeMode(7, QHeaderView.ResizeMode.ResizeToContents) # File2 Resolution
-        table.horizontalHeader().setSectionResizeMode(8, QHeaderView.ResizeMode.ResizeToContents) # File2 Creation Date
-        table.horizontalHeader().setSectionResizeMode(9, QHeaderView.ResizeMode.Stretch)          # File2 Path
-        return table
 
     def _create_error_table(self) -> QTableWidget:
         # (変更なし)
@@ -217,19 +197,51 @@ class ResultsTabsWidget(QTabWidget):
         table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         return table
 
+    def set_thumbnails_enabled(self, enabled: bool) -> None:
+        """ファイル名列のサムネイル表示を切り替える (サムネイルはバックグラウンドで読み込まれる)"""
+        if enabled and self._thumbnail_provider is None:
+            self._thumbnail_provider = ThumbnailProvider(self)
+        provider: Optional[ThumbnailProvider] = self._thumbnail_provider if enabled else None
+        for table in (self.blurry_table, self.similar_table):
+            if self._default_row_height is None:
+                self._default_row_height = table.verticalHeader().defaultSectionSize()
+            table.setIconSize(QSize(THUMBNAIL_ICON_SIZE, THUMBNAIL_ICON_SIZE))
+            table.verticalHeader().setDefaultSectionSize(max(self._default_row_height, THUMBNAIL_ICON_SIZE + 4) if enabled else self._default_row_height)
+            table.results_model.set_thumbnail_provider(provider)
+
     # --- データ投入メソッド ---
+    @Slot(dict)
+    def set_file_infos(self, file_infos: Dict[str, FileInfoResult]) -> None:
+        """スキャンワーカーが取得したファイル情報を受け取る (populate_results の前に呼ばれる)"""
+        self._file_info_provider.set_infos(file_infos)
+
+    def _get_file_info(self, path: str) -> FileInfoResult:
+        """ファイル情報を返す。ワーカーから受け取っていないパスは取得を依頼し、取得中は仮の文字列を返す"""
+        return self._file_info_provider.info_for(path)
+
+    @Slot(list)
+    def _on_file_infos_ready(self, paths: List[str]) -> None:
+        for model in (self.blurry_model, self.similar_model): model.refresh_paths(paths)
+
     @Slot(list, list, dict, list)
     def populate_results(self, blurry_results: List[BlurResultItem], similar_results: List[SimilarPair], duplicate_results: DuplicateDict, scan_errors: List[ErrorDict]) -> None:
         """結果データをフィルタリングし、テーブルに表示する"""
         # フィルタリング（存在するファイルのみ）
-        filtered_blurry = [item for item in blurry_results if os.path.exists(item['path'])]
-        filtered_similar = [item for item in similar_results if os.path.exists(str(item[0])) and os.path.exists(str(item[1]))]
+        # 同じファイルが多くのペアに現れるため、存在確認はパスごとに1回だけ行う
+        exists_cache: Dict[str, bool] = {}
+        def exists(path: str) -> bool:
+            result: Optional[bool] = exists_cache.get(path)
+            if result is None:
+                result = os.path.exists(path); exists_cache[path] = result
+            return result
+        filtered_blurry = [item for item in blurry_results if exists(str(item['path']))]
+        filtered_similar = [item for item in similar_results if exists(str(item[0])) and exists(str(item[1]))]
         
         # 重複ペアを類似ペアに変換（類似度100%として）
         duplicate_pairs = self._flatten_duplicates_to_pairs(duplicate_results)
         duplicate_as_similar = []
         for pair in duplicate_pairs:
-            if os.path.exists(pair['path1']) and os.path.exists(pair['path2']):
+            if exists(pair['path1']) and exists(pair['path2']):
                 # 重複ペアを類似ペアの形式に変換し、類似度を100%とする
                 duplicate_as_similar.append([pair['path1'], pair['path2'], 100])
         
@@ -245,6 +257,14 @@ class ResultsTabsWidget(QTabWidget):
         self._populate_table(self.error_table, scan_errors, self._create_error_row_items)
         self._update_tab_texts()
     
+    @Slot(list)
+    def populate_blurry_results(self, blurry_results: List[BlurResultItem]) -> None:
+        """スキャン途中のブレ検出結果だけを先に表示する (他のタブは最終結果の populate_results で更新される)"""
+        self._full_blurry_data = [item for item in blurry_results if os.path.exists(str(item['path']))]
+        if self.blurry_filter is not None: self._apply_blurry_filter()
+        else: self._set_table_items(self.blurry_table, self._full_blurry_data)
+        self._update_tab_texts()
+
     def _apply_all_filters(self) -> None:
         """全てのフィルターを適用する"""
         # ブレ画像フィルター適用
@@ -252,14 +272,14 @@ class ResultsTabsWidget(QTabWidget):
             self._apply_blurry_filter()
         else:
             # フィルターがない場合は全データを表示
-            self._populate_table(self.blurry_table, self._full_blurry_data, self._create_blurry_row_items)
+            self._set_table_items(self.blurry_table, self._full_blurry_data)
         
         # 類似度フィルター適用
         if self.similarity_filter is not None:
             self._apply_similarity_filter()
         else:
             # フィルターがない場合は全データを表示
-            self._populate_table(self.similar_table, self._full_similar_data, self._create_similar_row_items)
+            self._set_table_items(self.similar_table, self._full_similar_data)
     
     @Slot()
     def _apply_blurry_filter(self) -> None:
@@ -294,7 +314,7 @@ class ResultsTabsWidget(QTabWidget):
             filtered_data.append(item)
         
         # テーブル更新
-        self._populate_table(self.blurry_table, filtered_data, self._create_blurry_row_items)
+        self._set_table_items(self.blurry_table, filtered_data)
         self._update_tab_texts()
     
     @Slot()
@@ -334,102 +354,42 @@ class ResultsTabsWidget(QTabWidget):
             filtered_data.append(item)
         
         # テーブル更新
-        self._populate_table(self.similar_table, filtered_data, self._create_similar_row_items)
+        self._set_table_items(self.similar_table, filtered_data)
         self._update_tab_texts()
 
     def _populate_table(self, table: QTableWidget, data: List[Any], item_creator_func) -> None:
-        # (変更なし)
+        """
+        テーブルの内容を data で置き換える。
+        投入中は再描画・シグナル・列幅の自動調整を止め、行ごとのレイアウト計算が起きないようにする。
+        """
+        header: QHeaderView = table.horizontalHeader()
+        resize_modes: List[QHeaderView.ResizeMode] = [header.sectionResizeMode(col) for col in range(table.columnCount())]
         table.setSortingEnabled(False)
-        table.setRowCount(len(data))
-        for row, row_data in enumerate(data):
-            items: List[QTableWidgetItem] = item_creator_func(row_data)
-            for col, item in enumerate(items):
-                # チェックボックスアイテムは直接セット
-                if isinstance(item, QTableWidgetItem) and item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                     table.setItem(row, col, item)
-                else:
+        table.setUpdatesEnabled(False)
+        signals_were_blocked: bool = table.blockSignals(True)
+        try:
+            for col, mode in enumerate(resize_modes):
+                if mode == QHeaderView.ResizeMode.ResizeToContents:
+                    header.setSectionResizeMode(col, QHeaderView.ResizeMode.Interactive)
+            table.setRowCount(len(data))
+            for row, row_data in enumerate(data):
+                items: List[QTableWidgetItem] = item_creator_func(row_data)
+                for col, item in enumerate(items):
                     table.setItem(row, col, item)
-        table.setSortingEnabled(True)
-
-    def _create_blurry_row_items(self, data: BlurResultItem) -> List[QTableWidgetItem]:
-        # (変更なし)
-        path: str = data['path']
-        score: float = float(data.get('score', -1.0))
-        base_name = os.path.basename(path)
-        file_size, mod_time, dimensions, exif_date = get_file_info(path)
-        chk_item = QTableWidgetItem()
-        chk_item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-        chk_item.setCheckState(Qt.CheckState.Unchecked)
-        chk_item.setData(Qt.ItemDataRole.UserRole, path)
-        name_item = QTableWidgetItem(base_name)
-        size_item = FileSizeTableWidgetItem(file_size)
-        mod_date_item = DateTimeTableWidgetItem(mod_time)
-        exif_date_item = ExifDateTimeTableWidgetItem(exif_date)
-        dim_item = ResolutionTableWidgetItem(dimensions)
-        score_text = f"{score:.4f}" if score >= 0 else "N/A"
-        score_item = NumericTableWidgetItem(score_text)
-        score_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        path_item = QTableWidgetItem(path)
-        return [chk_item, name_item, size_item, mod_date_item, exif_date_item, dim_item, score_item, path_item]
-
-    # ★★★ 類似ペアの行アイテム生成ロジックを新しいカラムに合わせて修正 ★★★
-    def _create_similar_row_items(self, data: SimilarPair) -> List[QTableWidgetItem]:
-        """類似ペアデータからテーブル行アイテムを作成"""
-        path1: str = str(data[0])
-        path2: str = str(data[1])
-        score: int = int(data[2])
-        base_name1 = os.path.basename(path1)
-        base_name2 = os.path.basename(path2)
-
-        # ファイル1の情報取得
-        file_size1, mod_time1, dimensions1, exif_date1 = get_file_info(path1)
-        # ファイル2の情報取得
-        file_size2, mod_time2, dimensions2, exif_date2 = get_file_info(path2)
-
-        # ファイル1のアイテム
-        chk1_item = QTableWidgetItem()
-        chk1_item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-        chk1_item.setCheckState(Qt.CheckState.Unchecked)
-        chk1_item.setData(Qt.ItemDataRole.UserRole, path1) # UserRoleにパスを保存
-        name1_item = QTableWidgetItem(base_name1)
-        dim1_item = ResolutionTableWidgetItem(dimensions1)
-        date1_item = ExifDateTimeTableWidgetItem(exif_date1 if exif_date1 != "N/A" else mod_time1) # 撮影日時優先、なければ更新日時
-        path1_item = QTableWidgetItem(path1)
-
-        # ファイル2のアイテム
-        chk2_item = QTableWidgetItem()
-        chk2_item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-        chk2_item.setCheckState(Qt.CheckState.Unchecked)
-        chk2_item.setData(Qt.ItemDataRole.UserRole, path2) # UserRoleにパスを保存
-        name2_item = QTableWidgetItem(base_name2)
-        dim2_item = ResolutionTableWidgetItem(dimensions2)
-        date2_item = ExifDateTimeTableWidgetItem(exif_date2 if exif_date2 != "N/A" else mod_time2) # 撮影日時優先、なければ更新日時
-        path2_item = QTableWidgetItem(path2)
-
-        # 類似度スコア
-        # スコアが100の場合は特別な表示に（重複ファイル）
-        score_text = "完全一致（重複)" if score == 100 else str(score)
-        score_item = NumericTableWidgetItem(score_text)
-        score_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        
-        # 重複ファイルの場合は背景色を変更して目立たせる
-        if score == 100:
-            # 行全体のアイテムに背景色を設定
-            highlight_color = QColor(255, 240, 240)  # 薄い赤色
-            for item in [chk1_item, name1_item, dim1_item, date1_item, path1_item,
-                        chk2_item, name2_item, dim2_item, date2_item, path2_item, 
-                        score_item]:
-                item.setBackground(highlight_color)
-
-        # 新しい列順序に合わせてアイテムを返す
-        # ["ファイル1 チェック", "ファイル1 ファイル名", "ファイル1 解像度", "ファイル1 作成日時", "ファイル1 パス",
-        #  "ファイル2 チェック", "ファイル2 ファイル名", "ファイル2 解像度", "ファイル2 作成日時", "ファイル2 パス",
-        #  "類似度"]
-        return [
-            chk1_item, name1_item, dim1_item, date1_item, path1_item,
-            chk2_item, name2_item, dim2_item, date2_item, path2_item,
-            score_item
-        ]
+        finally:
+            # 元のリサイズモードに戻すと、列幅の計算はここで1回だけ行われる
+            for col, mode in enumerate(resize_modes):
+                header.setSectionResizeMode(col, mode)
+            table.blockSignals(signals_were_blocked)
+            table.setUpdatesEnabled(True)
+            table.setSortingEnabled(True)
+        # 投入中に止めていた選択変更を1回だけ通知する (プレビュー更新用)
+        if not signals_were_blocked: table.itemSelectionChanged.emit()
+
+    def _set_table_items(self, table: ResultsTableView, data: List[Any]) -> None:
+        """モデルの内容を data で置き換える (モデルのリセットは選択変更を通知しないため、ここで通知する)"""
+        table.results_model.set_items(data, self._get_file_info)
+        self.selection_changed.emit()
 
     def _flatten_duplicates_to_pairs(self, duplicate_results: DuplicateDict) -> List[DuplicatePair]:
         # (変更なし)
@@ -444,46 +404,6 @@ class ResultsTabsWidget(QTabWidget):
                 pair_list.append({'path1': first_path, 'path2': second_path, 'group_hash': group_hash})
         return pair_list
 
-    # ★★★ 重複ペアの行アイテム生成ロジックを新しいカラムに合わせて修正 ★★★
-    def _create_duplicate_row_items(self, data: DuplicatePair) -> List[QTableWidgetItem]:
-        """重複ペアデータからテーブル行アイテムを作成"""
-        path1: str = data['path1']
-        path2: str = data['path2']
-        group_hash: str = data['group_hash'] # 使用しないがデータとして保持
-
-        # ファイル1の情報取得
-        file_size1, mod_time1, dimensions1, exif_date1 = get_file_info(path1)
-        # ファイル2の情報取得
-        file_size2, mod_time2, dimensions2, exif_date2 = get_file_info(path2)
-
-        # ファイル1のアイテム
-        chk1_item = QTableWidgetItem()
-        chk1_item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-        chk1_item.setCheckState(Qt.CheckState.Unchecked)
-        chk1_item.setData(Qt.ItemDataRole.UserRole, path1) # UserRoleにパスを保存
-        name1_item = QTableWidgetItem(os.path.basename(path1))
-        dim1_item = ResolutionTableWidgetItem(dimensions1)
-        date1_item = ExifDateTimeTableWidgetItem(exif_date1 if exif_date1 != "N/A" else mod_time1) # 撮影日時優先、なければ更新日時
-        path1_item = QTableWidgetItem(path1)
-
-        # ファイル2のアイテム
-        chk2_item = QTableWidgetItem()
-        chk2_item.setFlags(Qt.ItemFlag.ItemIsUserCheckable | Qt.ItemFlag.ItemIsEnabled)
-        chk2_item.setCheckState(Qt.CheckState.Unchecked)
-        chk2_item.setData(Qt.ItemDataRole.UserRole, path2) # UserRoleにパスを保存
-        name2_item = QTableWidgetItem(os.path.basename(path2))
-        dim2_item = ResolutionTableWidgetItem(dimensions2)
-        date2_item = ExifDateTimeTableWidgetItem(exif_date2 if exif_date2 != "N/A" else mod_time2) # 撮影日時優先、なければ更新日時
-        path2_item = QTableWidgetItem(path2)
-
-        # 新しい列順序に合わせてアイテムを返す
-        # ["ファイル1 チェック", "ファイル1 ファイル名", "ファイル1 解像度", "ファイル1 作成日時", "ファイル1 パス",
-        #  "ファイル2 チェック", "ファイル2 ファイル名", "ファイル2 解像度", "ファイル2 作成日時", "ファイル2 パス"]
-        return [
-            chk1_item, name1_item, dim1_item, date1_item, path1_item,
-            chk2_item, name2_item, dim2_item, date2_item, path2_item
-        ]
-
     def _create_error_row_items(self, data: ErrorDict) -> List[QTableWidgetItem]:
         # (変更なし)
         err_type: str = data.get('type', '不明')
@@ -505,8 +425,8 @@ class ResultsTabsWidget(QTabWidget):
     @Slot()
     def clear_results(self) -> None:
         """すべての結果テーブルをクリアする"""
-        self.blurry_table.setRowCount(0)
-        self.similar_table.setRowCount(0)
+        self.blurry_model.set_items([], self._get_file_info)
+        self.similar_model.set_items([], self._get_file_info)
         # duplicate_table は similar_table と同じなので別途クリアする必要はない
         self.error_table.setRowCount(0)
         self._update_tab_texts()
@@ -515,6 +435,10 @@ class ResultsTabsWidget(QTabWidget):
         self._full_blurry_data = []
         self._full_similar_data = []
         self._full_duplicate_pairs = []
+        self._file_info_provider.clear()
+        self._normpaths = {}
+        if self._thumbnail_provider is not None:
+            self._thumbnail_provider.clear()
         
         # フィルターをリセット
         if self.blurry_filter:
@@ -523,180 +447,109 @@ class ResultsTabsWidget(QTabWidget):
             self.similarity_filter.reset_filters()
 
     # --- 選択状態取得メソッド ---
-    # ★★★ 選択状態取得ロジックを新しいカラムに合わせて修正 ★★★
     def get_selected_blurry_paths(self) -> List[str]:
-        paths: List[str] = []
-        for row in range(self.blurry_table.rowCount()):
-            # ブレ画像タブのチェックボックスは0列目
-            chk_item = self.blurry_table.item(row, 0)
-            if chk_item and chk_item.checkState() == Qt.CheckState.Checked:
-                path: Optional[str] = chk_item.data(Qt.ItemDataRole.UserRole)
-                if path: paths.append(path)
-        return paths
+        return self.blurry_model.checked_paths()
+
+    def get_checked_similar_paths(self) -> List[str]:
+        """類似/重複ペアタブでチェックされたファイルパス (ファイル1・ファイル2の両方) を取得"""
+        return self.similar_model.checked_paths()
+
+    def get_selected_similar_secondary_paths(self) -> List[str]:
+        """類似/重複ペアタブで選択されている行のファイル2のパスを取得"""
+        return [self.similar_model.row_paths(row)[1] for row in self.similar_table.selected_rows()]
 
     def get_selected_similar_primary_paths(self) -> List[str]:
         """類似ペアタブでチェックされたファイルパスを取得"""
-        paths: Set[str] = set() # 重複を防ぐためにSetを使用
-        for row in range(self.similar_table.rowCount()):
-            # ファイル1のチェックボックスは0列目
-            chk1_item = self.similar_table.item(row, 0)
-            if chk1_item and chk1_item.checkState() == Qt.CheckState.Checked:
-                path1: Optional[str] = chk1_item.data(Qt.ItemDataRole.UserRole)
-                if path1: paths.add(path1)
-
-            # ファイル2のチェックボックスは5列目
-            chk2_item = self.similar_table.item(row, 5)
-            if chk2_item and chk2_item.checkState() == Qt.CheckState.Checked:
-                path2: Optional[str] = chk2_item.data(Qt.ItemDataRole.UserRole)
-                if path2: paths.add(path2)
-
+        paths: Set[str] = set(self.similar_model.checked_paths()) # 重複を防ぐためにSetを使用
         # 選択行のファイル1パスも取得 (プレビュー表示用)
-        selected_rows: Set[int] = set(item.row() for item in self.similar_table.selectedItems())
-        for row in selected_rows:
-             # ファイル1のパスは4列目
-            path1_item = self.similar_table.item(row, 4)
-            path1: Optional[str] = path1_item.text() if path1_item else None
-            if path1: paths.add(path1)
-
+        for row in self.similar_table.selected_rows():
+            paths.add(self.similar_model.row_paths(row)[0])
         return list(paths) # SetをListに変換して返す
 
     def get_selected_duplicate_paths(self) -> List[str]:
-        """重複ペアタブでチェックされたファイルパスを取得"""
-        paths: Set[str] = set() # 重複を防ぐためにSetを使用
-        for row in range(self.duplicate_table.rowCount()):
-            # ファイル1のチェックボックスは0列目
-            chk1_item = self.duplicate_table.item(row, 0)
-            if chk1_item and chk1_item.checkState() == Qt.CheckState.Checked:
-                path1: Optional[str] = chk1_item.data(Qt.ItemDataRole.UserRole)
-                if path1: paths.add(path1)
-
-            # ファイル2のチェックボックスは5列目
-            chk2_item = self.duplicate_table.item(row, 5)
-            if chk2_item and chk2_item.checkState() == Qt.CheckState.Checked:
-                path2: Optional[str] = chk2_item.data(Qt.ItemDataRole.UserRole)
-                if path2: paths.add(path2)
+        """重複ペアタブでチェックされたファイルパスを取得 (重複ペアは類似ペアタブに統合されている)"""
+        return self.get_selected_similar_primary_paths()
 
-        # 選択行のファイル1パスも取得 (プレビュー表示用)
-        selected_rows: Set[int] = set(item.row() for item in self.duplicate_table.selectedItems())
-        for row in selected_rows:
-            # ファイル1のパスは4列目
-            path1_item = self.duplicate_table.item(row, 4)
-            path1: Optional[str] = path1_item.text() if path1_item else None
-            if path1: paths.add(path1)
-
-        return list(paths) # SetをListに変換して返す
+    def current_table(self) -> Optional[ResultsTableView]:
+        """現在のタブの結果テーブル (エラータブの場合は None)"""
+        current_index: int = self.currentIndex()
+        if current_index == 0: return self.blurry_table
+        if current_index == 1: return self.similar_table
+        return None
 
+    def find_row_by_path(self, file_path: str) -> int:
+        """現在のタブで、指定されたファイルを含む行を返す。見つからなければ -1"""
+        table: Optional[ResultsTableView] = self.current_table()
+        if table is None: return -1
+        return table.results_model.find_row(file_path)
 
     def get_current_selection_paths(self) -> SelectionPaths:
         """現在選択されている行のファイルパスを取得"""
-        primary_path: Optional[str] = None
-        secondary_path: Optional[str] = None
-        current_index: int = self.currentIndex()
-        table: Optional[QTableWidget] = self.widget(current_index) if isinstance(self.widget(current_index), QTableWidget) else None
+        table: Optional[ResultsTableView] = self.current_table()
         if table is None: return None, None
+        # 選択変更のたびに呼ばれるため、選択行をすべて列挙せず先頭の1行だけを見る
+        selected_row: int = table.first_selected_row()
+        if selected_row < 0: return None, None
 
-        selected_items: List[QTableWidgetItem] = table.selectedItems()
-        row: int = selected_items[0].row() if selected_items else -1
-
-        if row == -1: return None, None
-
-        if current_index == 0: # Blurry
-            # ブレ画像タブのパスは0列目のUserRole
-            item = table.item(row, 0)
-            primary_path = item.data(Qt.ItemDataRole.UserRole) if item else None
-        elif current_index == 1: # Similar
-            # 類似ペアタブのファイル1パスは4列目, ファイル2パスは9列目
-            item1 = table.item(row, 4)
-            item2 = table.item(row, 9)
-            primary_path = item1.text() if item1 else None
-            secondary_path = item2.text() if item2 else None
-        elif current_index == 2: # Duplicate
-            # 重複ペアタブのファイル1パスは4列目, ファイル2パスは9列目
-            item1 = table.item(row, 4)
-            item2 = table.item(row, 9)
-            primary_path = item1.text() if item1 else None
-            secondary_path = item2.text() if item2 else None
-
-        return primary_path, secondary_path
+        paths: Tuple[str, ...] = table.results_model.row_paths(selected_row)
+        if len(paths) == 2:
+            return paths[0], paths[1]
+        return paths[0], None
 
     # --- 全選択/解除メソッド ---
-    # ★★★ 全選択/解除ロジックを新しいカラムに合わせて修正 ★★★
     @Slot()
     def select_all_blurry(self) -> None:
         self.setCurrentIndex(0)
-        for row in range(self.blurry_table.rowCount()):
-            # ブレ画像タブのチェックボックスは0列目
-            item = self.blurry_table.item(row, 0)
-            if item and item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                item.setCheckState(Qt.CheckState.Checked)
+        self.blurry_model.set_column_checked(0, True)
 
     @Slot()
     def select_all_similar(self) -> None:
         self.setCurrentIndex(1)
-        # 類似ペアタブのファイル2（右側）のチェックボックスを全てチェック (5列目)
-        for row in range(self.similar_table.rowCount()):
-            chk2_item = self.similar_table.item(row, 5)
-            if chk2_item and chk2_item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                chk2_item.setCheckState(Qt.CheckState.Checked)
+        # 類似ペアタブのファイル2（右側）のチェックボックスを全てチェック
+        self.similar_model.set_column_checked(1, True)
         # 従来の行選択も行う (プレビュー表示のため)
         self.similar_table.selectAll()
 
     @Slot()
     def select_all_duplicates(self) -> None:
-        self.setCurrentIndex(2)
-         # 重複ペアタブのファイル2（右側）のチェックボックスを全てチェック (5列目)
-        for row in range(self.duplicate_table.rowCount()):
-            chk2_item = self.duplicate_table.item(row, 5)
-            if chk2_item and chk2_item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                chk2_item.setCheckState(Qt.CheckState.Checked)
-        # 従来の行選択も行う (プレビュー表示のため)
-        self.duplicate_table.selectAll()
+        # 重複ペアは類似ペアタブに統合されている
+        self.select_all_similar()
 
     @Slot()
     def deselect_all(self) -> None:
-        # ブレ画像のチェックボックスをクリア (0列目)
-        for row in range(self.blurry_table.rowCount()):
-            item = self.blurry_table.item(row, 0)
-            if item and item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                item.setCheckState(Qt.CheckState.Unchecked)
-
-        # 類似ペアのチェックボックスをクリア (0列目と5列目)
-        for row in range(self.similar_table.rowCount()):
-            chk1_item = self.similar_table.item(row, 0)
-            if chk1_item and chk1_item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                chk1_item.setCheckState(Qt.CheckState.Unchecked)
-
-            chk2_item = self.similar_table.item(row, 5)
-            if chk2_item and chk2_item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                chk2_item.setCheckState(Qt.CheckState.Unchecked)
-
-        # 重複ペアのチェックボックスをクリア (0列目と5列目)
-        for row in range(self.duplicate_table.rowCount()):
-            chk1_item = self.duplicate_table.item(row, 0)
-            if chk1_item and chk1_item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                chk1_item.setCheckState(Qt.CheckState.Unchecked)
-
-            chk2_item = self.duplicate_table.item(row, 5)
-            if chk2_item and chk2_item.flags() & Qt.ItemFlag.ItemIsUserCheckable:
-                chk2_item.setCheckState(Qt.CheckState.Unchecked)
+        # ブレ画像・類似/重複ペアのチェックボックスをクリア
+        self.blurry_model.set_column_checked(0, False)
+        self.similar_model.set_column_checked(0, False)
+        self.similar_model.set_column_checked(1, False)
 
         # 選択解除
         self.blurry_table.clearSelection()
         self.similar_table.clearSelection()
-        self.duplicate_table.clearSelection()
         self.error_table.clearSelection()
         self.selection_changed.emit()
 
     # --- テーブルから削除された項目を反映するメソッド ---
-    # ★★★ 削除項目チェックロジックを新しいカラムに合わせて修正 ★★★
     def remove_items_by_paths(self, deleted_paths_set: Set[str]) -> None:
         if not deleted_paths_set: return
-        self._remove_items_from_table(self.blurry_table, deleted_paths_set, self._check_blurry_path)
-        self._remove_items_from_table(self.similar_table, deleted_paths_set, self._check_similar_paths)
-        self._remove_items_from_table(self.duplicate_table, deleted_paths_set, self._check_duplicate_pair_paths)
+        # フィルター再適用や結果保存で削除済みファイルが復活しないよう、フルデータからも除外する
+        normpath = self._normpath
+        self._full_blurry_data = [item for item in self._full_blurry_data if normpath(str(item['path'])) not in deleted_paths_set]
+        self._full_similar_data = [item for item in self._full_similar_data
+                                   if normpath(str(item[0])) not in deleted_paths_set and normpath(str(item[1])) not in deleted_paths_set]
+        self._full_duplicate_pairs = [pair for pair in self._full_duplicate_pairs
+                                      if normpath(pair['path1']) not in deleted_paths_set and normpath(pair['path2']) not in deleted_paths_set]
+        self.blurry_model.remove_paths(deleted_paths_set)
+        self.similar_model.remove_paths(deleted_paths_set)
         self._remove_items_from_table(self.error_table, deleted_paths_set, self._check_error_paths)
         self._update_tab_texts()
 
+    def _normpath(self, path: str) -> str:
+        """os.path.normpath の結果を返す (一度正規化したパスは保持しておいて使い回す)"""
+        norm: Optional[str] = self._normpaths.get(path)
+        if norm is None:
+            norm = os.path.normpath(path); self._normpaths[path] = norm
+        return norm
+
     def _remove_items_from_table(self, table: QTableWidget, deleted_paths: Set[str], check_func) -> None:
         rows_to_remove: List[int] = []
         for row in range(table.rowCount()):
@@ -705,31 +558,6 @@ class ResultsTabsWidget(QTabWidget):
         for row in sorted(rows_to_remove, reverse=True):
             table.removeRow(row)
 
-    def _check_blurry_path(self, table: QTableWidget, row: int, deleted_paths: Set[str]) -> bool:
-        # ブレ画像タブのパスは0列目のUserRole
-        item: Optional[QTableWidgetItem] = table.item(row, 0)
-        path: Optional[str] = item.data(Qt.ItemDataRole.UserRole) if item else None
-        return bool(path and os.path.normpath(path) in deleted_paths)
-
-    def _check_similar_paths(self, table: QTableWidget, row: int, deleted_paths: Set[str]) -> bool:
-        # 類似ペアタブのファイル1パスは4列目, ファイル2パスは9列目
-        item1: Optional[QTableWidgetItem] = table.item(row, 4)
-        item2: Optional[QTableWidgetItem] = table.item(row, 9)
-        p1: Optional[str] = item1.text() if item1 else None
-        p2: Optional[str] = item2.text() if item2 else None
-        p1n: Optional[str] = os.path.normpath(p1) if p1 else None
-        p2n: Optional[str] = os.path.normpath(p2) if p2 else None
-        return bool((p1n and p1n in deleted_paths) or (p2n and p2n in deleted_paths))
-
-    def _check_duplicate_pair_paths(self, table: QTableWidget, row: int, deleted_paths: Set[str]) -> bool:
-         # 重複ペアタブのファイル1パスは4列目, ファイル2パスは9列目
-        item1: Optional[QTableWidgetItem] = table.item(row, 4)
-        item2: Optional[QTableWidgetItem] = table.item(row, 9)
-        p1: Optional[str] = item1.text() if item1 else None
-        p2: Optional[str] = item2.text() if item2 else None
-        p1n: Optional[str] = os.path.normpath(p1) if p1 else None
-        p2n: Optional[str] = os.path.normpath(p2) if p2 else None
-        return bool((p1n and p1n in deleted_paths) or (p2n and p2n in deleted_paths))
 
     def _check_error_paths(self, table: QTableWidget, row: int, deleted_paths: Set[str]) -> bool:
         # エラータブのファイル/ペア列は1列目
@@ -740,26 +568,21 @@ class ResultsTabsWidget(QTabWidget):
             ep: Optional[str] = err_data.get('path')
             ep1: Optional[str] = err_data.get('path1')
             ep2: Optional[str] = err_data.get('path2')
-            ep_norm: Optional[str] = os.path.normpath(ep) if ep else None
-            p1n: Optional[str] = os.path.normpath(ep1) if ep1 else None
-            p2n: Optional[str] = os.path.normpath(ep2) if ep2 else None
+            ep_norm: Optional[str] = self._normpath(ep) if ep else None
+            p1n: Optional[str] = self._normpath(ep1) if ep1 else None
+            p2n: Optional[str] = self._normpath(ep2) if ep2 else None
             if et and ('ブレ検出' in et or 'ハッシュ計算' in et or 'ファイルサイズ取得' in et) and ep_norm and ep_norm in deleted_paths: return True
             elif et and ('比較' in et or 'ORB' in et or 'pHash' in et) and ((p1n and p1n in deleted_paths) or (p2n and p2n in deleted_paths)): return True
         return False
 
     # --- コンテキストメニュー処理 ---
-    # ★★★ コンテキストメニューロジックを新しいカラムに合わせて修正 ★★★
     @Slot(QPoint)
     def _show_similar_table_context_menu(self, pos: QPoint) -> None:
-        item: Optional[QTableWidgetItem] = self.similar_table.itemAt(pos)
-        row: int = item.row() if item else -1
-        if row == -1: return
+        index: QModelIndex = self.similar_table.indexAt(pos)
+        if not index.isValid(): return
 
-        # ファイル1とファイル2のパスはそれぞれ4列目と9列目から取得
-        item1_path = self.similar_table.item(row, 4)
-        item2_path = self.similar_table.item(row, 9)
-        path1: Optional[str] = item1_path.text() if item1_path else None
-        path2: Optional[str] = item2_path.text() if item2_path else None
+        # ファイル1とファイル2のパス
+        path1, path2 = self.similar_model.row_paths(index.row())
 
         base_name1: str = os.path.basename(path1) if path1 else "N/A"
         base_name2: str = os.path.basename(path2) if path2 else "N/A"
@@ -788,48 +611,8 @@ class ResultsTabsWidget(QTabWidget):
         context_menu.addAction(action_open1)
         context_menu.addAction(action_open2)
 
-        context_menu.exec(self.similar_table.mapToGlobal(pos))
-
-    @Slot(QPoint)
-    def _show_duplicate_table_context_menu(self, pos: QPoint) -> None:
-        item: Optional[QTableWidgetItem] = self.duplicate_table.itemAt(pos)
-        row: int = item.row() if item else -1
-        if row == -1: return
-
-        # ファイル1とファイル2のパスはそれぞれ4列目と9列目から取得
-        item1_path = self.duplicate_table.item(row, 4)
-        item2_path = self.duplicate_table.item(row, 9)
-        path1: Optional[str] = item1_path.text() if item1_path else None
-        path2: Optional[str] = item2_path.text() if item2_path else None
+        context_menu.exec(self.similar_table.viewport().mapToGlobal(pos))
 
-        base_name1: str = os.path.basename(path1) if path1 else "N/A"
-        base_name2: str = os.path.basename(path2) if path2 else "N/A"
-
-        context_menu = QMenu(self)
-        action_delete1 = QAction(f"左画像を削除 ({base_name1})", self)
-        action_delete2 = QAction(f"右画像を削除 ({base_name2})", self)
-        action_open1 = QAction(f"左画像を開く ({base_name1})", self)
-        action_open2 = QAction(f"右画像を開く ({base_name2})", self)
-
-        action_delete1.setEnabled(bool(path1 and os.path.exists(path1)))
-        action_delete2.setEnabled(bool(path2 and os.path.exists(path2)))
-        action_open1.setEnabled(bool(path1 and os.path.exists(path1)))
-        action_open2.setEnabled(bool(path2 and os.path.exists(path2)))
-
-        if path1:
-            action_delete1.triggered.connect(lambda checked=False, p=path1: self.delete_file_requested.emit(p))
-            action_open1.triggered.connect(lambda checked=False, p=path1: self.open_file_requested.emit(p))
-        if path2:
-            action_delete2.triggered.connect(lambda checked=False, p=path2: self.delete_file_requested.emit(p))
-            action_open2.triggered.connect(lambda checked=False, p=path2: self.open_file_requested.emit(p))
-
-        context_menu.addAction(action_delete1)
-        context_menu.addAction(action_delete2)
-        context_menu.addSeparator()
-        context_menu.addAction(action_open1)
-        context_menu.addAction(action_open2)
-
-        context_menu.exec(self.duplicate_table.mapToGlobal(pos))
 
     # --- データ取得メソッド ---
     # ★★★ データ取得ロジックを新しいカラムに合わせて修正 ★★★
@@ -837,12 +620,37 @@ class ResultsTabsWidget(QTabWidget):
         # フィルターがあっても元のフルデータを使用
         # これにより保存されるデータはフィルターの影響を受けない
         return {
-            'blurry': self._full_blurry_data if self._full_blurry_data else self._get_blurry_data(),
+            'blurry': self._full_blurry_data if self._full_blurry_data else self.blurry_model.items(),
             'similar': self._get_similar_data(),
             'duplicates': self._get_duplicate_data_from_pairs(),
             'errors': self._get_error_data()
         }
         
+    def get_results_iter(self) -> Tuple[int, Iterator[ResultsIterItem]]:
+        """
+        保存用に (セクション名, 項目) を順に返すイテレータと総項目数を返す。
+        テーブルに依存するデータはここ (GUIスレッド) で確定させ、イテレータ自体は
+        Pythonのリストのみを参照するため、ワーカースレッドから消費できる。
+        """
+        blurry: List[BlurResultItem] = list(self._full_blurry_data) if self._full_blurry_data else self.blurry_model.items()
+        # 類似度100は重複ペアから変換したものなので、類似ペアとしては保存しない
+        similar: List[SimilarPair] = [item for item in self._full_similar_data if int(item[2]) < 100]
+        duplicates: DuplicateDict = {}
+        for pair in self._full_duplicate_pairs:
+            group: List[str] = duplicates.setdefault(pair['group_hash'], [])
+            for path in (pair['path1'], pair['path2']):
+                if path not in group: group.append(path)
+        errors: List[ErrorDict] = self._get_error_data()
+        total: int = len(blurry) + len(similar) + len(duplicates) + len(errors)
+
+        def _iterate() -> Iterator[ResultsIterItem]:
+            for item in blurry: yield 'blurry', item
+            for item in similar: yield 'similar', item
+            for group_hash, paths in duplicates.items(): yield 'duplicates', (group_hash, sorted(paths))
+            for item in errors: yield 'errors', item
+
+        return total, _iterate()
+
     def get_filter_settings(self) -> Dict[str, Dict[str, Any]]:
         """現在のフィルター設定を取得する"""
         filter_settings = {}
@@ -866,68 +674,31 @@ class ResultsTabsWidget(QTabWidget):
         # 設定を適用したらフィルターを実行
         self._apply_all_filters()
 
-    def _get_blurry_data(self) -> List[BlurResultItem]:
-        data: List[BlurResultItem] = []
-        for row in range(self.blurry_table.rowCount()):
-            # ブレ画像タブのパスは0列目のUserRole, スコアは6列目
-            chk_item: Optional[QTableWidgetItem] = self.blurry_table.item(row, 0)
-            score_item: Optional[QTableWidgetItem] = self.blurry_table.item(row, 6)
-            if chk_item and score_item:
-                path: Optional[str] = chk_item.data(Qt.ItemDataRole.UserRole)
-                try:
-                    score_text = score_item.text()
-                    score = float(score_text) if score_text != "N/A" else -1.0
-                    if path: data.append({'path': path, 'score': score})
-                except (ValueError, TypeError): continue
-        return data
-
     def _get_similar_data(self) -> List[SimilarPair]:
-        data: List[SimilarPair] = []
-        for row in range(self.similar_table.rowCount()):
-            # 類似ペアタブのファイル1パスは4列目, ファイル2パスは9列目, スコアは10列目
-            item1_path: Optional[QTableWidgetItem] = self.similar_table.item(row, 4)
-            item2_path: Optional[QTableWidgetItem] = self.similar_table.item(row, 9)
-            score_item: Optional[QTableWidgetItem] = self.similar_table.item(row, 10)
-
-            if item1_path and item2_path and score_item:
-                p1: Optional[str] = item1_path.text()
-                p2: Optional[str] = item2_path.text()
-                try:
-                    score: int = int(score_item.text())
-                    if p1 and p2:
-                        data.append([p1, p2, score])
-                except (ValueError, TypeError): continue
-        return data
+        # 表示中の類似ペア (類似度100は重複ペアから変換したものなので除く)
+        return [item for item in self.similar_model.items() if int(item[2]) < 100]
 
     def _get_duplicate_data_from_pairs(self) -> DuplicateDict:
-        data: DuplicateDict = {}
         # 重複ペアタブにはグループハッシュを直接表示していないため、パスから再構築
         # このメソッドは重複ペアのリストを返す _flatten_duplicates_to_pairs とは異なる
         # ここでは、テーブルの表示内容から重複グループを再構築する
-        pairs: List[Tuple[str, str]] = []
-        for row in range(self.duplicate_table.rowCount()):
-             # 重複ペアタブのファイル1パスは4列目, ファイル2パスは9列目
-            item1_path: Optional[QTableWidgetItem] = self.duplicate_table.item(row, 4)
-            item2_path: Optional[QTableWidgetItem] = self.duplicate_table.item(row, 9)
-            p1: Optional[str] = item1_path.text() if item1_path else None
-            p2: Optional[str] = item2_path.text() if item2_path else None
-            if p1 and p2:
-                pairs.append(tuple(sorted((p1, p2)))) # ペアをソートしてタプルで保存
-
         # 重複グループを推測 (同じファイルを含むペアは同じグループとみなす)
         groups: Dict[str, List[str]] = {}
-        for p1, p2 in pairs:
-            found_group = None
-            for group_key in groups:
-                if p1 in groups[group_key] or p2 in groups[group_key]:
-                    found_group = group_key
-                    break
-            if found_group:
-                if p1 not in groups[found_group]: groups[found_group].append(p1)
-                if p2 not in groups[found_group]: groups[found_group].append(p2)
-            else:
+        group_of_path: Dict[str, str] = {} # パス -> 所属グループのキー
+        seen_pairs: Set[FrozenSet[str]] = set() # 同じペアが複数行ある場合は1回だけ処理する
+        for item in self.similar_model.items():
+            p1: str = str(item[0]); p2: str = str(item[1])
+            pair_key: FrozenSet[str] = frozenset((p1, p2))
+            if pair_key in seen_pairs: continue
+            seen_pairs.add(pair_key)
+            if p2 < p1: p1, p2 = p2, p1
+            found_group: Optional[str] = group_of_path.get(p1) or group_of_path.get(p2)
+            if found_group is None:
                 # 新しいグループを作成 (キーは最初のファイルパスを使用)
-                groups[p1] = [p1, p2]
+                found_group = p1; groups[found_group] = []
+            for path in (p1, p2):
+                if path not in group_of_path:
+                    groups[found_group].append(path); group_of_path[path] = found_group
 
         # グループ内のパスをソート
         for group_key in groups:
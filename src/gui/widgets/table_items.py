@@ -1,63 +1,102 @@
 # gui/widgets/table_items.py
 import re
+import math
 from datetime import datetime
 from PySide6.QtWidgets import QTableWidgetItem
-from typing import Any, List # ★ List をインポート ★
+from typing import Any, List, Optional # ★ List をインポート ★
+
+# === ソート用の値への変換関数 (テーブルアイテムと結果モデルで共用) ===
+
+# ファイルサイズ文字列 ("1.5 MB" など) の数値と単位、および単位ごとの倍率
+_FILE_SIZE_PATTERN = re.compile(r"\s*([\d\.]+)?\s*([KMG]?B)", re.IGNORECASE)
+_FILE_SIZE_MULTIPLIERS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+def parse_file_size(size_str: str) -> int:
+    """ファイルサイズ文字列 (B, KB, MB, GB) をバイト単位の数値に変換 (N/A やエラーは -1)"""
+    match = _FILE_SIZE_PATTERN.match(size_str)
+    if match is None: return -1 # エラーや N/A は最小値扱い
+    num: float = float(match.group(1)) if match.group(1) else 0.0
+    return int(num * _FILE_SIZE_MULTIPLIERS[match.group(2).upper()])
+
+# get_file_info が作る固定幅の日時文字列。strptime (書式の解釈が遅い) を通さずに数値へ変換する
+_DATETIME_PATTERN = re.compile(r"(\d{4})/(\d{2})/(\d{2}) (\d{2}):(\d{2})")
+_EXIF_DATETIME_PATTERN = re.compile(r"(\d{4}):(\d{2}):(\d{2}) (\d{2}):(\d{2}):(\d{2})")
+
+def parse_datetime(datetime_str: str) -> float:
+    """日時文字列 ('YYYY/MM/DD HH:MM') をタイムスタンプに変換 (変換できない場合は -inf)"""
+    try:
+        match = _DATETIME_PATTERN.fullmatch(datetime_str)
+        if match is not None: return datetime(*map(int, match.groups())).timestamp()
+        # 'N/A', 'エラー' など数値以外は最小値扱い
+        if not any(c.isdigit() for c in datetime_str):
+             return -float('inf')
+        return datetime.strptime(datetime_str, '%Y/%m/%d %H:%M').timestamp()
+    except (ValueError, TypeError):
+        return -float('inf')
+
+def parse_exif_datetime(datetime_str: str) -> float:
+    """Exif日時文字列 ('YYYY:MM:DD HH:MM:SS') をタイムスタンプに変換 (変換できない場合は -inf)"""
+    try:
+        match = _EXIF_DATETIME_PATTERN.fullmatch(datetime_str)
+        if match is not None: return datetime(*map(int, match.groups())).timestamp()
+        # 'N/A', 'エラー' など数値以外は最小値扱い
+        if not any(c.isdigit() for c in datetime_str):
+             return -float('inf')
+        return datetime.strptime(datetime_str, '%Y:%m:%d %H:%M:%S').timestamp()
+    except (ValueError, TypeError):
+        return -float('inf') # パース失敗も最小値
+
+def parse_resolution(res_str: str) -> int:
+    """解像度文字列 ('WxH') を総ピクセル数に変換 (N/A やエラーは -1)"""
+    parts: List[str] = res_str.lower().split('x')
+    if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+        try:
+            return int(parts[0]) * int(parts[1])
+        except ValueError:
+            return -1 # 大きすぎる数値などでエラーになる場合
+    else:
+        return -1 # エラーや N/A は最小値扱い
 
 # === カスタム QTableWidgetItem サブクラス定義 ===
 
+# 数値として扱えない表示文字列 (ソート時は最小値扱い)
+NUMERIC_ERROR_TEXTS = frozenset({"N/A", "読込エラー", "エラー", "削除済?"})
+# 数値より大きい値として扱う表示文字列 (類似度の完全一致など)
+NUMERIC_MAX_TEXTS = frozenset({"完全一致（重複）", "完全一致（重複)"})
+
 class NumericTableWidgetItem(QTableWidgetItem):
-    def __lt__(self, other: Any) -> bool:
+    """
+    数値としてソート可能なテーブルアイテム。
+    比較用の値は作成時に一度だけ求めて保持する (value を渡せば文字列の解析も行わない)。
+    """
+    def __init__(self, text: str, value: Optional[float] = None):
+        super().__init__(text)
+        self.sort_value: float = float(value) if value is not None else self._parse_number(text)
+
+    def _parse_number(self, text: str) -> float:
+        """表示文字列を比較用の数値に変換 (特別な文字列は +inf / -inf)"""
+        if text in NUMERIC_MAX_TEXTS: return float('inf')
+        if not text or text in NUMERIC_ERROR_TEXTS: return -float('inf')
         try:
-            self_text: str = self.text()
-            other_text: str = other.text()
-
-            # "完全一致（重複）" のような文字列を特別扱いする
-            self_is_special_string = self_text == "完全一致（重複）"
-            other_is_special_string = other_text == "完全一致（重複）"
-
-            # 両方とも特別文字列の場合、テキストで比較（同じなので等価）
-            if self_is_special_string and other_is_special_string:
-                return False # 同じ値なので self < other は False
-
-            # 片方だけが特別文字列の場合の処理 (例: 特別文字列を最大値または最小値として扱う)
-            # ここでは例として、特別文字列を数値よりも「大きい」ものとして扱います
-            # (ソート順を調整したい場合は、ここのロジックを変更してください)
-            if self_is_special_string:
-                return False # self が特別文字列なら、other (数値のはず) より小さくはない
-            if other_is_special_string:
-                return True  # other が特別文字列なら、self (数値のはず) は other より小さい
-
-            # 通常の数値比較
-            self_value: float = float(self_text) if self_text and self_text not in ["N/A", "読込エラー", "エラー", "削除済?"] else -float('inf')
-            other_value: float = float(other_text) if other_text and other_text not in ["N/A", "読込エラー", "エラー", "削除済?"] else -float('inf')
-
-            if self_value == -float('inf') and other_value == -float('inf'):
-                 return self_text < other_text # 両方エラー値ならテキスト比較
-            return self_value < other_value
-        except (ValueError, TypeError):
-            # 型エラーや値エラーが発生した場合 (例: other.text() が予期しない形式)
-            if isinstance(other, QTableWidgetItem):
-                # ★★★ 修正箇所 ★★★
-                return QTableWidgetItem.__lt__(self, other)
-            return NotImplemented
+            return float(text)
+        except ValueError:
+            return -float('inf')
+
+    def __lt__(self, other: Any) -> bool:
+        if isinstance(other, NumericTableWidgetItem):
+            # 両方がエラー値 (または両方が完全一致) の場合、テキストで比較
+            if self.sort_value == other.sort_value and math.isinf(self.sort_value):
+                return self.text() < other.text()
+            return self.sort_value < other.sort_value
+        elif isinstance(other, QTableWidgetItem):
+            return super().__lt__(other)
+        return NotImplemented
 
 class FileSizeTableWidgetItem(QTableWidgetItem):
     """ファイルサイズ (KB, MB, GB) としてソート可能なテーブルアイテム"""
     def __init__(self, text: str):
         super().__init__(text)
-        self.bytes_value: int = self._parse_size(text)
-
-    def _parse_size(self, size_str: str) -> int:
-        """ファイルサイズ文字列をバイト単位の数値に変換"""
-        size_str = size_str.strip().upper()
-        num_part = re.match(r"([\d\.]+)", size_str)
-        num: float = float(num_part.group(1)) if num_part else 0.0
-        if "GB" in size_str: return int(num * (1024**3))
-        elif "MB" in size_str: return int(num * (1024**2))
-        elif "KB" in size_str: return int(num * 1024)
-        elif "B" in size_str: return int(num)
-        else: return -1 # エラーや N/A は最小値扱い
+        self.bytes_value: int = parse_file_size(text)
 
     def __lt__(self, other: Any) -> bool:
         if isinstance(other, FileSizeTableWidgetItem):
@@ -73,17 +112,7 @@ class DateTimeTableWidgetItem(QTableWidgetItem):
     """日時文字列 ('YYYY/MM/DD HH:MM') としてソート可能なテーブルアイテム"""
     def __init__(self, text: str):
         super().__init__(text)
-        self.timestamp: float = self._parse_datetime(text)
-
-    def _parse_datetime(self, datetime_str: str) -> float:
-        """日時文字列をタイムスタンプ (float) に変換"""
-        try:
-            # 'N/A', 'エラー' など数値以外は最小値扱い
-            if not any(c.isdigit() for c in datetime_str):
-                 return -float('inf')
-            return datetime.strptime(datetime_str, '%Y/%m/%d %H:%M').timestamp()
-        except (ValueError, TypeError):
-            return -float('inf')
+        self.timestamp: float = parse_datetime(text)
 
     def __lt__(self, other: Any) -> bool:
         if isinstance(other, DateTimeTableWidgetItem):
@@ -100,19 +129,7 @@ class ExifDateTimeTableWidgetItem(QTableWidgetItem):
     """Exif日時文字列 ('YYYY:MM:DD HH:MM:SS') としてソート可能なテーブルアイテム"""
     def __init__(self, text: str):
         super().__init__(text)
-        self.timestamp: float = self._parse_exif_datetime(text)
-
-    def _parse_exif_datetime(self, datetime_str: str) -> float:
-        """Exif日時文字列をタイムスタンプ (float) に変換"""
-        try:
-            # 'N/A', 'エラー' など数値以外は最小値扱い
-            if not any(c.isdigit() for c in datetime_str):
-                 return -float('inf')
-            # Exifフォーマットでパース
-            return datetime.strptime(datetime_str, '%Y:%m:%d %H:%M:%S').timestamp()
-        except (ValueError, TypeError):
-            # print(f"デバッグ: Exif日時パースエラー: {datetime_str}")
-            return -float('inf') # パース失敗も最小値
+        self.timestamp: float = parse_exif_datetime(text)
 
     def __lt__(self, other: Any) -> bool:
         if isinstance(other, ExifDateTimeTableWidgetItem):
@@ -130,18 +147,7 @@ class ResolutionTableWidgetItem(QTableWidgetItem):
     """解像度文字列 ('WxH') としてソート可能なテーブルアイテム (ピクセル数で比較)"""
     def __init__(self, text: str):
         super().__init__(text)
-        self.pixels: int = self._parse_resolution(text)
-
-    def _parse_resolution(self, res_str: str) -> int:
-        """解像度文字列を総ピクセル数 (int) に変換"""
-        parts: List[str] = res_str.lower().split('x')
-        if len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
-            try:
-                return int(parts[0]) * int(parts[1])
-            except ValueError:
-                return -1 # 大きすぎる数値などでエラーになる場合
-        else:
-            return -1 # エラーや N/A は最小値扱い
+        self.pixels: int = parse_resolution(text)
 
     def __lt__(self, other: Any) -> bool:
         if isinstance(other, ResolutionTableWidgetItem):
@@ -0,0 +1,61 @@
+# gui/widgets/thumbnail_provider.py
+from collections import OrderedDict
+from PySide6.QtCore import QObject, QThreadPool, Signal, Slot
+from PySide6.QtGui import QIcon, QImage, QPixmap
+from typing import Optional, Set
+
+# サムネイル読み込みワーカーをインポート
+try:
+    from ..workers import ThumbnailWorker
+except ImportError:
+    try: from gui.workers import ThumbnailWorker
+    except ImportError:
+        print("警告: ThumbnailWorker のインポートに失敗しました。サムネイルは表示されません。")
+        ThumbnailWorker = None
+
+THUMBNAIL_ICON_CACHE_MAX_ENTRIES: int = 500 # メモリ上に保持するアイコン数の上限
+THUMBNAIL_MAX_THREADS: int = 2 # スキャンや削除の処理を妨げないよう少なめにする
+
+class ThumbnailProvider(QObject):
+    """
+    結果一覧のサムネイルアイコンを提供するクラス。
+    未読込のパスは icon_for() で None を返しつつ専用のスレッドプールで読み込みを開始し、
+    読み込み完了時に thumbnail_ready シグナルを送る。表示される行の分だけ読み込まれる。
+    """
+    thumbnail_ready = Signal(str) # 読み込みが完了した画像パス
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._icons: "OrderedDict[str, QIcon]" = OrderedDict() # LRU (末尾が最近使用)
+        self._pending: Set[str] = set()
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(THUMBNAIL_MAX_THREADS)
+
+    def icon_for(self, path: str) -> Optional[QIcon]:
+        """読み込み済みのアイコンを返す。未読込なら読み込みを開始して None を返す"""
+        icon: Optional[QIcon] = self._icons.get(path)
+        if icon is not None:
+            self._icons.move_to_end(path)
+            return icon
+        if ThumbnailWorker is not None and path not in self._pending:
+            self._pending.add(path)
+            worker = ThumbnailWorker(path)
+            worker.signals.finished.connect(self._on_thumbnail_loaded)
+            self._thread_pool.start(worker)
+        return None
+
+    def clear(self) -> None:
+        """未開始の読み込みを取り消し、アイコンを破棄する (結果の入れ替え時など)"""
+        self._thread_pool.clear()
+        self._pending.clear()
+        self._icons.clear()
+
+    @Slot(str, QImage)
+    def _on_thumbnail_loaded(self, path: str, image: QImage) -> None:
+        self._pending.discard(path)
+        # 読み込めなかった画像も空のアイコンとして記録し、再読み込みを繰り返さないようにする
+        self._icons[path] = QIcon(QPixmap.fromImage(image)) if not image.isNull() else QIcon()
+        self._icons.move_to_end(path)
+        while len(self._icons) > THUMBNAIL_ICON_CACHE_MAX_ENTRIES:
+            self._icons.popitem(last=False)
+        self.thumbnail_ready.emit(path)
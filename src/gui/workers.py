@@ -3,10 +3,14 @@ import os
 import time
 import json
 import math # ★ 追加 ★
+import array
+import functools
 import concurrent.futures
+import concurrent.futures.process
 from PySide6.QtCore import QRunnable, Signal, QObject, Slot
+from PySide6.QtGui import QImage
 from PySide6.QtWidgets import QApplication
-from typing import Tuple, Optional, List, Dict, Any, Union, Set, Callable
+from typing import Tuple, Optional, List, Dict, Any, Union, Set, FrozenSet, Callable, Iterable
 
 # ★★★ 型エイリアス定義をここに移動 ★★★
 SettingsDict = Dict[str, Union[float, bool, int, str]]
@@ -16,37 +20,72 @@ DuplicateDict = Dict[str, List[str]] # {hash: [path1, path2, ...]}
 ErrorDict = Dict[str, str] # {'type': str, 'path': str, 'error': str}
 ScanStateData = Dict[str, Any] # スキャン状態保存用
 BlurResult = Tuple[Optional[float], Optional[str]] # (score, error_msg) - ブレ計算関数の戻り値
-BlurTaskResult = Tuple[str, Optional[float], Optional[str]] # (path, score, error_msg) - ブレ検出タスクの結果
 # find_similar_pairs の戻り値の型 (SimilarPair を使うので下に定義)
 FindSimilarResult = Tuple[List[SimilarPair], List[ErrorDict], List[ErrorDict]]
 # find_duplicate_files の戻り値の型
 FindDuplicateResult = Tuple[DuplicateDict, List[ErrorDict]]
+FileInfoResult = Tuple[str, str, str, str] # (size, mod_time, dimensions, exif_date)
 # ★★★★★★★★★★★★★★★★★★★★★★★★★
 
 # --- コアロジックの関数をインポート ---
 try:
-    from core.blur_detection import calculate_fft_blur_score_v2, calculate_laplacian_variance
+    from core.blur_detection import calculate_fft_blur_score_v2, calculate_fft_blur_score_gated, calculate_laplacian_variance, FFT_DOWNSCALE_DIMENSION, init_blur_worker_process
+    from core.blur_detection import calibrate_sharp_gate_cut, SHARP_GATE_SIZE, SHARP_GATE_CALIBRATION_SAMPLES
     from core.similarity_detection import find_similar_pairs
     from core.duplicate_detection import find_duplicate_files
+    from core.blur_prefilter import group_paths_by_duplicates
     # ★ 型エイリアス定義は上に移動したので、ここでは不要 ★
 except ImportError as e:
     print(f"エラー: core モジュールのインポートに失敗しました。({e}) ダミー関数を使用します。")
     # ダミー関数
-    def calculate_fft_blur_score_v2(path: str, ratio: float = 0.05) -> BlurResult: return (0.5, None) if "blur" in path.lower() else (0.9, None)
+    def calculate_fft_blur_score_v2(path: str, ratio: float = 0.05, max_dimension: int = 0) -> BlurResult: return (0.5, None) if "blur" in path.lower() else (0.9, None)
     def calculate_laplacian_variance(path: str) -> BlurResult: return (150.0, None) if "blur" in path.lower() else (50.0, None)
+    def calculate_fft_blur_score_gated(path: str, ratio: float = 0.05, sharp_laplacian_cut: float = 0.0, max_dimension: int = 0) -> Tuple[Optional[float], Optional[str], Optional[float]]: return calculate_fft_blur_score_v2(path, ratio, max_dimension) + (None,)
+    def calibrate_sharp_gate_cut(samples: List[Tuple[float, float]], blur_threshold: float) -> float: return float('inf')
+    FFT_DOWNSCALE_DIMENSION = 512; SHARP_GATE_SIZE = 256; SHARP_GATE_CALIBRATION_SAMPLES = 32
+    def init_blur_worker_process() -> None: pass
     def find_similar_pairs(image_paths: List[str], duplicate_paths_set: Set[str], similarity_mode: str = 'phash_orb', signals: Optional[Any] = None, progress_offset: int = 0, progress_range: int = 100, **kwargs: Any) -> FindSimilarResult: return [], [], []
     def find_duplicate_files(image_paths: List[str], signals: Optional[Any] = None, progress_offset: int = 0, progress_range: int = 100, **kwargs: Any) -> FindDuplicateResult: return {}, []
+    def group_paths_by_duplicates(paths: List[str], duplicates: DuplicateDict) -> Tuple[List[str], Dict[str, List[str]]]: return list(paths), {}
 
 # --- 状態ハンドラ関数をインポート ---
 try:
-    from utils.results_handler import save_scan_state, load_scan_state, delete_scan_state, get_state_filepath
+    from utils.results_handler import save_scan_state, load_scan_state, delete_scan_state, get_state_filepath, save_results_stream_to_file
 except ImportError:
     print("エラー: utils.results_handler から状態管理関数のインポートに失敗しました。")
+    def save_results_stream_to_file(fp: str, it: Iterable[Tuple[str, Any]], sdir: str, sets: Optional[SettingsDict] = None, progress_callback: Optional[Callable[[int], None]] = None) -> bool: print("警告: 結果保存機能が無効"); return False
     def save_scan_state(dir_path: str, state_data: ScanStateData) -> bool: print("警告: 状態保存機能が無効"); return False
     def load_scan_state(dir_path: str) -> Tuple[Optional[ScanStateData], Optional[str]]: print("警告: 状態読み込み機能が無効"); return None, "状態読み込み機能が無効です"
     def delete_scan_state(dir_path: str) -> bool: print("警告: 状態削除機能が無効"); return False
     def get_state_filepath(dir_path: str) -> str: return os.path.join(dir_path, ".image_cleaner_scan_state.json")
 
+# --- ブレ検出用プロセスプール (モジュール単位で使い回す) ---
+# FFT/Laplacian の計算は Python 側の処理も多く GIL の影響を受けるため、プロセスで並列化する。
+# プロセスの起動コストが大きいので、スキャンごとに作り直さず同じプールを再利用する。
+_blur_process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_blur_process_pool_workers: int = 0
+
+def _get_blur_process_pool(max_workers: int) -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """ブレ検出用のプロセスプールを取得する (並列数が変わった場合は作り直す)。作成できない場合は None"""
+    global _blur_process_pool, _blur_process_pool_workers
+    if _blur_process_pool is not None and _blur_process_pool_workers == max_workers:
+        return _blur_process_pool
+    shutdown_blur_process_pool()
+    try:
+        _blur_process_pool = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, initializer=init_blur_worker_process)
+        _blur_process_pool_workers = max_workers
+    except (OSError, ValueError, NotImplementedError) as e:
+        print(f"警告: ブレ検出用プロセスプールの作成に失敗しました。スレッドで処理します。({e})")
+        _blur_process_pool = None; _blur_process_pool_workers = 0
+    return _blur_process_pool
+
+def shutdown_blur_process_pool() -> None:
+    """ブレ検出用のプロセスプールを終了する"""
+    global _blur_process_pool, _blur_process_pool_workers
+    if _blur_process_pool is not None:
+        _blur_process_pool.shutdown(wait=False)
+    _blur_process_pool = None; _blur_process_pool_workers = 0
+
 # --- CacheHandler をインポート ---
 try:
     from utils.cache_handler import CacheHandler
@@ -54,18 +93,173 @@ except ImportError:
     print("警告: utils.cache_handler のインポートに失敗しました。キャッシュ機能は無効になります。")
     CacheHandler = None
 
+# --- ファイル情報取得関数をインポート ---
+try:
+    from utils.file_operations import get_file_info
+except ImportError:
+    print("警告: utils.file_operations のインポートに失敗しました。ファイル情報は結果表示時に取得されます。")
+    get_file_info = None
+
+# --- BlurScoreCache をインポート ---
+try:
+    from utils.score_cache import BlurScoreCache
+except ImportError:
+    print("警告: utils.score_cache のインポートに失敗しました。ブレスコアのキャッシュは無効になります。")
+    BlurScoreCache = None
+
+# --- OrbDescriptorCache をインポート ---
+try:
+    from utils.descriptor_cache import OrbDescriptorCache
+except ImportError:
+    print("警告: utils.descriptor_cache のインポートに失敗しました。ORB特徴量のキャッシュは無効になります。")
+    OrbDescriptorCache = None
+
+# --- プレビュー読み込み関数をインポート ---
+try:
+    from utils.image_loader import load_image_for_display
+except ImportError:
+    print("警告: utils.image_loader のインポートに失敗しました。プレビューは表示されません。")
+    load_image_for_display = None
+
+# --- サムネイル読み込み関数をインポート ---
+try:
+    from utils.thumbnail_cache import load_thumbnail
+except ImportError:
+    print("警告: utils.thumbnail_cache のインポートに失敗しました。サムネイルは表示されません。")
+    load_thumbnail = None
+
 # === バックグラウンド処理用のシグナル定義 ===
 class WorkerSignals(QObject):
     """バックグラウンド処理からのシグナルを定義するクラス"""
     status_update = Signal(str)
     progress_update = Signal(int)
     processing_file = Signal(str)
+    file_info_ready = Signal(dict) # {path: (size, mod_time, dimensions, exif_date)} - results_ready の直前に送信
+    blur_results_ready = Signal(list) # ブレ検出の完了時に送信 (類似ペア検出を待たずに表示するため)。最終結果は results_ready で送る
     results_ready = Signal(list, list, dict, list)
     error = Signal(str)
     finished = Signal()
     cancelled = Signal()
 
+class SaveResultsSignals(QObject):
+    """結果保存処理からのシグナルを定義するクラス"""
+    progress = Signal(int, int) # (書き出し済み項目数, 総項目数)
+    finished = Signal(bool, str) # (成功したか, 保存先パス)
+
+class FileInfoSignals(QObject):
+    """ファイル情報取得処理からのシグナルを定義するクラス"""
+    finished = Signal(int, dict) # (依頼の世代, {path: (size, mod_time, dimensions, exif_date)})
+
+class ThumbnailSignals(QObject):
+    """サムネイル読み込み処理からのシグナルを定義するクラス"""
+    finished = Signal(str, QImage) # (画像パス, サムネイル) - 失敗時は空の QImage
+
+class PreviewSignals(QObject):
+    """プレビュー画像読み込み処理からのシグナルを定義するクラス"""
+    finished = Signal(int, QImage, int, int, str) # (依頼ID, 画像, 元画像の幅, 元画像の高さ, エラーメッセージ) - 失敗時は空の QImage
+
+def _numpy_to_qimage(img_np: Any) -> QImage:
+    """BGR またはグレースケールの NumPy 配列から、配列と独立した QImage を作る (スレッド外へ渡せる)"""
+    h, w = img_np.shape[:2]
+    image_format = QImage.Format.Format_BGR888 if img_np.ndim == 3 else QImage.Format.Format_Grayscale8
+    return QImage(img_np.data, w, h, img_np.strides[0], image_format).copy()
+
 # === バックグラウンド処理実行クラス ===
+class PreviewWorker(QRunnable):
+    """プレビュー画像をバックグラウンドでデコードするクラス (QPixmap への変換は GUI スレッドで行う)"""
+    def __init__(self, request_id: int, path: str, target_size: int = 0):
+        super().__init__()
+        self.request_id: int = request_id
+        self.path: str = path
+        self.target_size: int = target_size # 0 の場合はフル解像度
+        self.signals: PreviewSignals = PreviewSignals()
+
+    @Slot()
+    def run(self) -> None:
+        image: QImage = QImage(); width: int = 0; height: int = 0; error_msg: str = ""
+        try:
+            if load_image_for_display is None:
+                error_msg = "画像ローダーが利用できません"
+            else:
+                img_np, load_error, image_size = load_image_for_display(self.path, self.target_size or None)
+                if img_np is not None and image_size is not None:
+                    image = _numpy_to_qimage(img_np); width, height = image_size
+                else:
+                    error_msg = load_error or f"画像データ取得失敗: {os.path.basename(self.path)}"
+        except Exception as e:
+            error_msg = f"予期せぬエラー ({type(e).__name__}: {e}): {os.path.basename(self.path)}"
+        finally:
+            self.signals.finished.emit(self.request_id, image, width, height, error_msg)
+
+class FileInfoWorker(QRunnable):
+    """結果一覧に表示するファイル情報 (サイズ・更新日時・解像度・撮影日時) をバックグラウンドでまとめて取得するクラス"""
+    def __init__(self, generation: int, paths: List[str]):
+        super().__init__()
+        self.generation: int = generation
+        self.paths: List[str] = paths
+        self.signals: FileInfoSignals = FileInfoSignals()
+
+    @Slot()
+    def run(self) -> None:
+        file_infos: Dict[str, FileInfoResult] = {}
+        try:
+            for path in self.paths:
+                file_infos[path] = get_file_info(path) if get_file_info is not None else ("N/A", "N/A", "N/A", "N/A")
+        except Exception as e:
+            print(f"エラー: ファイル情報ワーカーで予期せぬエラー: {e}")
+        finally:
+            # 取得できなかったパスもエラー扱いで返し、再取得を繰り返さないようにする
+            for path in self.paths: file_infos.setdefault(path, ("エラー", "エラー", "エラー", "エラー"))
+            self.signals.finished.emit(self.generation, file_infos)
+
+class ThumbnailWorker(QRunnable):
+    """結果一覧に表示するサムネイルをバックグラウンドで読み込む (ディスクキャッシュ経由) クラス"""
+    def __init__(self, path: str):
+        super().__init__()
+        self.path: str = path
+        self.signals: ThumbnailSignals = ThumbnailSignals()
+
+    @Slot()
+    def run(self) -> None:
+        image: QImage = QImage()
+        try:
+            if load_thumbnail is not None:
+                thumbnail, error_msg = load_thumbnail(self.path)
+                if thumbnail is not None:
+                    image = _numpy_to_qimage(thumbnail)
+                elif error_msg:
+                    print(f"警告: サムネイルを作成できません: {error_msg}")
+        except Exception as e:
+            print(f"エラー: サムネイルワーカーで予期せぬエラー ({os.path.basename(self.path)}): {e}")
+        finally:
+            self.signals.finished.emit(self.path, image)
+
+class SaveResultsWorker(QRunnable):
+    """スキャン結果をバックグラウンドでJSONファイルへ逐次書き出すクラス"""
+    def __init__(self, filepath: str, results_iter: Iterable[Tuple[str, Any]], total: int,
+                 scanned_directory: str, settings_used: Optional[SettingsDict] = None):
+        super().__init__()
+        self.filepath: str = filepath
+        self.results_iter: Iterable[Tuple[str, Any]] = results_iter
+        self.total: int = total
+        self.scanned_directory: str = scanned_directory
+        # 保存中に設定が変更されても影響しないようコピーを保持
+        self.settings_used: Optional[SettingsDict] = dict(settings_used) if settings_used else None
+        self.signals: SaveResultsSignals = SaveResultsSignals()
+
+    @Slot()
+    def run(self) -> None:
+        success: bool = False
+        try:
+            success = save_results_stream_to_file(
+                self.filepath, self.results_iter, self.scanned_directory, self.settings_used,
+                progress_callback=lambda count: self.signals.progress.emit(count, self.total)
+            )
+        except Exception as e:
+            print(f"エラー: 結果保存ワーカーで予期せぬエラー: {e}")
+        finally:
+            self.signals.finished.emit(success, self.filepath)
+
 class ScanWorker(QRunnable):
     """画像のスキャン処理をバックグラウンドで実行するクラス"""
     def __init__(self, directory_path: str, settings: SettingsDict, initial_state: Optional[ScanStateData] = None):
@@ -73,16 +267,26 @@ class ScanWorker(QRunnable):
         self.directory_path: str = directory_path
         self.settings: SettingsDict = settings
         self.signals: WorkerSignals = WorkerSignals()
-        self.file_extensions: Tuple[str, ...] = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp', '.heic', '.heif')
+        # 拡張子判定は splitext で取り出した拡張子だけを小文字化し、集合で照合する
+        self.file_extensions: FrozenSet[str] = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.webp', '.heic', '.heif'})
         self._cancellation_requested: bool = False
+        # 終了シグナル (cancelled / finished) はどの経路でも必ず1回だけ送る (GUI 側はこれで current_worker を解放する)
+        self._terminal_signal_sent: bool = False
         
         # 設定から自動保存関連の設定を読み込む
         self.auto_save_enabled: bool = bool(self.settings.get('auto_save_state', True))
         self.state_save_interval: int = int(self.settings.get('auto_save_interval', 100))
 
-        # パフォーマンス改善点 1: 並列処理数の調整
-        self.max_workers: Optional[int] = max(1, (os.cpu_count() // 2) if os.cpu_count() else 1)
-        print(f"INFO: Using max_workers = {self.max_workers}")
+        # パフォーマンス改善点 1: 並列処理数の調整 (0 は自動で CPU コア数の半分)
+        default_workers: int = max(1, (os.cpu_count() or 1) // 2)
+        configured_workers: int = int(self.settings.get('blur_parallel_workers', 0))
+        self.max_workers: int = configured_workers if configured_workers > 0 else default_workers
+        # MD5・ORB の計算スレッド数はブレ検出のプロセス数とは別に設定する
+        configured_io_threads: int = int(self.settings.get('io_parallel_threads', 0))
+        self.io_threads: int = configured_io_threads if configured_io_threads > 0 else default_workers
+        print(f"INFO: Using max_workers = {self.max_workers}, io_threads = {self.io_threads}")
+        # 内容が完全に同一 (サイズと MD5 が一致) のファイルのブレスコアを共有して、FFT等の計算回数を減らすか
+        self.blur_hash_prefilter: bool = bool(self.settings.get('blur_hash_prefilter', False))
 
         self.cache_handler: Optional[CacheHandler] = None
         # 設定から use_cache フラグを取得（デフォルトは True）
@@ -101,7 +305,11 @@ class ScanWorker(QRunnable):
         # 状態変数
         self.initial_state: Optional[ScanStateData] = initial_state
         self.all_image_paths: List[str] = []
-        self.blurry_results: List[BlurResultItem] = []
+        # フォルダ走査時に DirEntry から得た stat 結果 (状態ファイルから再開した場合は空で、必要時に os.stat する)
+        self.file_stats: Dict[str, os.stat_result] = {}
+        # ブレ画像の結果はパスとスコアを別々の配列で保持する (1件ごとに辞書を作らない)
+        self._blur_paths: List[str] = []
+        self._blur_scores: array.array = array.array('d')
         self.duplicate_results: DuplicateDict = {}
         self.similar_pair_results: List[SimilarPair] = []
         self.processing_errors: List[ErrorDict] = []
@@ -120,7 +328,14 @@ class ScanWorker(QRunnable):
     def _load_state_from_data(self, state_data: ScanStateData) -> None:
         # (変更なし)
         self.all_image_paths = state_data.get("all_image_paths", [])
-        self.blurry_results = state_data.get("blurry_results", [])
+        self._blur_paths = []; self._blur_scores = array.array('d')
+        blur_paths = state_data.get("blurry_paths"); blur_scores = state_data.get("blurry_scores")
+        if isinstance(blur_paths, list) and isinstance(blur_scores, list) and len(blur_paths) == len(blur_scores):
+            self._blur_paths = [str(p) for p in blur_paths]; self._blur_scores = array.array('d', (float(v) for v in blur_scores))
+        else: # 旧形式 (辞書のリスト) の状態ファイル
+            for item in state_data.get("blurry_results", []):
+                if isinstance(item, dict) and 'path' in item and 'score' in item:
+                    self._blur_paths.append(str(item['path'])); self._blur_scores.append(float(item['score']))
         self.duplicate_results = state_data.get("duplicate_results", {})
         self.similar_pair_results = state_data.get("similar_pair_results", [])
         self.processing_errors = state_data.get("processing_errors", [])
@@ -134,6 +349,11 @@ class ScanWorker(QRunnable):
              except TypeError: self.compared_pairs_similar = set()
         else: self.compared_pairs_similar = set()
 
+    @property
+    def blurry_results(self) -> List[BlurResultItem]:
+        """ブレ画像の結果を、結果表示・保存側が扱う {'path', 'score'} の辞書リストとして組み立てる"""
+        return [{"path": path, "score": score} for path, score in zip(self._blur_paths, self._blur_scores)]
+
     def _save_state(self) -> bool:
         # 自動保存が無効な場合はスキップ (ただし明示的な中断時は例外)
         if not self.auto_save_enabled and not self._cancellation_requested:
@@ -144,7 +364,7 @@ class ScanWorker(QRunnable):
             "target_directory": self.directory_path, "settings_used": self.settings,
             "all_image_paths": self.all_image_paths, "processed_paths_blur": list(self.processed_paths_blur), # setはlistに変換
             "processed_hashes": self.processed_hashes, "compared_pairs_similar": [list(p) for p in self.compared_pairs_similar], # set[tuple]はlist[list]に変換
-            "blurry_results": self.blurry_results, "duplicate_results": self.duplicate_results,
+            "blurry_paths": self._blur_paths, "blurry_scores": self._blur_scores.tolist(), "duplicate_results": self.duplicate_results,
             "similar_pair_results": self.similar_pair_results, "processing_errors": self.processing_errors
         }
         # キャッシュも同時に保存
@@ -162,6 +382,18 @@ class ScanWorker(QRunnable):
             if self._save_state(): print("状態とキャッシュの保存に成功しました。")
             else: print("警告: 状態またはキャッシュの保存に失敗しました。")
 
+    def _emit_cancelled(self) -> None:
+        """中断の終了シグナルを送る (既に終了シグナルを送っていれば何もしない)"""
+        if self._terminal_signal_sent: return
+        self._terminal_signal_sent = True
+        self.signals.cancelled.emit()
+
+    def _emit_finished(self) -> None:
+        """完了の終了シグナルを送る (既に終了シグナルを送っていれば何もしない)"""
+        if self._terminal_signal_sent: return
+        self._terminal_signal_sent = True
+        self.signals.finished.emit()
+
     def _list_image_files(self, scan_subdirs: bool) -> Tuple[List[str], Optional[str]]:
         # (変更なし)
         if self.initial_state and self.all_image_paths:
@@ -171,41 +403,105 @@ class ScanWorker(QRunnable):
         image_paths: List[str] = []; error_msg: Optional[str] = None; processed_dirs: int = 0
         status_prefix: str = "ファイルリスト作成中"; self.signals.status_update.emit(f"{status_prefix}...")
         try:
+            # os.scandir の DirEntry はディレクトリ読み込み時に種別情報を持つため、ファイルごとの stat 呼び出しが不要
             if scan_subdirs:
-                for root, dirs, files in os.walk(self.directory_path):
+                pending_dirs: List[str] = [self.directory_path]
+                while pending_dirs:
                     if self._cancellation_requested: return [], "処理が中断されました。"
+                    current_dir: str = pending_dirs.pop()
                     processed_dirs += 1
                     if processed_dirs % 50 == 0:
                         self.signals.status_update.emit(f"{status_prefix} ({processed_dirs} Dirs)..."); QApplication.processEvents()
-                    for filename in files:
-                        if filename.lower().endswith(self.file_extensions):
-                            full_path: str = os.path.join(root, filename)
-                            if os.path.isfile(full_path):
-                                image_paths.append(full_path)
+                    try:
+                        with os.scandir(current_dir) as it:
+                            for entry in it:
+                                if entry.is_dir(follow_symlinks=True):
+                                    # os.walk と同様、サブフォルダへのシンボリックリンクは辿らない
+                                    if not entry.is_symlink(): pending_dirs.append(entry.path)
+                                elif os.path.splitext(entry.name)[1].lower() in self.file_extensions and entry.is_file():
+                                    image_paths.append(entry.path); self._remember_entry_stat(entry)
+                    except OSError as e:
+                        # os.walk と同様、読み込めないサブフォルダはスキップする (対象フォルダ自体は除く)
+                        if current_dir == self.directory_path: raise
+                        print(f"警告: サブフォルダを読み込めません: {current_dir} ({e})")
             else:
-                for i, filename in enumerate(os.listdir(self.directory_path)):
-                    if self._cancellation_requested: return [], "処理が中断されました。"
-                    if i % 200 == 0: QApplication.processEvents()
-                    if filename.lower().endswith(self.file_extensions):
-                        full_path = os.path.join(self.directory_path, filename)
-                        if os.path.isfile(full_path) and not os.path.islink(full_path):
-                            image_paths.append(full_path)
+                with os.scandir(self.directory_path) as it:
+                    for i, entry in enumerate(it):
+                        if self._cancellation_requested: return [], "処理が中断されました。"
+                        if i % 200 == 0: QApplication.processEvents()
+                        if os.path.splitext(entry.name)[1].lower() in self.file_extensions and entry.is_file(follow_symlinks=False):
+                            image_paths.append(entry.path); self._remember_entry_stat(entry)
         except OSError as e: error_msg = f"ディレクトリ読み込みエラー: {e}"
         except Exception as e: error_msg = f"ファイルリスト取得エラー: {e}"
         if not self._cancellation_requested: self.signals.status_update.emit(f"ファイルリスト作成完了 ({len(image_paths)} files)")
         self.all_image_paths = sorted(image_paths)
         return self.all_image_paths, error_msg
 
-    def _process_blur_task(self, img_path: str, blur_detect_func: Callable[[str], BlurResult]) -> BlurTaskResult:
-        # (変更なし)
-        current_time = time.time()
-        if hasattr(self.signals, 'processing_file') and (current_time - self._last_processing_file_emit_time > self._processing_file_emit_interval):
-             self.signals.processing_file.emit(os.path.basename(img_path))
-             self._last_processing_file_emit_time = current_time
-
-        if self._cancellation_requested: return img_path, None, "処理中断"
-        score, error_msg = blur_detect_func(img_path)
-        return img_path, score, error_msg
+    def _remember_entry_stat(self, entry: os.DirEntry) -> None:
+        """
+        DirEntry の stat 結果を保存し、後のキャッシュ照合やファイル情報取得で使い回す。
+        Windows ではディレクトリ読み込み時に取得済みのためシステムコールが発生しない (ネットワークドライブで特に有効)。
+        """
+        try: self.file_stats[entry.path] = entry.stat()
+        except OSError: pass
+
+    def _stat_path(self, path: str) -> Optional[os.stat_result]:
+        """走査時に取得済みの stat 結果を返す。無い場合は os.stat する (失敗時は None)"""
+        st: Optional[os.stat_result] = self.file_stats.get(path)
+        if st is not None: return st
+        try: return os.stat(path)
+        except OSError: return None
+
+    def _collect_file_infos(self) -> Dict[str, FileInfoResult]:
+        """
+        結果に表示する画像のファイル情報 (サイズ・更新日時・解像度・撮影日時) をワーカースレッドで取得する。
+        結果表示時に GUI スレッドでファイルを1件ずつ開かなくて済むようにするため。
+        """
+        file_infos: Dict[str, FileInfoResult] = {}
+        if get_file_info is None: return file_infos
+        result_paths: Set[str] = set(self._blur_paths)
+        for path1, path2, _ in self.similar_pair_results: result_paths.add(path1); result_paths.add(path2)
+        for group_paths in self.duplicate_results.values(): result_paths.update(group_paths)
+        self.signals.status_update.emit(f"ファイル情報取得中 ({len(result_paths)} files)...")
+        for path in result_paths:
+            if self._cancellation_requested: break
+            file_infos[path] = get_file_info(path, self.file_stats.get(path))
+        return file_infos
+
+    def _open_score_cache(self) -> Optional["BlurScoreCache"]:
+        """ブレスコアの永続キャッシュを開く (キャッシュ無効時や開けない場合は None)。run() のスレッド内で呼ぶこと"""
+        if BlurScoreCache is None or not (self.cache_handler and self.cache_handler.use_cache): return None
+        score_cache = BlurScoreCache(self.directory_path)
+        return score_cache if score_cache.available else None
+
+    def _open_descriptor_cache(self, similarity_mode: str) -> Optional["OrbDescriptorCache"]:
+        """ORB特徴量の永続キャッシュを開く (ORB を使わないモード、キャッシュ無効時や開けない場合は None)。run() のスレッド内で呼ぶこと"""
+        if similarity_mode == 'phash_only': return None
+        if OrbDescriptorCache is None or not (self.cache_handler and self.cache_handler.use_cache): return None
+        descriptor_cache = OrbDescriptorCache(self.directory_path)
+        return descriptor_cache if descriptor_cache.available else None
+
+    def _record_blur_result(self, img_path: str, score: Optional[float], error_msg: Optional[str], blur_algo: str, blur_threshold: float) -> None:
+        """1ファイル分のブレ検出結果を状態に反映する"""
+        self.processed_paths_blur.add(img_path)
+        if error_msg is not None:
+            if error_msg != "処理中断": self.processing_errors.append({'type': f'ブレ検出({blur_algo})', 'path': os.path.basename(img_path), 'error': error_msg})
+        # ★★★ スコアと比較閾値 (blur_threshold: float) で比較 ★★★
+        elif score is not None and score <= blur_threshold:
+            self._blur_paths.append(img_path); self._blur_scores.append(float(score))
+        # ★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★
+
+    def _group_identical_blur_tasks(self, paths: List[str]) -> Optional[Tuple[List[str], Dict[str, List[str]]]]:
+        """ブレ検出対象のうち内容が完全に同一 (サイズと MD5 が一致) のファイルをまとめる。中断された場合は None を返す"""
+        self.signals.status_update.emit("ブレ検出 前処理中 (同一ファイルの検出)...")
+        # 重複ファイル検出と同じ処理を使う (MD5 はキャッシュされ、後の重複検出でも再利用される)。
+        # ハッシュを計算できなかったファイルは単独で本処理に回し、エラーはそちらで記録する
+        duplicates, _ = find_duplicate_files(
+            paths, is_cancelled_func=lambda: self._cancellation_requested,
+            cache_handler=self.cache_handler, max_workers=self.io_threads
+        )
+        if self._cancellation_requested: return None
+        return group_paths_by_duplicates(paths, duplicates)
 
     @Slot()
     def run(self) -> None:
@@ -219,14 +515,14 @@ class ScanWorker(QRunnable):
             scan_subdirs: bool = bool(self.settings.get('scan_subdirectories', False))
             image_paths: List[str]; list_error: Optional[str]
             image_paths, list_error = self._list_image_files(scan_subdirs)
-            if self._cancellation_requested: self.signals.cancelled.emit(); return
-            if list_error: self.signals.error.emit(list_error); self.signals.finished.emit(); return
+            if self._cancellation_requested: self._emit_cancelled(); return
+            if list_error: self.signals.error.emit(list_error); self._emit_finished(); return
             if not image_paths:
                 self.signals.status_update.emit("対象フォルダ（およびサブフォルダ）に画像ファイルが見つかりませんでした。")
                 self.signals.results_ready.emit([], [], {}, self.processing_errors)
                 delete_scan_state(self.directory_path)
                 if self.cache_handler: self.cache_handler.clear_all()
-                self.signals.finished.emit(); return
+                self._emit_finished(); return
 
             num_images: int = len(image_paths)
             duplicate_paths_set: Set[str] = set()
@@ -237,6 +533,9 @@ class ScanWorker(QRunnable):
             blur_threshold: float # ★ 比較用の閾値は float ★
             threshold_label: str
             blur_detect_func: Callable[[str], BlurResult]
+            # FFT 前の縮小は設定で明示的に有効にした場合のみ (縮小するとスコアの意味が変わる)
+            fft_max_dimension: int = FFT_DOWNSCALE_DIMENSION if self.settings.get('blur_fft_downscale', False) else 0
+            use_sharp_gate: bool = False
 
             # ★★★ 閾値設定の取得と変換 ★★★
             if blur_algo == 'laplacian':
@@ -251,7 +550,9 @@ class ScanWorker(QRunnable):
                 # 表示用のラベルは 0-100 の整数に戻す
                 threshold_display_int = math.floor(blur_threshold * 100) # ★ 小数点切り捨てで表示 ★
                 threshold_label = f"FFT閾値: {threshold_display_int}" # ★ 表示用ラベル (例: FFT閾値: 80) ★
-                blur_detect_func = calculate_fft_blur_score_v2
+                # 明らかにシャープな画像の FFT を省略する設定 (判定関数とカット値はブレ検出の本処理で決める)
+                use_sharp_gate = bool(self.settings.get('blur_sharp_gate', False))
+                blur_detect_func = functools.partial(calculate_fft_blur_score_v2, max_dimension=fft_max_dimension) # partial はプロセスプールへ渡せる
             # ★★★★★★★★★★★★★★★★★★★★★★★★★★
 
             # ★ ログ出力も比較閾値(float)を表示 ★
@@ -265,34 +566,120 @@ class ScanWorker(QRunnable):
             tasks_to_run_blur: List[str] = [p for p in image_paths if p not in self.processed_paths_blur]; num_tasks_blur: int = len(tasks_to_run_blur)
             print(f"ブレ検出対象: {num_tasks_blur} ファイル")
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = [executor.submit(self._process_blur_task, path, blur_detect_func) for path in tasks_to_run_blur]
-                for future in concurrent.futures.as_completed(futures):
-                    if self._cancellation_requested:
-                        print("ブレ検出中に中断要求あり..."); [f.cancel() for f in futures if not f.done()]; self.signals.cancelled.emit(); return
-                    try:
-                        img_path, score, error_msg = future.result()
-                        self.processed_paths_blur.add(img_path); processed_count_blur += 1
-                        if error_msg is not None:
-                            if error_msg != "処理中断": self.processing_errors.append({'type': f'ブレ検出({blur_algo})', 'path': os.path.basename(img_path), 'error': error_msg})
-                        # ★★★ スコアと比較閾値 (blur_threshold: float) で比較 ★★★
-                        elif score is not None and score <= blur_threshold:
-                            self.blurry_results.append({"path": img_path, "score": score})
-                        # ★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★
-
-                        progress: int = current_progress + int((processed_count_blur / num_images) * PROGRESS_BLUR_DETECT); current_time: float = time.time()
-                        if processed_count_blur % 50 == 0: QApplication.processEvents()
-                        if processed_count_blur % self.state_save_interval == 0: self._save_state()
-                        if processed_count_blur == num_images or current_time - last_blur_emit_time > 0.2:
-                             # ★ ステータス表示も threshold_label を使う ★
-                             self.signals.progress_update.emit(progress); self.signals.status_update.emit(f"{status_prefix_blur} ({threshold_label}) ({processed_count_blur}/{num_images})"); last_blur_emit_time = current_time
-                    except concurrent.futures.CancelledError: print("ブレ検出タスクがキャンセルされました。")
-                    except Exception as exc: print(f'ブレ検出タスクで予期せぬ例外が発生: {exc}'); self.processing_errors.append({'type': f'ブレ検出({blur_algo})(致命的)', 'path': '不明', 'error': str(exc)}); processed_count_blur += 1
+            # 永続キャッシュ: 前回スキャンから変更の無いファイル (パス・更新日時・サイズが一致) は再計算しない
+            score_cache: Optional[BlurScoreCache] = self._open_score_cache() if tasks_to_run_blur else None
+            # 計算条件 (縮小の有無・縮小サイズ) が変わればキャッシュも別扱い
+            score_cache_algo: str = blur_algo if blur_algo == 'laplacian' else (f"fft:{fft_max_dimension}:reduced" if fft_max_dimension > 0 else "fft:full")
+            # シャープ判定値もキャッシュし、次回以降は判定値がカット値を超える画像を読み込まずにシャープとみなす
+            gate_cache_algo: str = f"sharpgate:{SHARP_GATE_SIZE}:{fft_max_dimension}"
+            cached_gate_metrics: Dict[str, float] = {}
+            calibration_samples: List[Tuple[float, float]] = [] # カット値の較正用 (FFT スコア, シャープ判定値)
+            file_stats: Dict[str, Tuple[float, int]] = {}
+            if score_cache is not None:
+                remaining_tasks: List[str] = []
+                for path in tasks_to_run_blur:
+                    st: Optional[os.stat_result] = self._stat_path(path)
+                    if st is None: remaining_tasks.append(path); continue
+                    file_stats[path] = (st.st_mtime, st.st_size)
+                    cached_score: Optional[float] = score_cache.get(path, st.st_mtime, st.st_size, score_cache_algo)
+                    if cached_score is None:
+                        remaining_tasks.append(path)
+                        if use_sharp_gate:
+                            cached_metric: Optional[float] = score_cache.get(path, st.st_mtime, st.st_size, gate_cache_algo)
+                            if cached_metric is not None: cached_gate_metrics[path] = cached_metric
+                        continue
+                    if use_sharp_gate:
+                        # 前回までに両方を計算した画像は、そのままカット値の較正サンプルに使う
+                        cached_metric = score_cache.get(path, st.st_mtime, st.st_size, gate_cache_algo)
+                        if cached_metric is not None: calibration_samples.append((cached_score, cached_metric))
+                    self._record_blur_result(path, cached_score, None, blur_algo, blur_threshold); processed_count_blur += 1
+                print(f"ブレスコアキャッシュ: {num_tasks_blur - len(remaining_tasks)}/{num_tasks_blur} 件ヒット")
+                tasks_to_run_blur = remaining_tasks
+
+            # プロセスプールが使えない環境 (作成失敗時) はスレッドプールで処理する
+            blur_executor: concurrent.futures.Executor
+            process_pool = _get_blur_process_pool(self.max_workers) if tasks_to_run_blur else None
+            owns_executor: bool = process_pool is None
+            blur_executor = process_pool if process_pool is not None else concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                # 前処理: 内容が完全に同一のファイルは代表1枚だけスコアを計算し、結果を共有する
+                shared_members: Dict[str, List[str]] = {}
+                if self.blur_hash_prefilter and len(tasks_to_run_blur) > 1:
+                    grouped = self._group_identical_blur_tasks(tasks_to_run_blur)
+                    if grouped is None: self._emit_cancelled(); return
+                    tasks_to_run_blur, shared_members = grouped
+                    print(f"ブレ検出前処理: {num_tasks_blur} ファイル -> 代表 {len(tasks_to_run_blur)} ファイル")
+
+                # シャープ判定を使う場合は、まず一部の画像で判定値と FFT スコアを両方求めてカット値を較正し、残りをそのカット値で処理する
+                # キャッシュから十分なサンプルが得られた場合は、較正のための FFT を追加で行わない
+                blur_phases: List[List[str]] = [tasks_to_run_blur]
+                if use_sharp_gate and tasks_to_run_blur:
+                    needed_samples: int = max(0, SHARP_GATE_CALIBRATION_SAMPLES - len(calibration_samples))
+                    uncached_paths: List[str] = [path for path in tasks_to_run_blur if path not in cached_gate_metrics]
+                    calibration_paths: List[str] = uncached_paths[::max(1, len(uncached_paths) // max(1, needed_samples))][:needed_samples]
+                    calibration_set: Set[str] = set(calibration_paths)
+                    blur_phases = [calibration_paths, [path for path in tasks_to_run_blur if path not in calibration_set]]
+
+                for phase_index, phase_paths in enumerate(blur_phases):
+                    phase_func: Callable[[str], Any] = blur_detect_func
+                    calibrating: bool = use_sharp_gate and phase_index == 0
+                    if use_sharp_gate:
+                        sharp_gate_cut: float = math.inf if calibrating else calibrate_sharp_gate_cut(calibration_samples, blur_threshold)
+                        if not calibrating:
+                            print(f"シャープ判定のカット値: {sharp_gate_cut:.1f} (較正サンプル {len(calibration_samples)} 件)")
+                            # キャッシュ済みの判定値がカット値を超える画像は、読み込まずにシャープ (ブレなし) とする
+                            unresolved_paths: List[str] = []
+                            for path in phase_paths:
+                                if cached_gate_metrics.get(path, 0.0) <= sharp_gate_cut: unresolved_paths.append(path); continue
+                                for target_path in [path] + shared_members.get(path, []):
+                                    self._record_blur_result(target_path, None, None, blur_algo, blur_threshold); processed_count_blur += 1
+                            phase_paths = unresolved_paths
+                        phase_func = functools.partial(calculate_fft_blur_score_gated, sharp_laplacian_cut=sharp_gate_cut, max_dimension=fft_max_dimension)
+
+                    future_to_path: Dict[concurrent.futures.Future, str] = {blur_executor.submit(phase_func, path): path for path in phase_paths}
+                    for future in concurrent.futures.as_completed(future_to_path):
+                        if self._cancellation_requested:
+                            print("ブレ検出中に中断要求あり...")
+                            for f in future_to_path:
+                                if not f.done(): f.cancel()
+                            self._emit_cancelled(); return
+                        img_path: str = future_to_path[future]
+                        try:
+                            current_time: float = time.monotonic()
+                            if current_time - self._last_processing_file_emit_time > self._processing_file_emit_interval:
+                                self.signals.processing_file.emit(os.path.basename(img_path)); self._last_processing_file_emit_time = current_time
+                            result: Tuple[Any, ...] = future.result()
+                            score, error_msg = result[0], result[1]
+                            gate_metric: Optional[float] = result[2] if use_sharp_gate else None
+                            if calibrating and score is not None and gate_metric is not None:
+                                calibration_samples.append((score, gate_metric))
+                            for target_path in [img_path] + shared_members.get(img_path, []):
+                                self._record_blur_result(target_path, score, error_msg, blur_algo, blur_threshold); processed_count_blur += 1
+                                if score_cache is not None and error_msg is None and target_path in file_stats:
+                                    if score is not None: score_cache.put(target_path, *file_stats[target_path], score_cache_algo, score)
+                                    if gate_metric is not None: score_cache.put(target_path, *file_stats[target_path], gate_cache_algo, gate_metric)
+
+                            if processed_count_blur % 50 == 0: QApplication.processEvents()
+                            if processed_count_blur % self.state_save_interval == 0: self._save_state()
+                            if processed_count_blur == num_images or current_time - last_blur_emit_time > 0.2:
+                                 # ★ ステータス表示も threshold_label を使う ★ (進捗値と文字列は送信時のみ作成)
+                                 progress: int = current_progress + int((processed_count_blur / num_images) * PROGRESS_BLUR_DETECT)
+                                 self.signals.progress_update.emit(progress); self.signals.status_update.emit(f"{status_prefix_blur} ({threshold_label}) ({processed_count_blur}/{num_images})"); last_blur_emit_time = current_time
+                        except concurrent.futures.CancelledError: print("ブレ検出タスクがキャンセルされました。")
+                        except concurrent.futures.process.BrokenProcessPool as exc:
+                            # ワーカープロセスが異常終了した場合、次回スキャンでプールを作り直す
+                            if process_pool is not None: shutdown_blur_process_pool(); process_pool = None
+                            self.processing_errors.append({'type': f'ブレ検出({blur_algo})(致命的)', 'path': os.path.basename(img_path), 'error': str(exc)}); processed_count_blur += 1
+                        except Exception as exc: print(f'ブレ検出タスクで予期せぬ例外が発生: {exc}'); self.processing_errors.append({'type': f'ブレ検出({blur_algo})(致命的)', 'path': os.path.basename(img_path), 'error': str(exc)}); processed_count_blur += 1
+            finally:
+                if owns_executor: blur_executor.shutdown(wait=True)
+                if score_cache is not None: score_cache.close()
 
             if hasattr(self.signals, 'processing_file'): self.signals.processing_file.emit("")
             current_progress += PROGRESS_BLUR_DETECT; self.signals.progress_update.emit(current_progress)
             if not self._cancellation_requested: self._save_state()
-            if self._cancellation_requested: self.signals.cancelled.emit(); return
+            if self._cancellation_requested: self._emit_cancelled(); return
+            self.signals.blur_results_ready.emit(self.blurry_results)
 
             # --- 2. 重複ファイル検出 ---
             self.signals.status_update.emit("重複ファイル検出中...")
@@ -301,14 +688,16 @@ class ScanWorker(QRunnable):
                     image_paths, signals=self.signals,
                     progress_offset=current_progress, progress_range=PROGRESS_DUPLICATE_DETECT,
                     is_cancelled_func=lambda: self._cancellation_requested,
-                    cache_handler=self.cache_handler
+                    cache_handler=self.cache_handler,
+                    max_workers=self.io_threads
                 )
-                if self._cancellation_requested: self.signals.cancelled.emit(); return
+                if self._cancellation_requested: self._emit_cancelled(); return
                 self.duplicate_results = dup_results_current
                 for err in dup_errors_current:
                     if 'path' in err: err['path'] = os.path.basename(err['path'])
                 self.processing_errors.extend(dup_errors_current)
-                duplicate_paths_set.clear(); [duplicate_paths_set.update(paths) for paths in self.duplicate_results.values()]
+                duplicate_paths_set.clear()
+                for paths in self.duplicate_results.values(): duplicate_paths_set.update(paths)
             except Exception as e:
                 self.processing_errors.append({'type': '重複検出(致命的)', 'path': self.directory_path, 'error': str(e)})
                 print(f"エラー: 重複ファイル検出中に予期せぬエラー: {e}")
@@ -316,7 +705,7 @@ class ScanWorker(QRunnable):
             if not self._cancellation_requested:
                  self.signals.status_update.emit(f"重複ファイル検出完了 ({len(self.duplicate_results)}グループ, {len(duplicate_paths_set)}ファイル)")
                  self._save_state()
-            if self._cancellation_requested: self.signals.cancelled.emit(); return
+            if self._cancellation_requested: self._emit_cancelled(); return
 
             # --- 3. 類似ペア検出 ---
             similarity_mode: str = str(self.settings.get('similarity_mode', 'phash_orb'))
@@ -328,6 +717,7 @@ class ScanWorker(QRunnable):
 
             status_msg: str = f"類似ペア検出中 (モード: {similarity_mode.replace('_', ' ').title()}, 重複除外)"
             self.signals.status_update.emit(status_msg)
+            descriptor_cache: Optional[OrbDescriptorCache] = self._open_descriptor_cache(similarity_mode)
             try:
                 sim_pairs_current, comp_errors_current, _ = find_similar_pairs(
                     image_paths, duplicate_paths_set=duplicate_paths_set, similarity_mode=similarity_mode,
@@ -337,9 +727,13 @@ class ScanWorker(QRunnable):
                     progress_range=PROGRESS_SIMILAR_DETECT,
                     is_cancelled_func=lambda: self._cancellation_requested,
                     cache_handler=self.cache_handler,
-                    normalize_scores=True  # スコアを1-99の範囲に正規化する
+                    normalize_scores=True,  # スコアを1-99の範囲に正規化する
+                    max_workers=self.io_threads,
+                    use_opencl=bool(self.settings.get('orb_use_opencl', False)),
+                    descriptor_cache=descriptor_cache,
+                    known_stats=self.file_stats
                 )
-                if self._cancellation_requested: self.signals.cancelled.emit(); return
+                if self._cancellation_requested: self._emit_cancelled(); return
                 self.similar_pair_results = sim_pairs_current
                 for err in comp_errors_current:
                      if 'path' in err and ' vs ' in err['path']:
@@ -351,15 +745,20 @@ class ScanWorker(QRunnable):
             except Exception as e:
                 self.processing_errors.append({'type': f'類似ペア検出({similarity_mode})(致命的)', 'path': self.directory_path, 'error': str(e)})
                 print(f"エラー: 類似ペア検出 ({similarity_mode}モード) 中に予期せぬエラー: {e}")
+            finally:
+                if descriptor_cache is not None: descriptor_cache.close()
             current_progress = 100; self.signals.progress_update.emit(current_progress)
             if not self._cancellation_requested:
                 self.signals.status_update.emit(f"類似ペア検出完了 ({len(self.similar_pair_results)}ペア発見)")
                 delete_scan_state(self.directory_path)
-            if self._cancellation_requested: self.signals.cancelled.emit(); return
+            if self._cancellation_requested: self._emit_cancelled(); return
 
             # --- 4. 結果通知 ---
             end_time: float = time.time()
             print(f"スキャン処理完了。所要時間: {end_time - start_time:.2f} 秒")
+            file_infos: Dict[str, FileInfoResult] = self._collect_file_infos()
+            if self._cancellation_requested: self._emit_cancelled(); return
+            self.signals.file_info_ready.emit(file_infos)
             self.signals.results_ready.emit(self.blurry_results, self.similar_pair_results, self.duplicate_results, self.processing_errors)
 
         except Exception as e:
@@ -369,5 +768,6 @@ class ScanWorker(QRunnable):
         finally:
             if hasattr(self.signals, 'processing_file'):
                 self.signals.processing_file.emit("")
-            if not self._cancellation_requested:
-                self.signals.finished.emit()
\ No newline at end of file
+            # 最後の中断確認の後 (結果の送信中など) に中断要求が来た場合も、終了シグナルを送らずに終わらないようにする
+            if self._cancellation_requested: self._emit_cancelled()
+            else: self._emit_finished()
\ No newline at end of file
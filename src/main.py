@@ -1,6 +1,7 @@
 # main.py
 import sys
 import os # ★ os モジュールをインポート ★
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from gui.main_window import ImageCleanerWindow
 from utils.config_handler import load_settings # ★ 設定読み込み関数をインポート ★
@@ -46,4 +47,5 @@ def run_app():
     sys.exit(app.exec())
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support() # PyInstaller でビルドした exe からブレ検出用プロセスを起動するため
     run_app() # アプリケーション起動関数を呼び出す
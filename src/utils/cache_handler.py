@@ -4,6 +4,8 @@ import json
 import time
 from typing import Dict, Any, Optional, Tuple
 
+from utils.json_compat import json_loads, json_dumps_bytes
+
 CACHE_DIR_NAME = ".image_cleaner_cache"
 MD5_CACHE_FILENAME = "md5_cache.json"
 PHASH_CACHE_FILENAME = "phash_cache.json"
@@ -63,8 +65,9 @@ class CacheHandler:
             return {}
             
         try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 一度の read() で読み込み、バイト列のまま解析する
+            with open(cache_path, 'rb') as f:
+                data = json_loads(f.read())
                 if isinstance(data, dict):
                     # 簡単な形式チェック (値がリスト/タプルで長さ2か)
                     valid_data = {k: tuple(v) for k, v in data.items() if isinstance(v, (list, tuple)) and len(v) == 2}
@@ -99,8 +102,10 @@ class CacheHandler:
         try:
             # CacheEntry のタプルをリストに変換して保存 (JSON互換性)
             data_to_save = {k: list(v) for k, v in cache_data.items()}
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=4)
+            # 先にシリアライズしてから一度の write() で書き込む (json.dump は細かい書き込みを繰り返すため)
+            cache_bytes: bytes = json_dumps_bytes(data_to_save, indent=True)
+            with open(cache_path, 'wb') as f:
+                f.write(cache_bytes)
             return True
         except OSError as e:
             print(f"警告: キャッシュファイルの保存に失敗 (OSError: {e}): {cache_path}")
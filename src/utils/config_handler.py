@@ -1,15 +1,21 @@
 # utils/config_handler.py
 import os
+import copy
 import json
+from dataclasses import dataclass, asdict
 from typing import Dict, Any, Union, Optional
 
-SETTINGS_FILE: str = os.path.join(os.path.expanduser("~"), ".image_cleaner_settings.json")
+# ホームディレクトリは起動中に変わらないため一度だけ解決する
+HOME_DIR: str = os.path.expanduser("~")
+SETTINGS_FILE: str = os.path.join(HOME_DIR, ".image_cleaner_settings.json")
 
 # デフォルト設定値
 DEFAULT_SETTINGS: Dict[str, Any] = {
     # スキャン設定
     'scan_subdirectories': False,
     'use_cache': True,  # デフォルトではキャッシュを使用する
+    'fast_folder_picker': False,  # ネイティブではない軽量なファイルダイアログを使う (NAS等で高速)
+    'show_thumbnails': False,  # 結果一覧のファイル名にサムネイルを表示する (バックグラウンドで読み込み)
     # スキャン状態の自動保存と復元
     'auto_save_state': True,  # スキャン中に定期的に状態を自動保存
     'auto_restore_on_start': True,  # 起動時に前回の中断状態を自動チェック
@@ -18,15 +24,21 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     'blur_algorithm': 'fft',
     'blur_threshold': 0.80,
     'blur_laplacian_threshold': 100,
+    'blur_fft_downscale': False,  # FFT の前に長辺 512px へ縮小して高速化する (スコアの基準が変わるため既定は無効)
+    'blur_sharp_gate': False,  # FFT の前に縮小画像の Laplacian 分散で明らかにシャープな画像を除外する
+    'blur_hash_prefilter': False,  # 内容が完全に同一 (サイズと MD5 が一致) のファイルはブレスコアを共有する
+    'blur_parallel_workers': 0,  # ブレ検出の並列プロセス数 (0 は CPU コア数の半分で自動)
+    'io_parallel_threads': 0,  # 重複検出 (MD5) と類似検出 (ORB) の並列スレッド数 (0 は CPU コア数の半分で自動)
     # 類似ペア検出設定
     'similarity_mode': 'phash_orb',
     'hash_threshold': 5,
     'orb_nfeatures': 1500,
     'orb_ratio_threshold': 0.70,
     'min_good_matches': 40,
+    'orb_use_opencl': False,  # ORB 特徴量の計算に OpenCL (GPU など) を使う
     # アプリケーション状態
-    'last_directory': os.path.expanduser("~"),
-    'last_save_load_dir': os.path.expanduser("~"),
+    'last_directory': HOME_DIR,
+    'last_save_load_dir': HOME_DIR,
     'presets': {},
     # テーマ設定
     'theme': 'light', # 'light' or 'dark'
@@ -48,13 +60,57 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 # 型エイリアス
 SettingsDict = Dict[str, Any]
 
+@dataclass
+class AppSettings:
+    """
+    メインウィンドウが操作のたびに参照するアプリケーション状態。
+    設定辞書から一度だけ生成し、保存時に辞書へ書き戻す。
+    """
+    __slots__ = ('last_directory', 'last_save_load_dir', 'theme', 'fast_folder_picker')
+    last_directory: str
+    last_save_load_dir: str
+    theme: str
+    fast_folder_picker: bool
+
+    @classmethod
+    def from_dict(cls, settings: SettingsDict) -> 'AppSettings':
+        """設定辞書から生成する (不正な値はデフォルト値で補う)"""
+        last_directory: Any = settings.get('last_directory')
+        last_save_load_dir: Any = settings.get('last_save_load_dir')
+        theme: Any = settings.get('theme')
+        fast_folder_picker: bool = bool(settings.get('fast_folder_picker', False))
+        if not isinstance(last_directory, str) or not last_directory: last_directory = HOME_DIR
+        if not isinstance(last_save_load_dir, str) or not last_save_load_dir: last_save_load_dir = last_directory
+        if theme not in ('light', 'dark'): theme = 'light'
+        return cls(last_directory, last_save_load_dir, theme, fast_folder_picker)
+
+    def apply_to(self, settings: SettingsDict) -> SettingsDict:
+        """保持している値を設定辞書に書き戻し、その辞書を返す"""
+        settings.update(asdict(self))
+        return settings
+
+# 読み込み済みの設定と、最後にファイルと一致していた (保存形式の) 設定。
+# 起動時に複数箇所から読み込まれてもファイルを解析するのは一度だけにし、変更がなければ保存も省略する
+_settings_cache: Optional[SettingsDict] = None
+_last_saved_settings: Optional[SettingsDict] = None
+
 def load_settings() -> SettingsDict:
+    """設定辞書を返す。ファイルを読み込むのは初回のみで、以降はメモリ上の内容のコピーを返す"""
+    global _settings_cache, _last_saved_settings
+    if _settings_cache is None:
+        _settings_cache = _read_settings_file()
+        if os.path.exists(SETTINGS_FILE):
+            _last_saved_settings = _validate_settings_for_save(_settings_cache)
+    return copy.deepcopy(_settings_cache)
+
+def _read_settings_file() -> SettingsDict:
     """設定ファイルを読み込み、設定辞書を返す"""
     current_settings: SettingsDict = DEFAULT_SETTINGS.copy()
     if os.path.exists(SETTINGS_FILE):
         try:
-            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                loaded_settings: Dict[str, Any] = json.load(f)
+            # 小さなファイルなので一度の read() で読み込み、バイト列のまま解析する
+            with open(SETTINGS_FILE, 'rb') as f:
+                loaded_settings: Dict[str, Any] = json.loads(f.read())
 
                 for key, default_value in DEFAULT_SETTINGS.items():
                     if key in loaded_settings:
@@ -103,14 +159,36 @@ def load_settings() -> SettingsDict:
 
     # 互換性維持とデフォルト値設定
     if 'last_save_load_dir' not in current_settings:
-        current_settings['last_save_load_dir'] = current_settings.get('last_directory', os.path.expanduser("~"))
+        current_settings['last_save_load_dir'] = current_settings.get('last_directory', HOME_DIR)
     if 'presets' not in current_settings: current_settings['presets'] = {}
     if 'theme' not in current_settings: current_settings['theme'] = 'light' # theme がなければ light
 
     return current_settings
 
 def save_settings(settings_to_save: SettingsDict) -> bool:
-    """現在の設定をファイルに保存する"""
+    """現在の設定をファイルに保存する (前回の読み込み・保存から変更がなければ書き込まない)"""
+    global _settings_cache, _last_saved_settings
+    valid_settings: SettingsDict = _validate_settings_for_save(settings_to_save)
+    _settings_cache = copy.deepcopy(settings_to_save)
+    if valid_settings == _last_saved_settings and os.path.exists(SETTINGS_FILE):
+        print("設定に変更がないため、保存を省略しました。")
+        return True
+
+    try:
+        # 先にシリアライズしてから一度の write() で書き込む (json.dump は細かい書き込みを繰り返すため)
+        # シリアライズに失敗した場合に、途中まで書かれた設定ファイルが残ることもない
+        settings_bytes: bytes = json.dumps(valid_settings, ensure_ascii=False, indent=4).encode('utf-8')
+        with open(SETTINGS_FILE, 'wb') as f:
+            f.write(settings_bytes)
+        _last_saved_settings = copy.deepcopy(valid_settings)
+        print(f"設定を保存しました: {SETTINGS_FILE}")
+        return True
+    except OSError as e: print(f"警告: 設定ファイルの保存失敗 (OSError: {e})。"); return False
+    except TypeError as e: print(f"警告: 設定データのJSONシリアライズ失敗 (TypeError: {e})。"); return False
+    except Exception as e: print(f"警告: 設定ファイル保存中に予期せぬエラー ({type(e).__name__}: {e})。"); return False
+
+def _validate_settings_for_save(settings_to_save: SettingsDict) -> SettingsDict:
+    """保存する設定を DEFAULT_SETTINGS のキーと型に合わせて検証した辞書を返す"""
     valid_settings: SettingsDict = {}
     for key, default_value in DEFAULT_SETTINGS.items():
         value_to_save: Any = settings_to_save.get(key)
@@ -149,13 +227,5 @@ def save_settings(settings_to_save: SettingsDict) -> bool:
         except (ValueError, TypeError):
              print(f"警告: 設定 '{key}' の値を正しい型 ({expected_type.__name__}) に変換できません。デフォルト値 ({default_value}) を保存します。")
              valid_settings[key] = default_value
-
-    try:
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(valid_settings, f, ensure_ascii=False, indent=4)
-        print(f"設定を保存しました: {SETTINGS_FILE}")
-        return True
-    except OSError as e: print(f"警告: 設定ファイルの保存失敗 (OSError: {e})。"); return False
-    except TypeError as e: print(f"警告: 設定データのJSONシリアライズ失敗 (TypeError: {e})。"); return False
-    except Exception as e: print(f"警告: 設定ファイル保存中に予期せぬエラー ({type(e).__name__}: {e})。"); return False
+    return valid_settings
 
@@ -0,0 +1,98 @@
+# utils/descriptor_cache.py
+import os
+import sqlite3
+import numpy as np
+from typing import Optional, List, Tuple, Any
+
+try:
+    from utils.cache_handler import CACHE_DIR_NAME
+except ImportError:
+    CACHE_DIR_NAME = ".image_cleaner_cache"
+
+DESCRIPTOR_CACHE_FILENAME = "orb_descriptors.sqlite3"
+DESCRIPTOR_CACHE_BATCH_SIZE = 100 # 何件ごとにまとめて書き込むか
+ORB_DESCRIPTOR_BYTES = 32 # ORB ディスクリプタ1行のバイト数 (特徴点なしの画像を保存する際の列数)
+
+NumpyImageType = np.ndarray[Any, Any]
+# 書き込み待ちの行: (path, mtime, size, algorithm, 列数, ディスクリプタのバイト列)
+DescriptorRow = Tuple[str, float, int, str, int, bytes]
+
+class OrbDescriptorCache:
+    """
+    ORB ディスクリプタを SQLite に永続化するキャッシュ。
+    (パス, 更新日時, サイズ, アルゴリズム) をキーとし、ファイルが変更されていなければ特徴量計算を省略できる。
+    特徴点が無かった画像は 0 行のディスクリプタとして保存する。
+    SQLite の接続はスレッドをまたいで使えないため、利用するスレッド内で作成すること。
+    """
+    def __init__(self, target_directory: str, batch_size: int = DESCRIPTOR_CACHE_BATCH_SIZE):
+        self.cache_dir = os.path.join(target_directory, CACHE_DIR_NAME)
+        self.db_path = os.path.join(self.cache_dir, DESCRIPTOR_CACHE_FILENAME)
+        self.batch_size = batch_size
+        self._pending: List[DescriptorRow] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS orb_descriptors ("
+                "path TEXT, mtime REAL, size INTEGER, algorithm TEXT, cols INTEGER, data BLOB, "
+                "PRIMARY KEY (path, mtime, size, algorithm))"
+            )
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"警告: ORB特徴量キャッシュを開けません。キャッシュは使用されません: {e}")
+            self._close_connection()
+
+    @property
+    def available(self) -> bool:
+        return self._conn is not None
+
+    def get(self, path: str, mtime: float, size: int, algorithm: str) -> Optional[NumpyImageType]:
+        """キャッシュ済みのディスクリプタ (uint8, N x 列数) を返す。ファイルが変更されている場合やキャッシュが無い場合は None"""
+        if self._conn is None: return None
+        try:
+            row = self._conn.execute(
+                "SELECT cols, data FROM orb_descriptors WHERE path=? AND mtime=? AND size=? AND algorithm=?",
+                (path, mtime, size, algorithm)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"警告: ORB特徴量キャッシュの読み込みに失敗: {e}")
+            return None
+        if row is None: return None
+        cols, data = int(row[0]), row[1]
+        if cols <= 0 or len(data) % cols != 0: return None # 壊れたエントリは無視して再計算する
+        # bytearray 経由で書き込み可能な配列にする (Faiss などに渡すため)
+        return np.frombuffer(bytearray(data), dtype=np.uint8).reshape(-1, cols)
+
+    def put(self, path: str, mtime: float, size: int, algorithm: str, descriptors: Optional[NumpyImageType]) -> None:
+        """ディスクリプタを書き込み待ちに追加し、一定件数たまったらまとめて書き込む (None は特徴点なしとして保存)"""
+        if self._conn is None: return
+        if descriptors is None or descriptors.ndim != 2: cols, data = ORB_DESCRIPTOR_BYTES, b""
+        else: cols, data = int(descriptors.shape[1]), np.ascontiguousarray(descriptors, dtype=np.uint8).tobytes()
+        self._pending.append((path, mtime, size, algorithm, cols, data))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """書き込み待ちのディスクリプタを1トランザクションで書き込む"""
+        if self._conn is None or not self._pending: return
+        try:
+            with self._conn:
+                # 同じパスの古いエントリ (更新前のファイルの特徴量) は削除してから追加する
+                self._conn.executemany("DELETE FROM orb_descriptors WHERE path=? AND algorithm=?",
+                                       [(row[0], row[3]) for row in self._pending])
+                self._conn.executemany("INSERT OR REPLACE INTO orb_descriptors VALUES (?, ?, ?, ?, ?, ?)", self._pending)
+        except sqlite3.Error as e:
+            print(f"警告: ORB特徴量キャッシュの書き込みに失敗: {e}")
+        self._pending.clear()
+
+    def close(self) -> None:
+        """書き込み待ちを反映して接続を閉じる"""
+        self.flush()
+        self._close_connection()
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            try: self._conn.close()
+            except sqlite3.Error: pass
+        self._conn = None
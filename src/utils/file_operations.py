@@ -10,18 +10,40 @@ from PIL.ExifTags import TAGS
 
 # image_loader は直接使わない
 
-try:
-    import send2trash
-except ImportError:
-    print("エラー: send2trash ライブラリが見つかりません。`pip install Send2Trash` を実行してください。")
-    send2trash = None
+# send2trash は (Windows では pywin32 系も含めて) 読み込みが重いため、最初の削除時に読み込む
+_send2trash_module: Any = None
+_send2trash_checked: bool = False
+
+def _get_send2trash() -> Any:
+    """send2trash モジュールを初回呼び出し時にインポートして返す (見つからなければ None)"""
+    global _send2trash_module, _send2trash_checked
+    if not _send2trash_checked:
+        _send2trash_checked = True
+        try:
+            import send2trash
+            _send2trash_module = send2trash
+        except ImportError:
+            print("エラー: send2trash ライブラリが見つかりません。`pip install Send2Trash` を実行してください。")
+    return _send2trash_module
 
 # 型エイリアス (変更なし)
 FileInfoResult = Tuple[str, str, str, str] # (size_str, mod_time_str, dimensions_str, exif_date_str)
 ErrorDict = Dict[str, str]
 DeleteResult = Tuple[int, List[ErrorDict], Set[str]]
 
+# ファイルサイズ表示の単位 (大きい順に判定する)
+_SIZE_UNITS: Tuple[Tuple[int, str], ...] = ((1024**3, "GB"), (1024**2, "MB"), (1024, "KB"))
+
+def format_file_size(size_bytes: int) -> str:
+    """バイト数を表示用の文字列 (B, KB, MB, GB) に変換する"""
+    for divisor, suffix in _SIZE_UNITS:
+        if size_bytes >= divisor: return f"{size_bytes/divisor:.1f} {suffix}"
+    return f"{size_bytes} B"
+
 # --- Exif 読み取りヘルパー関数 (変更なし) ---
+EXIF_IFD_POINTER_TAG: int = 0x8769 # Exif IFD へのポインタ
+EXIF_DATETIME_ORIGINAL_TAG: int = 0x9003 # DateTimeOriginal (撮影日時)
+
 def get_exif_data(img: Image.Image) -> Optional[Dict[str, Any]]:
     """Pillow ImageオブジェクトからExifデータを辞書として取得する"""
     try:
@@ -44,16 +66,29 @@ def get_exif_datetime_original(exif_data: Optional[Dict[str, Any]]) -> Optional[
     if exif_data is None:
         return None
     datetime_original = exif_data.get('DateTimeOriginal')
-    if isinstance(datetime_original, str):
-        if len(datetime_original) == 19 and datetime_original[4] == ':' and datetime_original[7] == ':':
-             return datetime_original
-    return None
+    return datetime_original if _is_exif_datetime(datetime_original) else None
+
+def read_exif_datetime_original(img: Image.Image) -> Optional[str]:
+    """
+    Pillow ImageオブジェクトからDateTimeOriginal (撮影日時) だけを読み取る。
+    _getexif() のように全タグを名前付きの辞書にせず、Exif IFD の該当タグだけを参照する。
+    """
+    try:
+        datetime_original = img.getexif().get_ifd(EXIF_IFD_POINTER_TAG).get(EXIF_DATETIME_ORIGINAL_TAG)
+    except Exception:
+        return None # Exif非対応フォーマットや壊れたExifなど
+    return datetime_original if _is_exif_datetime(datetime_original) else None
+
+def _is_exif_datetime(value: Any) -> bool:
+    """Exifの日時文字列 ('YYYY:MM:DD HH:MM:SS') の形式かどうか"""
+    return isinstance(value, str) and len(value) == 19 and value[4] == ':' and value[7] == ':'
 
 # --- ファイル情報取得関数 ---
-def get_file_info(file_path: str) -> FileInfoResult:
+def get_file_info(file_path: str, stat_info: Optional[os.stat_result] = None) -> FileInfoResult:
     """
     指定されたファイルの基本情報（サイズ、更新日時、解像度、撮影日時）を取得する。
     ファイルハンドルが確実に閉じられるように with を使用。
+    stat_info を渡した場合 (フォルダ走査時に取得済みなど) は os.stat を呼ばずにそれを使う。
     """
     file_size_str: str = "N/A"
     mod_time_str: str = "N/A"
@@ -62,12 +97,8 @@ def get_file_info(file_path: str) -> FileInfoResult:
 
     try:
         # --- ファイル基本情報 (os.stat) ---
-        stat_info: os.stat_result = os.stat(file_path)
-        file_size_bytes: int = stat_info.st_size
-        if file_size_bytes < 1024: file_size_str = f"{file_size_bytes} B"
-        elif file_size_bytes < 1024**2: file_size_str = f"{file_size_bytes/1024:.1f} KB"
-        elif file_size_bytes < 1024**3: file_size_str = f"{file_size_bytes/(1024**2):.1f} MB"
-        else: file_size_str = f"{file_size_bytes/(1024**3):.1f} GB"
+        if stat_info is None: stat_info = os.stat(file_path)
+        file_size_str = format_file_size(stat_info.st_size)
         mod_time_str = time.strftime('%Y/%m/%d %H:%M', time.localtime(stat_info.st_mtime))
 
         # --- 解像度と撮影日時 (Pillowで取得) ---
@@ -80,8 +111,7 @@ def get_file_info(file_path: str) -> FileInfoResult:
                 dimensions_str = f"{width}x{height}"
 
                 # Exifデータの取得と撮影日時の抽出
-                exif_data = get_exif_data(img) # 開いた Image オブジェクトを渡す
-                dt_original = get_exif_datetime_original(exif_data)
+                dt_original = read_exif_datetime_original(img) # 撮影日時のタグだけを読む
                 if dt_original:
                     exif_date_str = dt_original
             # ★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★
@@ -235,19 +265,24 @@ def rename_images_to_sequence(directory_path: str, parent_widget: Optional[QWidg
     return renamed_count, errors
 
 # --- 削除・ファイルを開く関数 ---
+def _format_file_names(file_paths: List[str], display_limit: int) -> str:
+    """確認メッセージ用にファイル名を列挙する (basename は表示する先頭分だけ計算する)"""
+    names: str = "\n".join([os.path.basename(f) for f in file_paths[:display_limit]])
+    remaining: int = len(file_paths) - display_limit
+    return names + (f"\n...他 {remaining} 個" if remaining > 0 else "")
+
 def delete_files_to_trash(file_paths: List[str], parent_widget: Optional[QWidget] = None) -> DeleteResult:
+    send2trash = _get_send2trash()
     if send2trash is None:
         QMessageBox.critical(parent_widget, "エラー", "send2trash ライブラリが見つかりません。\n削除機能を使用できません。")
         return 0, [{"path": "N/A", "error": "send2trashライブラリがありません"}], set()
-    unique_files_to_delete: List[str] = sorted(list(set(file_paths)))
+    unique_files_to_delete: List[str] = sorted(set(file_paths))
     if not unique_files_to_delete:
         QMessageBox.information(parent_widget, "情報", "削除対象のファイルが選択されていません。")
         return 0, [], set()
     num_files: int = len(unique_files_to_delete)
     message: str = f"{num_files} 個のファイルを選択しました。\nこれらのファイルをゴミ箱に移動しますか？\n\n"
-    display_limit: int = 10
-    if num_files <= display_limit: message += "\n".join([os.path.basename(f) for f in unique_files_to_delete])
-    else: message += "\n".join([os.path.basename(f) for f in unique_files_to_delete[:display_limit]]) + f"\n...他 {num_files - display_limit} 個"
+    message += _format_file_names(unique_files_to_delete, display_limit=10)
     reply = QMessageBox.question(parent_widget, "削除の確認", message, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
     if reply == QMessageBox.StandardButton.Yes:
         print(f"{num_files} 個のファイルをゴミ箱へ移動します...")
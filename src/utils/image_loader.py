@@ -57,18 +57,38 @@ def load_image_pil(image_path: str) -> PilLoadResult:
         error_type = type(e).__name__
         return None, f"予期せぬ画像読込エラー(Pillow {error_type}: {e}): {filename}"
 
-def load_image_as_numpy(image_path: str, mode: str = 'bgr') -> NumpyLoadResult:
+BytesLoadResult = Tuple[Optional[bytes], ErrorMsgType]
+
+def is_heif_path(image_path: str) -> bool:
+    """HEIC/HEIF (Pillow 経由で読み込む形式) のファイルかどうか"""
+    return image_path.lower().endswith(('.heic', '.heif'))
+
+def read_image_bytes(image_path: str) -> BytesLoadResult:
+    """
+    画像ファイルの中身をバイト列として読み込む (デコードはしない)。
+    別スレッドで先読みしておき、load_image_as_numpy(file_bytes=...) に渡す用途を想定。
+    """
+    filename = os.path.basename(image_path)
+    try:
+        with open(image_path, 'rb') as f:
+            return f.read(), None
+    except FileNotFoundError: return None, f"ファイルが見つかりません(cv2): {filename}"
+    except OSError as e: return None, f"ファイル読込エラー(cv2 OSError: {e}): {filename}"
+    except MemoryError: return None, f"メモリ不足(cv2): {filename}"
+
+def load_image_as_numpy(image_path: str, mode: str = 'bgr', file_bytes: Optional[bytes] = None) -> NumpyLoadResult:
     """
     画像をNumPy配列として読み込む。HEIC/HEIFに対応。
     エラーハンドリングを詳細化。
+    file_bytes に読込済みのファイル内容を渡すと、ファイルを再度開かずにデコードする (HEIF以外)。
     """
     filename = os.path.basename(image_path) # エラーメッセージ用
-    if not os.path.exists(image_path):
+    if file_bytes is None and not os.path.exists(image_path):
         return None, f"ファイルが見つかりません: {filename}"
 
     img_np: Optional[NumpyImageType] = None
     error_msg: ErrorMsgType = None
-    is_heif: bool = image_path.lower().endswith(('.heic', '.heif'))
+    is_heif: bool = is_heif_path(image_path)
 
     if is_heif and HEIF_AVAILABLE:
         img_pil: Optional[ImageType]
@@ -120,9 +140,10 @@ def load_image_as_numpy(image_path: str, mode: str = 'bgr') -> NumpyLoadResult:
             # elif mode == 'ignore_orientation': read_flag = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
 
             # ★ imdecode を使うことでファイルパスに日本語が含まれる場合の問題を回避 ★
-            with open(image_path, 'rb') as f:
-                file_bytes = np.frombuffer(f.read(), dtype=np.uint8)
-            img_cv: Optional[NumpyImageType] = cv2.imdecode(file_bytes, read_flag)
+            if file_bytes is None:
+                with open(image_path, 'rb') as f:
+                    file_bytes = f.read()
+            img_cv: Optional[NumpyImageType] = cv2.imdecode(np.frombuffer(file_bytes, dtype=np.uint8), read_flag)
             # img_cv = cv2.imread(image_path, read_flag) # 古い方法
 
             if img_cv is None:
@@ -160,18 +181,18 @@ def get_image_dimensions(image_path: str) -> DimensionResult:
     エラーハンドリングを詳細化。
     """
     filename = os.path.basename(image_path)
-    # まず Pillow で試す (多くの形式に対応、Exifも読める可能性がある)
-    img_pil: Optional[ImageType]
-    error_msg_pil: ErrorMsgType
-    img_pil, error_msg_pil = load_image_pil(image_path)
-    if img_pil:
-        try:
+    # まず Pillow で試す (Image.open はヘッダーだけを読むため、画素データはデコードしない)
+    error_msg_pil: ErrorMsgType = None
+    try:
+        with Image.open(image_path) as img_pil:
             width, height = img_pil.size
             return width, height
-        except Exception as e:
-            print(f"警告: Pillowでのサイズ取得中にエラー ({filename}): {e}")
-            # Pillowで読めてもサイズ取得でエラーになる場合があるかもしれない
-            # この場合、OpenCVで試すフォールバックは行わない
+    except FileNotFoundError:
+        error_msg_pil = f"ファイルが見つかりません(Pillow): {filename}"
+    except UnidentifiedImageError:
+        error_msg_pil = f"画像形式を認識できません(Pillow): {filename}"
+    except Exception as e:
+        error_msg_pil = f"サイズ取得エラー(Pillow {type(e).__name__}: {e}): {filename}"
 
     # Pillow で読めなかった場合、OpenCV で試す
     img_np: Optional[NumpyImageType]
@@ -191,3 +212,72 @@ def get_image_dimensions(image_path: str) -> DimensionResult:
     print(f"警告: 画像サイズの取得に失敗しました ({filename}) - {combined_error}")
     return None, None
 
+
+# 縮小デコード用フラグ (縮小率, カラー用, グレースケール用)。大きい縮小率から順に試す
+REDUCED_READ_FLAGS: Tuple[Tuple[int, int, int], ...] = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+
+def load_image_reduced(image_path: str, target_size: int, mode: str = 'bgr') -> NumpyLoadResult:
+    """
+    長辺が target_size 以上を保てる範囲で縮小してデコードした画像を返す (サムネイル・プレビュー表示用)。
+    JPEG は IMREAD_REDUCED_* により 1/2〜1/8 のサイズのままデコードされるため、フル解像度でのデコードより高速。
+    縮小できない場合や HEIF、mode='rgb' の場合は load_image_as_numpy にフォールバックする。
+    """
+    if mode not in ('bgr', 'gray') or is_heif_path(image_path):
+        return load_image_as_numpy(image_path, mode=mode)
+    filename = os.path.basename(image_path)
+    try:
+        with Image.open(image_path) as img_pil: # ヘッダーのみ読み込む
+            long_side: int = max(img_pil.size)
+    except Exception:
+        return load_image_as_numpy(image_path, mode=mode) # サイズ不明時は通常の読み込みに任せる
+
+    read_flag: Optional[int] = None
+    for factor, color_flag, gray_flag in REDUCED_READ_FLAGS:
+        if long_side // factor >= target_size:
+            read_flag = gray_flag if mode == 'gray' else color_flag
+            break
+    if read_flag is None:
+        return load_image_as_numpy(image_path, mode=mode)
+
+    try:
+        with open(image_path, 'rb') as f:
+            file_bytes: bytes = f.read()
+        img_cv: Optional[NumpyImageType] = cv2.imdecode(np.frombuffer(file_bytes, dtype=np.uint8), read_flag)
+    except cv2.error as e: return None, f"OpenCVエラー(縮小imdecode: {e.msg}): {filename}"
+    except OSError as e: return None, f"ファイル読込エラー(cv2 OSError: {e}): {filename}"
+    except MemoryError: return None, f"メモリ不足(cv2): {filename}"
+    if img_cv is None:
+        # 縮小デコードに対応しない形式などは通常の読み込みで再試行
+        return load_image_as_numpy(image_path, mode=mode, file_bytes=file_bytes)
+    return img_cv, None
+
+# 縮小デコードが有効な拡張子 (他の形式は全体をデコードしてから縮小するため速くならない)
+REDUCED_DECODE_EXTENSIONS: Tuple[str, ...] = ('.jpg', '.jpeg', '.jpe')
+DisplayLoadResult = Tuple[Optional[NumpyImageType], ErrorMsgType, Optional[Tuple[int, int]]]
+
+def load_image_for_display(image_path: str, target_size: Optional[int] = None) -> DisplayLoadResult:
+    """
+    表示用に BGR 画像を読み込み、(画像, エラー, 元画像のサイズ (幅, 高さ)) を返す。
+    target_size を指定すると、JPEG は長辺がその大きさを下回らない範囲で縮小デコードする
+    (返される画像は元画像より小さい場合がある)。None の場合はフル解像度で読み込む。
+    """
+    width: Optional[int] = None; height: Optional[int] = None
+    if target_size is not None and image_path.lower().endswith(REDUCED_DECODE_EXTENSIONS):
+        width, height = get_image_dimensions(image_path) # ヘッダーのみ読み込む
+    if width is None or height is None:
+        img_np, error_msg = load_image_as_numpy(image_path, mode='bgr')
+        if img_np is None or error_msg is not None:
+            return None, error_msg, None
+        return img_np, None, (img_np.shape[1], img_np.shape[0])
+
+    img_np, error_msg = load_image_reduced(image_path, target_size, mode='bgr')
+    if img_np is None or error_msg is not None:
+        return None, error_msg, None
+    # OpenCV は EXIF の回転を適用するため、ヘッダーのサイズと縦横が入れ替わっている場合がある
+    if (img_np.shape[1] > img_np.shape[0]) != (width > height):
+        width, height = height, width
+    return img_np, None, (width, height)
@@ -0,0 +1,29 @@
+# utils/json_compat.py
+import json
+from typing import Any
+
+# orjson (任意) をインポート: あれば JSON の解析・書き出しを高速化する (キャッシュや状態ファイルは大きくなりやすいため)
+# どちらを使っても同じ書式 (インデント2・非ASCII文字はそのまま・区切り文字も同じ) で書き出す
+try:
+    import orjson
+    ORJSON_AVAILABLE: bool = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+JSON_INDENT: int = 2 # インデント付きで書き出す場合の幅 (orjson が対応しているのは2のみ)
+
+def json_loads(data: bytes) -> Any:
+    """JSON バイト列を解析する (解析エラーはどちらも json.JSONDecodeError)"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def json_dumps_bytes(data: Any, indent: bool = False) -> bytes:
+    """UTF-8 JSON バイト列を作る。indent が True の場合はインデント付き、False の場合は空白なしで書き出す"""
+    if ORJSON_AVAILABLE:
+        option: int = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    if indent: return json.dumps(data, ensure_ascii=False, indent=JSON_INDENT).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def json_dumps_compact(data: Any) -> str:
+    """空白なしの JSON 文字列を作る (ファイルへ逐次書き出す場合に使う)"""
+    return json_dumps_bytes(data).decode('utf-8')
@@ -3,12 +3,14 @@ import json
 import os
 import numpy as np # ★ NumPy をインポート ★
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any, Union, Set
+from typing import Dict, List, Tuple, Optional, Any, Union, Set, Iterable, Iterator, Callable
+
+from utils.json_compat import json_loads, json_dumps_bytes, json_dumps_compact
 
 # 結果データのバージョン
 RESULTS_FORMAT_VERSION: str = "1.0"
 # 状態データのバージョン
-STATE_FORMAT_VERSION: str = "1.0"
+STATE_FORMAT_VERSION: str = "1.1" # 1.1: ブレ画像の結果を blurry_paths / blurry_scores の2配列で保存
 # 状態ファイル名
 STATE_FILENAME: str = ".image_cleaner_scan_state.json"
 
@@ -20,6 +22,14 @@ ErrorResultItem = Dict[str, str]
 ResultsData = Dict[str, Union[List[BlurResultItem], List[SimilarResultItem], DuplicateResultDict, List[ErrorResultItem]]]
 SettingsData = Dict[str, Any]
 LoadResult = Tuple[Optional[ResultsData], Optional[str], Optional[SettingsData], Optional[str]]
+# ストリーム保存用: (セクション名, 項目)。duplicates の項目は (グループキー, パスリスト)
+ResultsIterItem = Tuple[str, Any]
+ProgressCallback = Callable[[int], None]
+
+# 結果ファイル内のセクション (書き出し順)
+RESULT_SECTIONS: Tuple[str, ...] = ('blurry', 'similar', 'duplicates', 'errors')
+# 進捗コールバックを呼ぶ間隔 (項目数)
+SAVE_PROGRESS_INTERVAL: int = 500
 
 ScanStateData = Dict[str, Any]
 LoadStateResult = Tuple[Optional[ScanStateData], Optional[str]]
@@ -51,38 +61,108 @@ def convert_numpy_types(obj: Any) -> Any:
     return obj
 # ★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★★
 
-# --- 結果ファイルの保存・読み込み (変更なし) ---
-def save_results_to_file(filepath: str,
-                         results_data: ResultsData,
-                         scanned_directory: str,
-                         settings_used: Optional[SettingsData] = None) -> bool:
-    """スキャン結果を指定されたJSONファイルに保存します。"""
+# --- 結果ファイルの保存・読み込み ---
+def _iter_results_data(results_data: ResultsData) -> Iterator[ResultsIterItem]:
+    """結果辞書を (セクション名, 項目) のイテレータに変換する"""
+    for section in RESULT_SECTIONS:
+        data_item: Any = results_data.get(section)
+        if not data_item:
+            continue
+        items: Iterable[Any] = data_item.items() if isinstance(data_item, dict) else data_item
+        for item in items:
+            yield section, item
+
+def save_results_stream_to_file(filepath: str,
+                                results_iter: Iterable[ResultsIterItem],
+                                scanned_directory: str,
+                                settings_used: Optional[SettingsData] = None,
+                                progress_callback: Optional[ProgressCallback] = None) -> bool:
+    """
+    (セクション名, 項目) のイテレータからスキャン結果を逐次JSONファイルに書き出します。
+    結果全体を一つの辞書にまとめないため、大量の結果でもピークメモリが増えません。
+    同じセクションの項目は連続して渡される必要があります。
+    書き込みは同じフォルダの一時ファイルに行い、完了後に置き換えるため、
+    途中で失敗・終了しても保存先に書きかけのファイルは残りません。
+    """
+    tmp_filepath: str = filepath + ".tmp"
     try:
-        # ★ 保存前にNumPy型を変換 ★
-        data_to_save_raw: Dict[str, Any] = {
+        header: Dict[str, Any] = {
             "format_version": RESULTS_FORMAT_VERSION,
             "save_timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             "scanned_directory": scanned_directory,
-            "settings_used": settings_used if settings_used else {},
-            "results": results_data
+            "settings_used": convert_numpy_types(settings_used) if settings_used else {},
         }
-        data_to_save = convert_numpy_types(data_to_save_raw)
+        written_sections: List[str] = []
+        current_section: Optional[str] = None
+        first_in_section: bool = True
+        count: int = 0
+
+        with open(tmp_filepath, 'w', encoding='utf-8') as f:
+            f.write('{')
+            for key, value in header.items():
+                f.write(f'{json_dumps_compact(key)}:{json_dumps_compact(value)},')
+            f.write('"results":{')
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data_to_save, f, ensure_ascii=False, indent=4)
-        print(f"結果を保存しました: {filepath}")
+            for section, item in results_iter:
+                if section != current_section:
+                    if section in written_sections or section not in RESULT_SECTIONS:
+                        raise ValueError(f"不正なセクション順序です: {section}")
+                    if current_section is not None:
+                        f.write('}' if current_section == 'duplicates' else ']')
+                        f.write(',')
+                    f.write(json_dumps_compact(section) + (':{' if section == 'duplicates' else ':['))
+                    written_sections.append(section)
+                    current_section = section
+                    first_in_section = True
+
+                if not first_in_section: f.write(',')
+                first_in_section = False
+                if section == 'duplicates':
+                    group_key, paths = item
+                    f.write(f'{json_dumps_compact(str(group_key))}:{json_dumps_compact(convert_numpy_types(paths))}')
+                else:
+                    f.write(json_dumps_compact(convert_numpy_types(item)))
+
+                count += 1
+                if progress_callback and count % SAVE_PROGRESS_INTERVAL == 0:
+                    progress_callback(count)
+
+            if current_section is not None:
+                f.write('}' if current_section == 'duplicates' else ']')
+            # 項目が一つもなかったセクションも空として書き出す (読み込み時の警告を防ぐ)
+            for section in RESULT_SECTIONS:
+                if section not in written_sections:
+                    f.write(',' if written_sections else '')
+                    f.write(json_dumps_compact(section) + (':{}' if section == 'duplicates' else ':[]'))
+                    written_sections.append(section)
+            f.write('}}')
+        os.replace(tmp_filepath, filepath)
+
+        if progress_callback: progress_callback(count)
+        print(f"結果を保存しました: {filepath} ({count} 項目)")
         return True
     except OSError as e: print(f"エラー: 結果ファイルの保存失敗 (OSError: {e}) - {filepath}"); return False
-    except TypeError as e: print(f"エラー: 結果データのJSONシリアライズ失敗 (TypeError: {e})"); return False
+    except (TypeError, ValueError) as e: print(f"エラー: 結果データのJSONシリアライズ失敗 ({type(e).__name__}: {e})"); return False
     except Exception as e: print(f"エラー: 結果ファイル保存中に予期せぬエラー ({type(e).__name__}: {e}) - {filepath}"); return False
+    finally:
+        if os.path.exists(tmp_filepath):
+            try: os.remove(tmp_filepath)
+            except OSError: pass
+
+def save_results_to_file(filepath: str,
+                         results_data: ResultsData,
+                         scanned_directory: str,
+                         settings_used: Optional[SettingsData] = None) -> bool:
+    """スキャン結果を指定されたJSONファイルに保存します。"""
+    return save_results_stream_to_file(filepath, _iter_results_data(results_data), scanned_directory, settings_used)
 
 def load_results_from_file(filepath: str) -> LoadResult:
     """JSONファイルからスキャン結果を読み込みます。"""
     if not os.path.exists(filepath):
         return None, None, None, "指定されたファイルが見つかりません。"
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            loaded_data: Dict[str, Any] = json.load(f)
+        with open(filepath, 'rb') as f:
+            loaded_data: Dict[str, Any] = json_loads(f.read())
 
         if not isinstance(loaded_data, dict): return None, None, None, "無効なファイル形式 (トップレベル非オブジェクト)。"
         if "format_version" not in loaded_data: print("警告: 結果ファイルにバージョン情報がありません。")
@@ -144,9 +224,10 @@ def save_scan_state(directory_path: str, state_data: ScanStateData) -> bool:
         # if "compared_pairs_similar" in state_data_serializable and isinstance(state_data_serializable["compared_pairs_similar"], set):
         #      state_data_serializable["compared_pairs_similar"] = sorted([list(pair) for pair in state_data_serializable["compared_pairs_similar"]])
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # ★ 変換後のデータをダンプ ★
-            json.dump(state_data_serializable, f, ensure_ascii=False, indent=4)
+        # ★ 変換後のデータをダンプ ★ (スキャン中に定期的に保存されるため、先にシリアライズして一度の write() で書き込む)
+        state_bytes: bytes = json_dumps_bytes(state_data_serializable, indent=True)
+        with open(filepath, 'wb') as f:
+            f.write(state_bytes)
         print(f"スキャン状態を保存しました: {filepath}")
         return True
     except OSError as e:
@@ -177,8 +258,8 @@ def load_scan_state(directory_path: str) -> LoadStateResult:
         return None, "状態ファイルが見つかりません。"
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            loaded_data: ScanStateData = json.load(f)
+        with open(filepath, 'rb') as f:
+            loaded_data: ScanStateData = json_loads(f.read())
 
         # 簡単な検証
         if not isinstance(loaded_data, dict):
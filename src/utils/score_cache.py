@@ -0,0 +1,88 @@
+# utils/score_cache.py
+import os
+import sqlite3
+from typing import Optional, List, Tuple
+
+try:
+    from utils.cache_handler import CACHE_DIR_NAME
+except ImportError:
+    CACHE_DIR_NAME = ".image_cleaner_cache"
+
+SCORE_CACHE_FILENAME = "blur_scores.sqlite3"
+SCORE_CACHE_BATCH_SIZE = 100 # 何件ごとにまとめて書き込むか
+
+# 書き込み待ちの行: (path, mtime, size, algorithm, score)
+ScoreRow = Tuple[str, float, int, str, float]
+
+class BlurScoreCache:
+    """
+    ブレスコアを SQLite に永続化するキャッシュ。
+    (パス, 更新日時, サイズ, アルゴリズム) をキーとし、ファイルが変更されていなければ再計算を省略できる。
+    SQLite の接続はスレッドをまたいで使えないため、利用するスレッド内で作成すること。
+    """
+    def __init__(self, target_directory: str, batch_size: int = SCORE_CACHE_BATCH_SIZE):
+        self.cache_dir = os.path.join(target_directory, CACHE_DIR_NAME)
+        self.db_path = os.path.join(self.cache_dir, SCORE_CACHE_FILENAME)
+        self.batch_size = batch_size
+        self._pending: List[ScoreRow] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS blur_scores ("
+                "path TEXT, mtime REAL, size INTEGER, algorithm TEXT, score REAL, "
+                "PRIMARY KEY (path, mtime, size, algorithm))"
+            )
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"警告: ブレスコアキャッシュを開けません。キャッシュは使用されません: {e}")
+            self._close_connection()
+
+    @property
+    def available(self) -> bool:
+        return self._conn is not None
+
+    def get(self, path: str, mtime: float, size: int, algorithm: str) -> Optional[float]:
+        """キャッシュ済みのスコアを返す。ファイルが変更されている場合やキャッシュが無い場合は None"""
+        if self._conn is None: return None
+        try:
+            row = self._conn.execute(
+                "SELECT score FROM blur_scores WHERE path=? AND mtime=? AND size=? AND algorithm=?",
+                (path, mtime, size, algorithm)
+            ).fetchone()
+            return float(row[0]) if row else None
+        except sqlite3.Error as e:
+            print(f"警告: ブレスコアキャッシュの読み込みに失敗: {e}")
+            return None
+
+    def put(self, path: str, mtime: float, size: int, algorithm: str, score: float) -> None:
+        """スコアを書き込み待ちに追加し、一定件数たまったらまとめて書き込む"""
+        if self._conn is None: return
+        self._pending.append((path, mtime, size, algorithm, float(score)))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """書き込み待ちのスコアを1トランザクションで書き込む"""
+        if self._conn is None or not self._pending: return
+        try:
+            with self._conn:
+                # 同じパスの古いエントリ (更新前のファイルのスコア) は削除してから追加する
+                self._conn.executemany("DELETE FROM blur_scores WHERE path=? AND algorithm=?",
+                                       [(row[0], row[3]) for row in self._pending])
+                self._conn.executemany("INSERT OR REPLACE INTO blur_scores VALUES (?, ?, ?, ?, ?)", self._pending)
+        except sqlite3.Error as e:
+            print(f"警告: ブレスコアキャッシュの書き込みに失敗: {e}")
+        self._pending.clear()
+
+    def close(self) -> None:
+        """書き込み待ちを反映して接続を閉じる"""
+        self.flush()
+        self._close_connection()
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            try: self._conn.close()
+            except sqlite3.Error: pass
+        self._conn = None
@@ -0,0 +1,205 @@
+# utils/thumbnail_cache.py
+import os
+import time
+import hashlib
+import threading
+import cv2
+import numpy as np
+from PIL import Image
+from typing import Tuple, Optional, Any, List
+
+try:
+    from utils.cache_handler import CACHE_DIR_NAME
+except ImportError:
+    CACHE_DIR_NAME = ".image_cleaner_cache"
+
+try:
+    from utils.image_loader import load_image_reduced, REDUCED_DECODE_EXTENSIONS
+except ImportError:
+    print("エラー: utils.image_loader のインポートに失敗しました。")
+    REDUCED_DECODE_EXTENSIONS = ('.jpg', '.jpeg', '.jpe')
+    def load_image_reduced(image_path: str, target_size: int, mode: str = 'bgr') -> Tuple[Optional[np.ndarray], Optional[str]]:
+        return None, "Image loader not available"
+
+# PyTurboJPEG (任意) をインポート: あれば JPEG の縮小デコードに libjpeg-turbo を直接使う
+try:
+    from turbojpeg import TurboJPEG
+    _turbo_jpeg: Optional[Any] = TurboJPEG()
+except ImportError:
+    _turbo_jpeg = None
+except Exception as e: # パッケージはあるが libjpeg-turbo 本体が見つからない場合など
+    print(f"警告: TurboJPEG の初期化に失敗しました。OpenCV でデコードします。({e})")
+    _turbo_jpeg = None
+
+# ★ 型エイリアス ★
+NumpyImageType = np.ndarray[Any, Any]
+ErrorMsgType = Optional[str]
+ThumbnailResult = Tuple[Optional[NumpyImageType], ErrorMsgType]
+
+THUMBNAIL_SIZE: int = 128 # サムネイルの長辺 (px)
+THUMBNAIL_WEBP_QUALITY: int = 80 # WebP は同程度の画質の JPEG より小さく、キャッシュの読み書きが減る
+THUMBNAIL_JPEG_QUALITY: int = 85 # WebP に対応していない OpenCV の場合に使う
+THUMBNAIL_CACHE_EXTENSIONS: Tuple[str, ...] = ('.webp', '.jpg') # 優先順
+TURBOJPEG_SCALE_DENOMINATORS: Tuple[int, ...] = (8, 4, 2) # 縮小率の大きい順に試す
+# EXIF の Orientation タグ (TurboJPEG は回転を適用しないため自前で補正する)
+EXIF_ORIENTATION_TAG: int = 0x0112
+# サムネイルはスキャン対象フォルダではなく、ホームディレクトリ下にまとめて保存する
+THUMBNAIL_CACHE_DIR: str = os.path.join(os.path.expanduser("~"), CACHE_DIR_NAME, "thumbnails")
+# 元画像の削除・変更で使われなくなったサムネイルが溜まり続けないよう、合計サイズと未使用期間に上限を設ける
+THUMBNAIL_CACHE_MAX_BYTES: int = 256 * 1024 * 1024 # 超えた分は最近使われていないものから削除する
+THUMBNAIL_CACHE_MAX_AGE_DAYS: int = 60 # この日数使われていないサムネイルは削除する
+THUMBNAIL_CACHE_PRUNE_INTERVAL: int = 1000 # 何件書き込むごとに整理するか (起動後最初の書き込み時にも整理する)
+
+_prune_lock = threading.Lock()
+_writes_since_prune: int = THUMBNAIL_CACHE_PRUNE_INTERVAL
+
+def thumbnail_cache_path(image_path: str, size: int = THUMBNAIL_SIZE) -> Optional[str]:
+    """
+    サムネイルのキャッシュファイルのパス (拡張子なし) を返す。ファイル情報を取得できない場合は None。
+    キーにパス・更新日時・ファイルサイズを含めるため、元画像が変更されると別のキャッシュになる。
+    """
+    try:
+        stat_result = os.stat(image_path)
+    except OSError:
+        return None
+    key = f"{os.path.normcase(os.path.abspath(image_path))}|{stat_result.st_mtime}|{stat_result.st_size}|{size}"
+    digest: str = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return os.path.join(THUMBNAIL_CACHE_DIR, digest[:2], digest)
+
+def _read_cached_thumbnail(cache_path: str) -> Optional[NumpyImageType]:
+    for extension in THUMBNAIL_CACHE_EXTENSIONS:
+        file_path: str = cache_path + extension
+        if not os.path.exists(file_path): continue
+        try:
+            # np.fromfile + imdecode で日本語パスにも対応
+            img: Optional[NumpyImageType] = cv2.imdecode(np.fromfile(file_path, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is not None:
+                os.utime(file_path) # 更新日時を最終使用日時として整理時の判定に使う
+            return img
+        except (cv2.error, OSError, ValueError) as e:
+            print(f"警告: サムネイルキャッシュの読み込みに失敗 ({file_path}): {e}")
+    return None
+
+def _encode_thumbnail(thumbnail: NumpyImageType) -> Optional[Tuple[str, Any]]:
+    """(拡張子, エンコード済みデータ) を返す。WebP を優先し、使えなければ JPEG にする"""
+    for extension, params in (('.webp', [cv2.IMWRITE_WEBP_QUALITY, THUMBNAIL_WEBP_QUALITY]),
+                              ('.jpg', [cv2.IMWRITE_JPEG_QUALITY, THUMBNAIL_JPEG_QUALITY])):
+        try:
+            success, encoded = cv2.imencode(extension, thumbnail, params)
+            if success: return extension, encoded
+        except cv2.error:
+            pass # WebP 非対応のビルドなど
+    return None
+
+def _write_cached_thumbnail(cache_path: str, thumbnail: NumpyImageType) -> None:
+    encoded_result: Optional[Tuple[str, Any]] = _encode_thumbnail(thumbnail)
+    if encoded_result is None: return
+    extension, encoded = encoded_result
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        encoded.tofile(cache_path + extension)
+    except OSError as e:
+        print(f"警告: サムネイルキャッシュの書き込みに失敗 ({cache_path}{extension}): {e}")
+        return
+    _prune_thumbnail_cache_periodically()
+
+def _prune_thumbnail_cache_periodically() -> None:
+    """書き込み THUMBNAIL_CACHE_PRUNE_INTERVAL 件ごとに1回だけ整理する (複数スレッドから呼ばれても重複しない)"""
+    global _writes_since_prune
+    with _prune_lock:
+        _writes_since_prune += 1
+        if _writes_since_prune < THUMBNAIL_CACHE_PRUNE_INTERVAL: return
+        _writes_since_prune = 0
+    prune_thumbnail_cache()
+
+def prune_thumbnail_cache(max_bytes: int = THUMBNAIL_CACHE_MAX_BYTES, max_age_days: int = THUMBNAIL_CACHE_MAX_AGE_DAYS) -> int:
+    """
+    未使用期間が max_age_days を超えたサムネイルを削除し、合計サイズが max_bytes を超える場合は
+    最近使われていないものから削除します。削除したファイル数を返します。
+    """
+    entries: List[Tuple[float, int, str]] = [] # (最終使用日時, サイズ, パス)
+    try:
+        subdirs = os.scandir(THUMBNAIL_CACHE_DIR)
+    except OSError:
+        return 0 # キャッシュがまだ無い
+    with subdirs:
+        for subdir in subdirs:
+            try:
+                if not subdir.is_dir(): continue
+                with os.scandir(subdir.path) as files:
+                    for entry in files:
+                        if not entry.is_file(): continue
+                        stat_result = entry.stat()
+                        entries.append((stat_result.st_mtime, stat_result.st_size, entry.path))
+            except OSError:
+                continue
+
+    expire_before: float = time.time() - max_age_days * 24 * 60 * 60
+    total_bytes: int = sum(size for _, size, _ in entries)
+    removed_count: int = 0
+    entries.sort() # 古い順
+    for last_used, size, file_path in entries:
+        if last_used >= expire_before and total_bytes <= max_bytes: break
+        try:
+            os.remove(file_path)
+        except OSError:
+            continue
+        total_bytes -= size; removed_count += 1
+    if removed_count:
+        print(f"サムネイルキャッシュを整理しました: {removed_count} 件削除")
+    return removed_count
+
+def _apply_exif_orientation(img: NumpyImageType, orientation: int) -> NumpyImageType:
+    """EXIF の Orientation に従って画像を回転・反転する"""
+    if orientation == 2: return cv2.flip(img, 1)
+    if orientation == 3: return cv2.rotate(img, cv2.ROTATE_180)
+    if orientation == 4: return cv2.flip(img, 0)
+    if orientation == 5: return cv2.transpose(img)
+    if orientation == 6: return cv2.rotate(img, cv2.ROTATE_90_CLOCKWISE)
+    if orientation == 7: return cv2.flip(cv2.transpose(img), -1)
+    if orientation == 8: return cv2.rotate(img, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    return img
+
+def _decode_jpeg_turbo(image_path: str, size: int) -> Optional[NumpyImageType]:
+    """TurboJPEG で JPEG を縮小デコードする (使えない場合や失敗時は None)"""
+    if _turbo_jpeg is None or not image_path.lower().endswith(REDUCED_DECODE_EXTENSIONS): return None
+    try:
+        with Image.open(image_path) as img_pil: # ヘッダーのみ読み込む
+            long_side: int = max(img_pil.size)
+            orientation: int = int(img_pil.getexif().get(EXIF_ORIENTATION_TAG, 1))
+        denominator: int = next((d for d in TURBOJPEG_SCALE_DENOMINATORS if long_side // d >= size), 1)
+        with open(image_path, 'rb') as f:
+            file_bytes: bytes = f.read()
+        img: NumpyImageType = _turbo_jpeg.decode(file_bytes, scaling_factor=(1, denominator)) # 既定で BGR
+        return _apply_exif_orientation(img, orientation)
+    except Exception as e: # 破損ファイル、CMYK など TurboJPEG が扱えない場合は OpenCV で読み直す
+        print(f"警告: TurboJPEG でのデコードに失敗しました。OpenCV で再試行します ({os.path.basename(image_path)}): {e}")
+        return None
+
+def load_thumbnail(image_path: str, size: int = THUMBNAIL_SIZE) -> ThumbnailResult:
+    """
+    長辺が size 以下の BGR サムネイルを返す。
+    ディスクキャッシュがあればそれを使い、無ければ縮小デコードして作成・保存する。
+    """
+    cache_path: Optional[str] = thumbnail_cache_path(image_path, size)
+    if cache_path:
+        cached: Optional[NumpyImageType] = _read_cached_thumbnail(cache_path)
+        if cached is not None:
+            return cached, None
+
+    img: Optional[NumpyImageType] = _decode_jpeg_turbo(image_path, size)
+    error_msg: ErrorMsgType = None
+    if img is None:
+        img, error_msg = load_image_reduced(image_path, size, mode='bgr')
+    if img is None:
+        return None, error_msg or f"サムネイル作成失敗: {os.path.basename(image_path)}"
+    try:
+        h, w = img.shape[:2]
+        scale: float = size / max(h, w)
+        if scale < 1.0:
+            img = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    except cv2.error as e:
+        return None, f"OpenCVエラー(サムネイル縮小: {e.msg}): {os.path.basename(image_path)}"
+    if cache_path:
+        _write_cached_thumbnail(cache_path, img)
+    return img, None